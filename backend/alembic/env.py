@@ -8,7 +8,14 @@ from alembic import context
 
 # Import your models
 from src.infrastructure.database.config import Base
-from src.infrastructure.database.models import ProductModel, CustomerModel, OrderModel, OrderItemModel
+from src.infrastructure.database.models import (
+    ProductModel,
+    CustomerModel,
+    OrderModel,
+    OrderItemModel,
+    IdempotencyKeyModel,
+    OrderDailyStatsModel,
+)
 
 # this is the Alembic Config object
 config = context.config
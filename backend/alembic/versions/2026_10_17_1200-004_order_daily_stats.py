@@ -0,0 +1,48 @@
+"""order daily stats rollup
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'order_daily_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column(
+            'status',
+            postgresql.ENUM('CREATED', 'PAID', 'CANCELLED', name='order_status', create_type=False),
+            nullable=False
+        ),
+        sa.Column('order_count', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'status')
+    )
+
+    # Backfill from the existing order history
+    op.execute(
+        """
+        INSERT INTO order_daily_stats (day, status, order_count, revenue)
+        SELECT CAST(created_at AS DATE), status, COUNT(*), SUM(total_amount)
+        FROM orders
+        GROUP BY CAST(created_at AS DATE), status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('order_daily_stats')
@@ -0,0 +1,50 @@
+"""product search indexes (pg_trgm + unaccent)
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+
+    # unaccent() is only STABLE (its dictionary can change), so index
+    # expressions need an IMMUTABLE wrapper with the dictionary pinned
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION immutable_unaccent(text)
+        RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        """
+    )
+
+    # Same expressions as the repository search (search_key), so LIKE '%term%'
+    # and similarity() ordering can use the trigram indexes
+    op.execute(
+        "CREATE INDEX ix_products_name_search ON products "
+        "USING gin (immutable_unaccent(lower(name)) gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX ix_products_sku_search ON products "
+        "USING gin (immutable_unaccent(lower(sku)) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_products_sku_search")
+    op.execute("DROP INDEX IF EXISTS ix_products_name_search")
+    op.execute("DROP FUNCTION IF EXISTS immutable_unaccent(text)")
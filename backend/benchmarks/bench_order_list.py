@@ -0,0 +1,141 @@
+"""
+Benchmark the order list page with JOIN vs IN-query item loading.
+
+Seeds orders with many items and times one page fetched the old way
+(joinedload under LIMIT/OFFSET) against OrderRepository.get_all, which pages
+over orders and loads their items with one IN query.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/bench_order_list.py --orders 2000 --items 20
+    PYTHONPATH=. python benchmarks/bench_order_list.py --database-url postgresql://...
+"""
+import argparse
+import gc
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from src.infrastructure.database.config import Base
+from src.infrastructure.database.models import CustomerModel, OrderItemModel, OrderModel, ProductModel
+from src.infrastructure.repositories import OrderRepository
+
+
+def seed(session, orders: int, items: int) -> None:
+    """Create one customer, `items` products and `orders` orders of `items` lines."""
+    customer = CustomerModel(name="Benchmark", email="bench@example.com", document="00000000000191")
+    session.add(customer)
+    session.flush()
+    session.execute(insert(ProductModel), [
+        {"name": f"Produto {i}", "sku": f"BENCH-{i}", "price": 10.0, "stock_qty": 1000}
+        for i in range(items)
+    ])
+    product_ids = [p.id for p in session.query(ProductModel.id)]
+
+    order_ids = session.scalars(
+        insert(OrderModel).returning(OrderModel.id, sort_by_parameter_order=True),
+        [{"customer_id": customer.id, "total_amount": 10.0 * items} for _ in range(orders)],
+    ).all()
+    session.execute(insert(OrderItemModel), [
+        {"order_id": order_id, "product_id": product_id, "unit_price": 10.0, "quantity": 1, "line_total": 10.0}
+        for order_id in order_ids
+        for product_id in product_ids
+    ])
+    session.commit()
+
+
+def joined_page(session, skip: int, limit: int) -> list:
+    """Fetch a page the previous way: JOIN the items under LIMIT/OFFSET."""
+    stmt = OrderRepository._order_statement(OrderRepository._list_statement(), "created_at", "desc")
+    stmt = stmt.offset(skip).limit(limit).options(joinedload(OrderModel.items))
+    return [OrderRepository._to_entity(o) for o in session.scalars(stmt).unique().all()]
+
+
+def in_query_page(session, skip: int, limit: int) -> list:
+    """Fetch a page through the repository (orders first, then items by IN)."""
+    return OrderRepository(session).get_all(skip, limit, count="none")[0]
+
+
+def measure(session_factory, strategies: dict, skip: int, limit: int, repeat: int) -> dict:
+    """Return per-call timings in ms for each strategy, interleaving the runs."""
+    timings = {name: [] for name in strategies}
+    for run in range(repeat + 1):
+        for name, fetch in strategies.items():
+            gc.collect()
+            session = session_factory()
+            try:
+                started = time.perf_counter()
+                fetch(session, skip, limit)
+                elapsed = (time.perf_counter() - started) * 1000
+            finally:
+                session.close()
+            if run:  # the first round is a warm-up
+                timings[name].append(elapsed)
+    return timings
+
+
+def transferred_values(engine, session_factory, fetch, skip: int, limit: int) -> tuple:
+    """Return (queries, rows, values) the driver returned for one page fetch."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with session_factory() as session:
+            fetch(session, skip, limit)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    rows = values = 0
+    with engine.connect() as conn:
+        for statement, parameters in executed:
+            result = conn.exec_driver_sql(statement, parameters)
+            fetched = result.fetchall()
+            rows += len(fetched)
+            values += len(fetched) * len(result.keys())
+    return len(executed), rows, values
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Empty database to use (default: temporary SQLite file)")
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--skip", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench_orders.db"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    with session_factory() as session:
+        seed(session, args.orders, args.items)
+
+    # Both strategies must return the same page
+    with session_factory() as session:
+        expected = [(o.id, len(o.items)) for o in joined_page(session, args.skip, args.limit)]
+        assert [(o.id, len(o.items)) for o in in_query_page(session, args.skip, args.limit)] == expected
+
+    print(f"{args.orders} orders x {args.items} items, page skip={args.skip} limit={args.limit}")
+    strategies = {"joinedload": joined_page, "selectin (IN)": in_query_page}
+    results = measure(session_factory, strategies, args.skip, args.limit, args.repeat)
+    for name, timings in results.items():
+        queries, rows, values = transferred_values(engine, session_factory, strategies[name], args.skip, args.limit)
+        print(
+            f"  {name:<14} median {statistics.median(timings):8.2f} ms"
+            f"  p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:8.2f} ms"
+            f"  queries {queries}  rows {rows}  values {values}"
+        )
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark list page serialization: validated Pydantic path vs lean orjson path.
+
+Builds 1000-item pages of orders and products in memory (no database) and
+serves them from a throwaway FastAPI app in both modes: the validated path
+builds the response models and lets FastAPI validate them again against
+response_model; the lean path encodes plain dicts once with orjson.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/bench_serialization.py --items 1000 --order-items 3
+"""
+import argparse
+import gc
+import json
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from src.api.schemas import ApiResponse, OrderListResponse, OrderResponse, ProductListResponse, ProductResponse
+from src.api.serialization import lean_list_response, order_to_dict, product_to_dict
+from src.domain.entities import Order, OrderItem, OrderStatus, Product
+
+
+def build_orders(count: int, items: int) -> list:
+    """Create `count` orders of `items` lines, as the repository returns them."""
+    started = datetime(2026, 10, 17, tzinfo=timezone.utc)
+    return [
+        Order(
+            customer_id=1 + i % 50,
+            items=[
+                OrderItem(product_id=j + 1, unit_price=10.0 + j, quantity=1 + j % 3, order_id=i + 1, id=i * items + j + 1)
+                for j in range(items)
+            ],
+            status=OrderStatus.PAID if i % 2 else OrderStatus.CREATED,
+            id=i + 1,
+            created_at=started + timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def build_products(count: int) -> list:
+    """Create `count` products, as the repository returns them."""
+    started = datetime(2026, 10, 17, tzinfo=timezone.utc)
+    return [
+        Product(name=f"Produto {i}", sku=f"BENCH-{i}", price=10.0 + i / 100, stock_qty=i, id=i + 1,
+                created_at=started + timedelta(seconds=i))
+        for i in range(count)
+    ]
+
+
+def build_app(orders: list, products: list) -> FastAPI:
+    """Serve the same pages through the validated and the lean path."""
+    app = FastAPI()
+
+    @app.get("/validated/orders", response_model=ApiResponse[OrderListResponse])
+    def validated_orders():
+        page = OrderListResponse(
+            items=[OrderResponse.model_validate(o) for o in orders],
+            total=len(orders), skip=0, limit=len(orders), next_cursor=None,
+        )
+        return ApiResponse.success(data=page)
+
+    @app.get("/lean/orders", response_model=ApiResponse[OrderListResponse])
+    def lean_orders(response: Response):
+        items = [order_to_dict(o) for o in orders]
+        return lean_list_response(items, len(orders), 0, len(orders), None, response)
+
+    @app.get("/validated/products", response_model=ApiResponse[ProductListResponse])
+    def validated_products():
+        page = ProductListResponse(
+            items=[ProductResponse.model_validate(p) for p in products],
+            total=len(products), skip=0, limit=len(products), next_cursor=None,
+        )
+        return ApiResponse.success(data=page)
+
+    @app.get("/lean/products", response_model=ApiResponse[ProductListResponse])
+    def lean_products(response: Response):
+        items = [product_to_dict(p) for p in products]
+        return lean_list_response(items, len(products), 0, len(products), None, response)
+
+    return app
+
+
+def measure(client: TestClient, paths: list, repeat: int) -> dict:
+    """Return per-request timings in ms for each path, interleaving the runs."""
+    timings = {path: [] for path in paths}
+    for run in range(repeat + 1):
+        for path in paths:
+            gc.collect()
+            started = time.perf_counter()
+            client.get(path)
+            elapsed = (time.perf_counter() - started) * 1000
+            if run:  # the first round is a warm-up
+                timings[path].append(elapsed)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1000, help="Rows per page")
+    parser.add_argument("--order-items", type=int, default=3, help="Lines per order")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    orders = build_orders(args.items, args.order_items)
+    products = build_products(args.items)
+    client = TestClient(build_app(orders, products))
+
+    print(f"{args.items}-item pages, {args.order_items} lines per order")
+    for resource in ("orders", "products"):
+        paths = [f"/validated/{resource}", f"/lean/{resource}"]
+
+        # Both paths must produce the same document
+        bodies = [client.get(path).content for path in paths]
+        assert json.loads(bodies[0]) == json.loads(bodies[1]), f"{resource}: lean output differs"
+
+        results = measure(client, paths, args.repeat)
+        for path, body in zip(paths, bodies):
+            timings = results[path]
+            print(
+                f"  {path:<20} median {statistics.median(timings):8.2f} ms"
+                f"  p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:8.2f} ms"
+                f"  body {len(body) / 1024:8.1f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
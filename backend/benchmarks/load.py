@@ -0,0 +1,426 @@
+"""
+HTTP load harness: realistic traffic with checkout contention, then invariant checks.
+
+Virtual users replay a weighted mix of catalog browsing, autocomplete bursts
+(one request per keystroke), order creation concentrated on a few hot SKUs
+with little stock, Idempotency-Key retries sent concurrently, status updates
+and dashboard loads. Throughput and p50/p95/p99 are reported per endpoint.
+
+The run creates its own products (SKUs prefixed LOAD-<run id>) and customers
+through the API, and afterwards checks through the exports that:
+  - no stock went negative and no product sold more units than it had;
+  - each product's stock dropped by exactly the units in stored orders;
+  - each Idempotency-Key produced a single order;
+  - the orders stored are the orders acknowledged to clients;
+  - the dashboard rollup moved by the orders created, per status.
+The last check assumes no other writers during the run.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/load.py                                 # in-process app on DATABASE_URL
+    PYTHONPATH=. python benchmarks/load.py --base-url http://localhost:8000 --concurrency 50 --duration 60
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set
+
+import httpx
+
+API = "/api/v1"
+DEFAULT_MIX = "browse=35,autocomplete=20,checkout=30,status=10,dashboard=5"
+
+
+class LoadOptions:
+    """Shape of the load; defaults match the command line."""
+
+    def __init__(
+        self,
+        concurrency: int = 20,
+        duration: float = 30.0,
+        max_requests: Optional[int] = None,
+        mix: str = DEFAULT_MIX,
+        catalog: int = 300,
+        hot_skus: int = 5,
+        hot_stock: int = 200,
+        hot_ratio: float = 0.8,
+        customers: int = 20,
+        idempotent_ratio: float = 0.1,
+        retries: int = 3,
+        seed: Optional[int] = None,
+    ):
+        self.concurrency = concurrency
+        self.duration = duration
+        self.max_requests = max_requests
+        self.mix = parse_mix(mix)
+        self.catalog = catalog
+        self.hot_skus = hot_skus
+        self.hot_stock = hot_stock
+        self.hot_ratio = hot_ratio
+        self.customers = customers
+        self.idempotent_ratio = idempotent_ratio
+        self.retries = retries
+        self.seed = seed
+
+
+class LoadRun:
+    """Fixtures created for the run and everything observed by the clients."""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.initial_stock: Dict[int, int] = {}
+        self.names: List[str] = []
+        self.hot_ids: List[int] = []
+        self.cold_ids: List[int] = []
+        self.customer_ids: List[int] = []
+        self.dashboard_before: Dict[str, int] = {}
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+        self.rejections: Counter = Counter()
+        self.acknowledged: Set[int] = set()
+        self.keys: Dict[str, Set[int]] = defaultdict(set)
+        self.open_orders: List[int] = []
+        self.requests = 0
+        self.elapsed = 0.0
+
+    @property
+    def sku_prefix(self) -> str:
+        return f"LOAD-{self.run_id}"
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """Parse 'browse=35,checkout=30' into scenario weights."""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise ValueError(f"Unknown scenario: {name.strip()}")
+        weights[name.strip()] = int(weight)
+    return weights
+
+
+async def call(client: httpx.AsyncClient, run: LoadRun, label: str, method: str, path: str, **kwargs) -> Optional[dict]:
+    """
+    Send one request and record its latency under `label`.
+
+    Returns the envelope, or None on a transport error or a non-200. A
+    business refusal (cod_retorno 1, e.g. insufficient stock) counts as a
+    rejection, an "Internal server error" envelope as an error.
+    """
+    run.requests += 1
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, API + path, **kwargs)
+    except httpx.HTTPError:
+        run.errors[label] += 1
+        return None
+    run.timings[label].append((time.perf_counter() - started) * 1000)
+    if response.status_code != 200:
+        run.errors[label] += 1
+        return None
+    body = response.json()
+    if body.get("cod_retorno", 0) != 0:
+        if body.get("mensagem") == "Internal server error":
+            run.errors[label] += 1
+        else:
+            run.rejections[label] += 1
+    return body
+
+
+# Scenarios
+
+
+async def browse(client: httpx.AsyncClient, run: LoadRun, rng: random.Random) -> None:
+    """A catalog page, then a couple of product details from it."""
+    body = await call(client, run, "GET /products", "GET", "/products",
+                      params={"skip": rng.randrange(0, max(1, len(run.cold_ids) - 20)), "limit": 20, "count": "estimated"})
+    items = (body or {}).get("data") or {}
+    for product in rng.sample(items.get("items", []), min(2, len(items.get("items", [])))):
+        await call(client, run, "GET /products/{id}", "GET", f"/products/{product['id']}")
+
+
+async def autocomplete(client: httpx.AsyncClient, run: LoadRun, rng: random.Random) -> None:
+    """One request per keystroke while typing part of a product name."""
+    name = rng.choice(run.names).lower()
+    for length in range(3, min(len(name), 3 + rng.randint(3, 8)) + 1):
+        await call(client, run, "GET /products/search/autocomplete", "GET", "/products/search/autocomplete",
+                   params={"q": name[:length], "limit": 10})
+
+
+async def checkout(client: httpx.AsyncClient, run: LoadRun, rng: random.Random, options: LoadOptions) -> None:
+    """Create an order of 1-3 lines, mostly hot SKUs; sometimes retried concurrently with an Idempotency-Key."""
+    lines = min(rng.randint(1, 3), len(run.hot_ids) + len(run.cold_ids))
+    product_ids = set()
+    while len(product_ids) < lines:
+        pool = run.hot_ids if run.hot_ids and (rng.random() < options.hot_ratio or not run.cold_ids) else run.cold_ids
+        product_ids.add(rng.choice(pool))
+    payload = {
+        "customer_id": rng.choice(run.customer_ids),
+        "items": [{"product_id": pid, "quantity": rng.randint(1, 3)} for pid in product_ids],
+    }
+
+    key = None
+    attempts = 1
+    if rng.random() < options.idempotent_ratio:
+        key = f"{run.run_id}-{uuid.uuid4().hex}"
+        attempts = options.retries
+    headers = {"Idempotency-Key": key} if key else {}
+    bodies = await asyncio.gather(*(
+        call(client, run, "POST /orders", "POST", "/orders", json=payload, headers=headers) for _ in range(attempts)
+    ))
+
+    for body in bodies:
+        if body and body["cod_retorno"] == 0:
+            order_id = body["data"]["id"]
+            if order_id not in run.acknowledged:
+                run.acknowledged.add(order_id)
+                run.open_orders.append(order_id)
+            if key:
+                run.keys[key].add(order_id)
+
+
+async def update_status(client: httpx.AsyncClient, run: LoadRun, rng: random.Random) -> None:
+    """Pay or cancel an order created earlier in the run."""
+    if not run.open_orders:
+        return
+    order_id = run.open_orders.pop(rng.randrange(len(run.open_orders)))
+    status = "PAID" if rng.random() < 0.7 else "CANCELLED"
+    await call(client, run, "PATCH /orders/{id}/status", "PATCH", f"/orders/{order_id}/status", json={"status": status})
+
+
+async def dashboard(client: httpx.AsyncClient, run: LoadRun, rng: random.Random) -> None:
+    await call(client, run, "GET /stats/dashboard", "GET", "/stats/dashboard")
+
+
+SCENARIOS = {
+    "browse": browse,
+    "autocomplete": autocomplete,
+    "checkout": checkout,
+    "status": update_status,
+    "dashboard": dashboard,
+}
+
+
+# Setup and checks
+
+
+async def export(client: httpx.AsyncClient, resource: str, **params) -> List[dict]:
+    """Every row of an NDJSON export."""
+    response = await client.get(f"{API}/{resource}/export", params={"format": "ndjson", **params}, timeout=None)
+    response.raise_for_status()
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+async def dashboard_counts(client: httpx.AsyncClient) -> Dict[str, int]:
+    response = await client.get(f"{API}/stats/dashboard")
+    return {s["status"]: s["order_count"] for s in response.json()["data"]["orders_by_status"]}
+
+
+async def create_fixtures(client: httpx.AsyncClient, options: LoadOptions) -> LoadRun:
+    """Import the run's catalog and create its customers."""
+    run = LoadRun(uuid.uuid4().hex[:8])
+    lines = ["sku,name,price,stock_qty"]
+    for i in range(options.hot_skus):
+        lines.append(f"{run.sku_prefix}-HOT-{i},Carga {run.run_id} Destaque {i},{19.9 + i},{options.hot_stock}")
+    for i in range(options.catalog):
+        lines.append(f"{run.sku_prefix}-{i:05d},Carga {run.run_id} Produto {i},{5 + i % 200},1000000")
+    response = await client.post(f"{API}/products/import", files={"file": ("load.csv", "\n".join(lines), "text/csv")})
+    response.raise_for_status()
+    if response.json()["cod_retorno"] != 0:
+        raise RuntimeError(f"Catalog import failed: {response.json()['mensagem']}")
+
+    for product in await export(client, "products", search=run.sku_prefix):
+        run.initial_stock[product["id"]] = product["stock_qty"]
+        run.names.append(product["name"])
+        (run.hot_ids if "-HOT-" in product["sku"] else run.cold_ids).append(product["id"])
+
+    for i in range(options.customers):
+        response = await client.post(f"{API}/customers", json={
+            "name": f"Cliente carga {run.run_id} {i}",
+            "email": f"carga-{run.run_id}-{i}@example.com",
+            "document": f"{int(run.run_id, 16) % 10**8:08d}{i:06d}",
+        })
+        run.customer_ids.append(response.json()["data"]["id"])
+
+    run.dashboard_before = await dashboard_counts(client)
+    return run
+
+
+async def virtual_user(client: httpx.AsyncClient, run: LoadRun, options: LoadOptions, rng: random.Random, deadline: float) -> None:
+    names = list(options.mix)
+    weights = [options.mix[name] for name in names]
+    while time.perf_counter() < deadline and (options.max_requests is None or run.requests < options.max_requests):
+        name = rng.choices(names, weights)[0]
+        if name == "checkout":
+            await checkout(client, run, rng, options)
+        else:
+            await SCENARIOS[name](client, run, rng)
+
+
+async def check_invariants(client: httpx.AsyncClient, run: LoadRun) -> List[dict]:
+    """Compare the stored products, orders and rollup with what the clients saw."""
+    final_stock = {p["id"]: p["stock_qty"] for p in await export(client, "products", search=run.sku_prefix)}
+    customers = set(run.customer_ids)
+    orders = [o for o in await export(client, "orders") if o["customer_id"] in customers]
+
+    sold: Counter = Counter()
+    for order in orders:
+        for item in order["items"]:
+            sold[item["product_id"]] += item["quantity"]
+
+    negative = {pid: qty for pid, qty in final_stock.items() if qty < 0}
+    oversold = {pid: sold[pid] for pid, initial in run.initial_stock.items() if sold[pid] > initial}
+    drift = {
+        pid: (initial - final_stock[pid], sold[pid])
+        for pid, initial in run.initial_stock.items()
+        if initial - final_stock[pid] != sold[pid]
+    }
+    duplicated = {key: sorted(ids) for key, ids in run.keys.items() if len(ids) > 1}
+    stored = {o["id"] for o in orders}
+    unacknowledged = stored - run.acknowledged
+    lost = run.acknowledged - stored
+
+    dashboard_after = await dashboard_counts(client)
+    by_status = Counter(o["status"] for o in orders)
+    rollup = {
+        status: (dashboard_after.get(status, 0) - run.dashboard_before.get(status, 0), by_status[status])
+        for status in set(dashboard_after) | set(by_status)
+        if dashboard_after.get(status, 0) - run.dashboard_before.get(status, 0) != by_status[status]
+    }
+
+    # Orders committed while the client saw a transport error are not a defect
+    post_errors = run.errors["POST /orders"]
+    return [
+        _check("no negative stock", not negative, negative),
+        _check("no oversold units", not oversold, {pid: f"sold {n} of {run.initial_stock[pid]}" for pid, n in oversold.items()}),
+        _check("stock drop equals units sold", not drift, {pid: f"stock -{d}, sold {s}" for pid, (d, s) in drift.items()}),
+        _check("one order per idempotency key", not duplicated, duplicated),
+        _check(
+            "stored orders match acknowledged orders",
+            not lost and len(unacknowledged) <= post_errors,
+            {"lost": sorted(lost), "unacknowledged": sorted(unacknowledged), "post_errors": post_errors},
+        ),
+        _check("dashboard rollup matches orders", not rollup,
+               {status: f"rollup +{d}, orders {n}" for status, (d, n) in rollup.items()}),
+    ]
+
+
+def _check(name: str, passed: bool, detail) -> dict:
+    if isinstance(detail, dict) and len(detail) > 5:
+        detail = {**dict(list(detail.items())[:5]), "...": f"{len(detail) - 5} more"}
+    return {"name": name, "passed": passed, "detail": None if passed else detail}
+
+
+# Run and report
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of `values` (q in 0-100)."""
+    ordered = sorted(values)
+    return ordered[max(0, int(round(q / 100 * len(ordered) + 0.5)) - 1)] if ordered else 0.0
+
+
+def summarize(run: LoadRun) -> dict:
+    endpoints = {}
+    for label, timings in sorted(run.timings.items()):
+        endpoints[label] = {
+            "requests": len(timings),
+            "rps": round(len(timings) / run.elapsed, 1) if run.elapsed else 0.0,
+            "p50_ms": round(percentile(timings, 50), 2),
+            "p95_ms": round(percentile(timings, 95), 2),
+            "p99_ms": round(percentile(timings, 99), 2),
+            "errors": run.errors[label],
+            "rejected": run.rejections[label],
+        }
+    return {
+        "run_id": run.run_id,
+        "seconds": round(run.elapsed, 2),
+        "requests": run.requests,
+        "rps": round(run.requests / run.elapsed, 1) if run.elapsed else 0.0,
+        "orders": len(run.acknowledged),
+        "endpoints": endpoints,
+    }
+
+
+async def run_load(client: httpx.AsyncClient, options: LoadOptions) -> dict:
+    """Set up, drive the virtual users, check the invariants; returns the summary."""
+    run = await create_fixtures(client, options)
+    rng = random.Random(options.seed)
+    deadline = time.perf_counter() + options.duration
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        virtual_user(client, run, options, random.Random(rng.random()), deadline)
+        for _ in range(options.concurrency)
+    ))
+    run.elapsed = time.perf_counter() - started
+    summary = summarize(run)
+    summary["invariants"] = await check_invariants(client, run)
+    return summary
+
+
+def report(summary: dict) -> None:
+    print(f"Run {summary['run_id']}: {summary['requests']} requests in {summary['seconds']}s "
+          f"({summary['rps']} req/s), {summary['orders']} orders")
+    print(f"  {'endpoint':<36} {'reqs':>7} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7} {'rejected':>9}")
+    for label, e in summary["endpoints"].items():
+        print(f"  {label:<36} {e['requests']:>7} {e['rps']:>8} {e['p50_ms']:>8} {e['p95_ms']:>8} {e['p99_ms']:>8}"
+              f" {e['errors']:>7} {e['rejected']:>9}")
+    print("Invariants:")
+    for check in summary["invariants"]:
+        print(f"  {'PASS' if check['passed'] else 'FAIL'}  {check['name']}" + (f": {check['detail']}" if check["detail"] else ""))
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    options = LoadOptions(
+        concurrency=args.concurrency, duration=args.duration, max_requests=args.max_requests, mix=args.mix,
+        catalog=args.catalog, hot_skus=args.hot_skus, hot_stock=args.hot_stock, hot_ratio=args.hot_ratio,
+        customers=args.customers, idempotent_ratio=args.idempotent_ratio, retries=args.retries, seed=args.seed,
+    )
+    limits = httpx.Limits(max_connections=args.concurrency * options.retries)
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+            return await run_load(client, options)
+
+    from src.api.main import app
+
+    logging.getLogger().setLevel(logging.WARNING)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=args.timeout) as client:
+            return await run_load(client, options)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="Running API (default: the app in-process, on DATABASE_URL)")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--max-requests", type=int, help="Stop after this many requests")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Scenario weights")
+    parser.add_argument("--catalog", type=int, default=300, help="Products with ample stock")
+    parser.add_argument("--hot-skus", type=int, default=5, help="Contended products")
+    parser.add_argument("--hot-stock", type=int, default=200, help="Initial stock of each hot product")
+    parser.add_argument("--hot-ratio", type=float, default=0.8, help="Share of order lines on hot products")
+    parser.add_argument("--customers", type=int, default=20)
+    parser.add_argument("--idempotent-ratio", type=float, default=0.1, help="Share of orders sent with a key")
+    parser.add_argument("--retries", type=int, default=3, help="Concurrent copies of a keyed order")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, help="Random seed for a repeatable mix")
+    parser.add_argument("--json", help="Also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(_main(args))
+    report(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    return 0 if all(check["passed"] for check in summary["invariants"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,382 @@
+"""
+Tracked micro-benchmarks with stored baselines.
+
+Seeds a fresh database at each size (products = orders = size) and times the
+operations that dominate the API's hot paths: order creation through
+OrderService, the product search through ProductRepository.get_all,
+OrderRepository._to_entity over a loaded page, order serialization
+(Pydantic models and the lean orjson path), and the logging done for a batch
+of order requests, rendered synchronously (logging.sync_json) or through the
+sampled queue of src/infrastructure/logging_config.py
+(logging.queued_sampled, time spent on the calling thread). Medians are compared with the
+baseline of the database dialect in benchmarks/baselines/; an operation
+slower than baseline * (1 + threshold) fails the run, and so does an
+operation without a baseline (no file yet for the dialect, or a new
+operation), until one is recorded with --update.
+
+Baselines are machine-specific: record them with --update on the machine
+that runs the comparison.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/suite.py                       # SQLite, compare
+    PYTHONPATH=. python benchmarks/suite.py --update              # record the baseline
+    PYTHONPATH=. python benchmarks/suite.py --start-postgres      # throwaway local cluster
+    PYTHONPATH=. python benchmarks/suite.py --database-url postgresql://... --sizes 1000,100000
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional
+
+import orjson
+import sqlalchemy
+import structlog
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.api.schemas import OrderResponse
+from src.api.serialization import order_to_dict
+from src.application.services import OrderService
+from src.infrastructure.database.config import Base
+from src.infrastructure.database.models import CustomerModel, OrderItemModel, OrderModel, ProductModel
+from src.infrastructure.logging_config import (
+    EventSampler,
+    json_formatter,
+    parse_sample_rates,
+    request_processors,
+    start_writer,
+)
+from src.infrastructure.repositories import OrderRepository, ProductRepository
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_DIR = os.path.join(BENCHMARK_DIR, "baselines")
+DEFAULT_SIZES = "1000,10000"
+# Relative slowdown that fails the run
+DEFAULT_THRESHOLD = float(os.getenv("BENCHMARK_THRESHOLD", "0.25"))
+# Differences below this are timer noise whatever the ratio
+DEFAULT_MIN_DELTA_MS = float(os.getenv("BENCHMARK_MIN_DELTA_MS", "0.05"))
+
+PAGE_SIZE = 100
+ORDER_LINES = 3
+# Order requests logged per call of the logging operations
+LOG_BATCH = 100
+# Sampling of the queued logging operation (production opts in through LOG_SAMPLE_RATES)
+LOG_SAMPLE_RATES = "Creating order=0.1"
+
+
+def seed(session: Session, size: int) -> None:
+    """Create `size` products, `size` orders of ORDER_LINES lines and their customers."""
+    customers = session.scalars(
+        insert(CustomerModel).returning(CustomerModel.id, sort_by_parameter_order=True),
+        [
+            {"name": f"Cliente {i}", "email": f"cliente{i}@example.com", "document": f"{i:014d}"}
+            for i in range(max(10, size // 100))
+        ],
+    ).all()
+    products = session.scalars(
+        insert(ProductModel).returning(ProductModel.id, sort_by_parameter_order=True),
+        [
+            {"name": f"Produto {i}", "sku": f"BENCH-{i:07d}", "price": 10.0 + i % 500, "stock_qty": 1_000_000}
+            for i in range(size)
+        ],
+    ).all()
+    orders = session.scalars(
+        insert(OrderModel).returning(OrderModel.id, sort_by_parameter_order=True),
+        [{"customer_id": customers[i % len(customers)], "total_amount": 30.0} for i in range(size)],
+    ).all()
+    session.execute(insert(OrderItemModel), [
+        {"order_id": order_id, "product_id": products[(i + j) % size], "unit_price": 10.0, "quantity": 1, "line_total": 10.0}
+        for i, order_id in enumerate(orders)
+        for j in range(ORDER_LINES)
+    ])
+    session.commit()
+
+
+def operations(session_factory: sessionmaker, size: int) -> Dict[str, Callable[[], object]]:
+    """The tracked operations, each a no-argument callable timed per call."""
+    with session_factory() as session:
+        customer_id = session.scalar(select(CustomerModel.id).limit(1))
+        product_ids = session.scalars(select(ProductModel.id).order_by(ProductModel.id).limit(ORDER_LINES)).all()
+        models = session.scalars(OrderRepository._with_items(select(OrderModel).order_by(OrderModel.id).limit(PAGE_SIZE))).all()
+        orders = [OrderRepository._to_entity(model) for model in models]
+        session.expunge_all()
+    items = [{"product_id": product_id, "quantity": 1} for product_id in product_ids]
+    term = f"produto {size // 2}"
+
+    def create_order():
+        with session_factory() as session:
+            return OrderService(session).create_order(customer_id, items)
+
+    def product_search():
+        with session_factory() as session:
+            return ProductRepository(session).get_all(0, PAGE_SIZE, search=term)
+
+    return {
+        "order_service.create_order": create_order,
+        "product_repository.search": product_search,
+        "order_repository.to_entity": lambda: [OrderRepository._to_entity(model) for model in models],
+        "serialization.order_pydantic": lambda: [OrderResponse.model_validate(o).model_dump_json() for o in orders],
+        "serialization.order_lean": lambda: orjson.dumps([order_to_dict(o) for o in orders]),
+    }
+
+
+@contextmanager
+def logging_operations() -> Iterator[Dict[str, Callable[[], object]]]:
+    """
+    Log the events of LOG_BATCH order requests at info level, to /dev/null.
+
+    logging.sync_json renders and writes on the calling thread, as main.py
+    used to; logging.queued_sampled goes through the sampler and the queue,
+    whose backlog is written out (untimed) before each call.
+    """
+    devnull = open(os.devnull, "w")
+    sync_handler = logging.StreamHandler(devnull)
+    writer = logging.StreamHandler(devnull)
+    writer.setFormatter(json_formatter())
+    queue_handler, listener = start_writer(writer, queue_size=0)
+
+    def stdlib_logger(name: str, handler: logging.Handler) -> logging.Logger:
+        log = logging.getLogger(name)
+        log.handlers, log.propagate = [handler], False
+        log.setLevel(logging.INFO)
+        return log
+
+    sync_logger = structlog.wrap_logger(
+        stdlib_logger("bench.sync", sync_handler),
+        processors=[
+            structlog.stdlib.filter_by_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            structlog.processors.JSONRenderer(),
+        ],
+        wrapper_class=structlog.stdlib.BoundLogger,
+    )
+    queued_logger = structlog.wrap_logger(
+        stdlib_logger("bench.queued", queue_handler),
+        processors=request_processors(EventSampler(parse_sample_rates(LOG_SAMPLE_RATES))),
+        wrapper_class=structlog.stdlib.BoundLogger,
+    )
+
+    def order_requests(log) -> None:
+        for n in range(LOG_BATCH):
+            log.info("Creating order", customer_id=n, items_count=ORDER_LINES, idempotency_key=None)
+            log.info("Order created successfully", order_id=n, total_amount="123.45")
+            log.info("Request completed", method="POST", route="/api/v1/orders/", status=201,
+                     duration_ms=4.2, queries=7, db_ms=1.3)
+
+    def queued():
+        order_requests(queued_logger)
+
+    queued.settle = queue_handler.queue.join
+    try:
+        yield {
+            "logging.sync_json": lambda: order_requests(sync_logger),
+            "logging.queued_sampled": queued,
+        }
+    finally:
+        listener.stop()
+        devnull.close()
+
+
+def measure(operation: Callable[[], object], repeat: int) -> float:
+    """
+    Median time of one call in ms, after one warm-up call.
+
+    An operation's settle() attribute, if any, runs untimed before each call.
+    """
+    settle = getattr(operation, "settle", lambda: None)
+    operation()
+    timings = []
+    for _ in range(repeat):
+        settle()
+        gc.collect()
+        started = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def run_suite(database_url: str, sizes: List[int], repeat: int) -> Dict[str, Dict[str, float]]:
+    """Return {size: {operation: median ms}}, reseeding the database for each size."""
+    engine = create_engine(database_url)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    results = {}
+    try:
+        for size in sizes:
+            create_schema(engine)
+            with session_factory() as session:
+                seed(session, size)
+            with logging_operations() as logging_ops:
+                results[str(size)] = {
+                    name: round(measure(operation, repeat), 4)
+                    for name, operation in {**operations(session_factory, size), **logging_ops}.items()
+                }
+            Base.metadata.drop_all(bind=engine)
+    finally:
+        engine.dispose()
+    return results
+
+
+def create_schema(engine) -> None:
+    """Create the tables; on PostgreSQL through the migrations, which add the search extensions and indexes."""
+    if engine.dialect.name != "postgresql":
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        return
+    from alembic import command
+    from alembic.config import Config
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP SCHEMA public CASCADE")
+        conn.exec_driver_sql("CREATE SCHEMA public")
+    os.environ["DATABASE_URL"] = engine.url.render_as_string(hide_password=False)
+    command.upgrade(Config(os.path.join(os.path.dirname(BENCHMARK_DIR), "alembic.ini")), "head")
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> List[dict]:
+    """
+    Compare medians with the baseline, one row per size and operation.
+
+    `status` is "regression" when the median exceeds the baseline by more
+    than `threshold` and by at least `min_delta_ms`, "new" without a baseline.
+    """
+    rows = []
+    for size, medians in results.items():
+        for name, median in medians.items():
+            previous = baseline.get(size, {}).get(name)
+            if previous is None:
+                rows.append({"size": size, "operation": name, "median_ms": median, "baseline_ms": None, "change": None, "status": "new"})
+                continue
+            change = median / previous - 1 if previous else 0.0
+            regressed = change > threshold and median - previous >= min_delta_ms
+            rows.append({
+                "size": size, "operation": name, "median_ms": median, "baseline_ms": previous,
+                "change": change, "status": "regression" if regressed else "ok",
+            })
+    return rows
+
+
+def baseline_path(database_url: str) -> str:
+    """Baseline file of the database dialect (sqlite.json, postgresql.json)."""
+    dialect = sqlalchemy.engine.make_url(database_url).get_backend_name()
+    return os.path.join(BASELINE_DIR, f"{dialect}.json")
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]], repeat: int) -> None:
+    """Write the results, keeping the recorded sizes that were not run."""
+    merged = {**load_baseline(path), **results}
+    document = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "machine": f"{platform.system()} {platform.machine()}",
+        "repeat": repeat,
+        "results": merged,
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+@contextmanager
+def local_postgres() -> Iterator[str]:
+    """Start a throwaway PostgreSQL cluster (initdb/pg_ctl on PATH or in PG_BIN) and yield its URL."""
+    bin_dir = os.getenv("PG_BIN") or os.path.dirname(shutil.which("pg_ctl") or "")
+    if not bin_dir:
+        raise SystemExit("pg_ctl not found: add the PostgreSQL bin directory to PATH or set PG_BIN")
+    data_dir = tempfile.mkdtemp(prefix="bench_pg_")
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    subprocess.run([os.path.join(bin_dir, "initdb"), "-D", data_dir, "-U", "postgres", "--auth=trust"],
+                   check=True, stdout=subprocess.DEVNULL)
+    subprocess.run([os.path.join(bin_dir, "pg_ctl"), "-D", data_dir, "-w", "-l", os.path.join(data_dir, "server.log"),
+                    "-o", f"-p {port} -k {data_dir} -c fsync=off", "start"], check=True, stdout=subprocess.DEVNULL)
+    try:
+        yield f"postgresql://postgres@127.0.0.1:{port}/postgres"
+    finally:
+        subprocess.run([os.path.join(bin_dir, "pg_ctl"), "-D", data_dir, "-m", "fast", "stop"], stdout=subprocess.DEVNULL)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def report(rows: List[dict]) -> None:
+    for row in rows:
+        baseline = f"{row['baseline_ms']:9.3f} ms" if row["baseline_ms"] is not None else f"{'-':>12}"
+        change = f"{row['change']:+7.1%}" if row["change"] is not None else f"{'':>7}"
+        print(f"  {row['size']:>7}  {row['operation']:<30} {row['median_ms']:9.3f} ms  base {baseline}  {change}  {row['status']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--database-url", help="Throwaway database, wiped for each size (default: temporary SQLite file)")
+    target.add_argument("--start-postgres", action="store_true", help="Run against a throwaway local PostgreSQL cluster")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated seed sizes")
+    parser.add_argument("--repeat", type=int, default=30, help="Timed calls per operation")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS, help="Ignore smaller slowdowns")
+    parser.add_argument("--baseline", help="Baseline file (default: baselines/<dialect>.json)")
+    parser.add_argument("--update", action="store_true", help="Record the results as the baseline")
+    args = parser.parse_args(argv)
+
+    # Order creation logs every call; keep the output to the report
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    with (local_postgres() if args.start_postgres else _given_url(args.database_url)) as url:
+        path = args.baseline or baseline_path(url)
+        results = run_suite(url, sizes, args.repeat)
+
+    rows = compare(results, load_baseline(path), args.threshold, args.min_delta_ms)
+    print(f"{os.path.basename(path)}, median of {args.repeat} calls, threshold {args.threshold:.0%}")
+    report(rows)
+
+    if args.update:
+        save_baseline(path, results, args.repeat)
+        print(f"Baseline written to {path}")
+        return 0
+    regressions = [row for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+    missing = [row for row in rows if row["status"] == "new"]
+    if missing:
+        print(f"{len(missing)} operation(s) without a baseline in {path}: record it with --update")
+    return 1 if regressions or missing else 0
+
+
+@contextmanager
+def _given_url(database_url: Optional[str]) -> Iterator[str]:
+    yield database_url or f"sqlite:///{tempfile.mkdtemp()}/bench_suite.db"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import os
+import zlib
+from typing import Callable, Dict, Optional
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+# Smaller bodies are sent as is: compressing them saves less than it costs
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+# Media types of list pages (JSON, MessagePack) and exports (NDJSON, CSV)
+COMPRESSIBLE_TYPES = ("application/json", "application/msgpack", "application/x-ndjson", "text/csv")
+# Preferred first when the client accepts both equally
+ENCODINGS = ("br", "gzip")
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """The content coding to use for an Accept-Encoding header, None for identity."""
+    if not accept_encoding:
+        return None
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        if coding:
+            qualities[coding.strip().lower()] = quality
+    best = max(ENCODINGS, key=lambda coding: qualities.get(coding, qualities.get("*", 0.0)))
+    return best if qualities.get(best, qualities.get("*", 0.0)) > 0 else None
+
+
+def compressible(endpoint: Callable) -> Callable:
+    """Mark a route whose responses CompressionMiddleware may compress (list pages, exports)."""
+    endpoint.compressible = True
+    return endpoint
+
+
+class _Compressor:
+    """One compression stream per response; compress() flushes, so each chunk can be sent at once."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH)
+
+
+def _keep_weak_etag(headers: MutableHeaders, if_none_match: Optional[str]) -> None:
+    """Weaken the ETag of a 304 when the client revalidated the weak ETag of an encoded body."""
+    etag = headers.get("etag")
+    if etag and if_none_match and f"W/{etag}" in (tag.strip() for tag in if_none_match.split(",")):
+        headers["ETag"] = f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """
+    Compress list pages and exports with brotli or gzip, as the client accepts.
+
+    Only responses of routes marked with @compressible are considered. A
+    complete body of at least COMPRESSION_MIN_BYTES is compressed in one
+    call; a streamed body (exports) goes through one compression stream,
+    flushed at every chunk. Every response of a marked route, 304s and small
+    bodies included, says in Vary that it depends on Accept-Encoding. An
+    encoded body is not byte-identical to the identity one, so its ETag is
+    made weak (W/); the 304 answering a weak validator keeps it weak.
+    """
+
+    def __init__(self, app: ASGIApp, min_bytes: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.min_bytes = min_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = choose_encoding(request_headers.get("accept-encoding"))
+        start: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                endpoint = getattr(scope.get("route"), "endpoint", None)
+                if not getattr(endpoint, "compressible", False):
+                    passthrough = True
+                    await send(message)
+                    return
+                headers = MutableHeaders(scope=message)
+                headers.add_vary_header("Accept-Encoding")
+                media_type = headers.get("content-type", "").split(";")[0].strip()
+                if message["status"] == 304:
+                    passthrough = True
+                    _keep_weak_etag(headers, request_headers.get("if-none-match"))
+                    await send(message)
+                elif encoding is None or media_type not in COMPRESSIBLE_TYPES or "content-encoding" in headers:
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Held until the first body chunk tells whether the body is complete
+                    start = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start is not None:
+                if not more_body and len(body) < self.min_bytes:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                headers = MutableHeaders(scope=start)
+                compressor = _Compressor(encoding)
+                headers["Content-Encoding"] = encoding
+                if "etag" in headers and not headers["etag"].startswith("W/"):
+                    headers["ETag"] = f"W/{headers['etag']}"
+                if more_body:
+                    del headers["Content-Length"]
+                    message = {**message, "body": compressor.compress(body)}
+                else:
+                    compressed = compressor.finish(body)
+                    headers["Content-Length"] = str(len(compressed))
+                    message = {**message, "body": compressed}
+                await send(start)
+                start = None
+                await send(message)
+                return
+
+            # Later chunks of a compressed stream
+            data = compressor.compress(body) if more_body else compressor.finish(body)
+            await send({**message, "body": data})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,56 @@
+import hashlib
+import json
+from typing import Iterable, Optional, Sequence, Tuple
+from fastapi import Response
+
+# Browsers store the response but revalidate it (If-None-Match) on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def _fields_suffix(fields: Optional[Sequence[str]]) -> str:
+    # A sparse fieldset is a representation of its own
+    return f"-f{hashlib.sha256(','.join(fields).encode()).hexdigest()[:8]}" if fields else ""
+
+
+def resource_etag(kind: str, resource_id: int, version: int, fields: Optional[Sequence[str]] = None) -> str:
+    """Strong ETag of a single resource, from its row version (and the fields returned, if sparse)."""
+    return f'"{kind}-{resource_id}-v{version}{_fields_suffix(fields)}"'
+
+
+def list_etag(
+    kind: str,
+    versions: Iterable[Tuple[int, int]],
+    total: Optional[int],
+    fmt: str = "json",
+    fields: Optional[Sequence[str]] = None
+) -> str:
+    """
+    Strong ETag of a list page, from the (id, version) of its rows and its total.
+
+    Representations other than JSON (`fmt`) and sparse fieldsets get their
+    own ETag.
+    """
+    payload = json.dumps([total, [list(v) for v in versions]], separators=(",", ":"))
+    suffix = _fields_suffix(fields) + ("" if fmt == "json" else f"-{fmt}")
+    return f'"{kind}-{hashlib.sha256(payload.encode()).hexdigest()[:32]}{suffix}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches the ETag (weak comparison, as for GET)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """Build the bodyless 304 answer to a matching conditional GET."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach the ETag of the representation being returned."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
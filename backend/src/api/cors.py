@@ -0,0 +1,28 @@
+from typing import List
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+
+def cors_origins(value: str) -> List[str]:
+    """
+    Origins allowed by CORS_ORIGINS (comma-separated).
+
+    Requests carry credentials (the frontend sends the read-after-write
+    cookie back), so every origin must be listed: "*" is rejected.
+    """
+    origins = [origin.strip() for origin in value.split(",") if origin.strip()]
+    if "*" in origins:
+        raise ValueError("CORS_ORIGINS must list the allowed origins: '*' cannot be used with credentials")
+    return origins
+
+
+def add_cors(app: FastAPI, origins: List[str]) -> None:
+    """Allow the frontend origins, with credentials, to call the API."""
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Query-Count", "Server-Timing"],
+    )
@@ -0,0 +1,141 @@
+import csv
+import io
+import os
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List
+import orjson
+from fastapi.responses import StreamingResponse
+from src.domain.entities import Customer, Order, Product
+from .serialization import customer_to_dict, order_to_dict, product_to_dict
+import structlog
+
+logger = structlog.get_logger()
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+# Encoded rows are sent in chunks of about this size
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+EXPORT_FORMAT_PATTERN = "^(ndjson|csv)$"
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _product_rows(product: Product) -> List[List[Any]]:
+    return [[product.id, product.name, product.sku, product.price, product.stock_qty,
+             product.is_active, product.created_at.isoformat()]]
+
+
+def _customer_rows(customer: Customer) -> List[List[Any]]:
+    return [[customer.id, customer.name, customer.email, customer.document, customer.created_at.isoformat()]]
+
+
+def _order_rows(order: Order) -> List[List[Any]]:
+    """One row per item, repeating the order columns."""
+    status = getattr(order.status, "value", order.status)
+    return [
+        [order.id, order.customer_id, status, order.total_amount, order.created_at.isoformat(),
+         item.id, item.product_id, item.unit_price, item.quantity, item.line_total]
+        for item in order.items
+    ]
+
+
+# resource -> (CSV header, CSV rows of one entity, NDJSON document of one entity)
+RESOURCES: Dict[str, tuple] = {
+    "products": (
+        ["id", "name", "sku", "price", "stock_qty", "is_active", "created_at"],
+        _product_rows,
+        product_to_dict,
+    ),
+    "customers": (
+        ["id", "name", "email", "document", "created_at"],
+        _customer_rows,
+        customer_to_dict,
+    ),
+    "orders": (
+        ["order_id", "customer_id", "status", "total_amount", "created_at",
+         "item_id", "product_id", "unit_price", "quantity", "line_total"],
+        _order_rows,
+        order_to_dict,
+    ),
+}
+
+
+class ExportEncoder:
+    """Encode entities of one resource as NDJSON lines or CSV rows, buffering into chunks."""
+
+    def __init__(self, resource: str, fmt: str):
+        self.header, self.to_rows, self.to_dict = RESOURCES[resource]
+        self.fmt = fmt
+        self._parts: List[bytes] = []
+        self._size = 0
+        self._text = io.StringIO()
+        self._writer = csv.writer(self._text)
+        if fmt == "csv":
+            self._writer.writerow(self.header)
+
+    def add(self, entity: Any) -> bool:
+        """Encode one entity; True once a chunk is ready to be taken."""
+        if self.fmt == "csv":
+            self._writer.writerows(self.to_rows(entity))
+            return self._text.tell() >= EXPORT_CHUNK_BYTES
+
+        line = orjson.dumps(self.to_dict(entity), option=orjson.OPT_UTC_Z) + b"\n"
+        self._parts.append(line)
+        self._size += len(line)
+        return self._size >= EXPORT_CHUNK_BYTES
+
+    def take(self) -> bytes:
+        """Return the buffered bytes and start a new chunk."""
+        if self.fmt == "csv":
+            chunk = self._text.getvalue().encode()
+            self._text.seek(0)
+            self._text.truncate()
+            return chunk
+
+        chunk = b"".join(self._parts)
+        self._parts, self._size = [], 0
+        return chunk
+
+
+def export_chunks(entities: Iterable[Any], encoder: ExportEncoder, close: Callable[[], None]) -> Iterator[bytes]:
+    """
+    Encode a streamed result into chunks, then release the session.
+
+    The request's session is closed by its dependency before the body is
+    sent, so the stream reopens it on first read and closes it here.
+    """
+    try:
+        for entity in entities:
+            if encoder.add(entity):
+                yield encoder.take()
+        yield encoder.take()
+    except Exception as e:
+        logger.error("Export aborted", error=str(e))
+        raise
+    finally:
+        close()
+
+
+async def async_export_chunks(
+    entities: AsyncIterable[Any],
+    encoder: ExportEncoder,
+    close: Callable[[], Awaitable[None]]
+) -> AsyncIterator[bytes]:
+    """Async counterpart of export_chunks."""
+    try:
+        async for entity in entities:
+            if encoder.add(entity):
+                yield encoder.take()
+        yield encoder.take()
+    except Exception as e:
+        logger.error("Export aborted", error=str(e))
+        raise
+    finally:
+        await close()
+
+
+def export_response(chunks, resource: str, fmt: str) -> StreamingResponse:
+    """Stream chunks as a downloadable NDJSON or CSV file."""
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{resource}.{fmt}"'},
+    )
@@ -1,28 +1,29 @@
+import asyncio
 import os
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
 import structlog
 
-from src.api.routes import api_router
-
-# Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
-    ],
-    wrapper_class=structlog.stdlib.BoundLogger,
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    cache_logger_on_first_use=True,
+from src.api.compression import COMPRESSION_ENABLED, CompressionMiddleware
+from src.api.cors import add_cors, cors_origins
+from src.api.metrics import MetricsMiddleware, metrics_response
+from src.api.query_timing import QueryTimingMiddleware
+from src.api.read_after_write import ReadAfterWriteMiddleware
+from src.api.routes import api_router, async_api_router
+from src.application.services import ProductService, shutdown_group_committer
+from src.infrastructure.database import DB_STACK
+from src.infrastructure.database.config import DATABASE_READ_URL, SessionLocal, async_engine, async_read_engine, listen_engine
+from src.infrastructure.database.query_stats import SQL_INSTRUMENTATION_ENABLED
+from src.infrastructure.logging_config import configure_logging
+from src.infrastructure.metrics import METRICS_ENABLED, mark_worker_dead
+from src.infrastructure.repositories import (
+    ProductCache,
+    start_product_cache_listener,
+    stop_product_cache_listener,
 )
 
+# Structured logging, rendered and written by a background thread
+configure_logging()
+
 logger = structlog.get_logger()
 
 # Create FastAPI app
@@ -34,19 +35,27 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
-# Configure CORS
-cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
+# Configure CORS (with credentials: the read-after-write cookie)
+add_cors(app, cors_origins(os.getenv("CORS_ORIGINS", "http://localhost:3000")))
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Brotli/gzip for list pages and exports, by Accept-Encoding
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Reads go to the replica except right after the client's own writes
+if DATABASE_READ_URL:
+    app.add_middleware(ReadAfterWriteMiddleware)
+
+# Query count and database time per request (headers and log line)
+if SQL_INSTRUMENTATION_ENABLED:
+    app.add_middleware(QueryTimingMiddleware)
+
+# Outermost, so latency includes the other middlewares
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
-# Include API routes
-app.include_router(api_router, prefix="/api/v1")
+# Include API routes for the configured database stack
+app.include_router(async_api_router if DB_STACK == "async" else api_router, prefix="/api/v1")
 
 
 @app.get("/health")
@@ -55,13 +64,42 @@ def health_check():
     return {"status": "healthy", "service": "TopSaúdeHUB API"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics, aggregated across workers."""
+    return metrics_response()
+
+
+def warm_product_cache() -> None:
+    """Preload the newest active products; startup goes on if the database is unreachable."""
+    db = SessionLocal()
+    try:
+        loaded = ProductService(db).warm_cache(ProductCache.warmup_size)
+        logger.info("Product cache warmed up", products=loaded)
+    except Exception as e:
+        logger.warning("Product cache warm-up failed", error=str(e))
+    finally:
+        db.close()
+
+
 @app.on_event("startup")
 async def startup_event():
     """Startup event handler."""
-    logger.info("TopSaúdeHUB API starting up")
+    logger.info("TopSaúdeHUB API starting up", db_stack=DB_STACK)
+    # Listen before warming up so no invalidation is missed in between
+    start_product_cache_listener(listen_engine)
+    if ProductCache.enabled and ProductCache.warmup_size > 0:
+        await asyncio.to_thread(warm_product_cache)
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Shutdown event handler."""
     logger.info("TopSaúdeHUB API shutting down")
+    shutdown_group_committer()
+    stop_product_cache_listener()
+    mark_worker_dead()
+    if async_engine is not None:
+        await async_engine.dispose()
+    if async_read_engine is not None:
+        await async_read_engine.dispose()
@@ -0,0 +1,48 @@
+import time
+from prometheus_client import CONTENT_TYPE_LATEST
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.infrastructure.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS_IN_PROGRESS, render_metrics
+
+
+class MetricsMiddleware:
+    """
+    Record latency per route template and status, and requests in flight.
+
+    A plain ASGI middleware: the route template is read from the scope
+    after FastAPI matched it, so nothing is resolved twice. Unmatched paths
+    share one label to keep the series count bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.labels(method, template, str(status)).observe(time.perf_counter() - started)
+
+
+def metrics_response() -> Response:
+    """Serve the metrics of every worker in the Prometheus text format."""
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
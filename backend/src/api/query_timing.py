@@ -0,0 +1,74 @@
+import time
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.infrastructure.database.query_stats import QueryStats, install_query_hooks, track_queries
+from src.infrastructure.logging_config import lazy
+import structlog
+
+logger = structlog.get_logger()
+
+
+class QueryTimingMiddleware:
+    """
+    Report the SQL run by each request.
+
+    Adds `X-Query-Count` and `Server-Timing` (db and app durations) to the
+    response, logs one line per request with the query count and database
+    time, and warns about statements repeated often enough to be an N+1.
+    Headers are sent before a streamed body, so they only cover the
+    queries run until then; the log line covers the whole request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        install_query_hooks()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        with track_queries() as stats:
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers["X-Query-Count"] = str(stats.count)
+                    headers.append("Server-Timing", self._server_timing(stats, started))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                self._log(scope, status, stats, started)
+
+    @staticmethod
+    def _server_timing(stats: QueryStats, started: float) -> str:
+        app_ms = (time.perf_counter() - started) * 1000
+        return f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries", app;dur={app_ms:.1f}'
+
+    @staticmethod
+    def _breakdown(stats: QueryStats, limit: int = 10) -> list:
+        top = sorted(stats.statements.items(), key=lambda item: -item[1])[:limit]
+        return [{"count": count, "statement": " ".join(statement.split())[:200]} for statement, count in top]
+
+    @staticmethod
+    def _log(scope: Scope, status: int, stats: QueryStats, started: float) -> None:
+        route = getattr(scope.get("route"), "path_format", None) or scope["path"]
+        logger.info(
+            "Request completed",
+            method=scope["method"],
+            route=route,
+            status=status,
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+            queries=stats.count,
+            db_ms=round(stats.seconds * 1000, 1),
+        )
+        # Built only when debug logging is on
+        logger.debug("Request queries", route=route, statements=lazy(lambda: QueryTimingMiddleware._breakdown(stats)))
+        for statement, count in stats.repeated():
+            logger.warning("Possible N+1 query", route=route, count=count, statement=statement[:500])
@@ -0,0 +1,34 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.infrastructure.database.read_routing import PRIMARY_COOKIE, READ_AFTER_WRITE_SECONDS, primary_cookie_value
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReadAfterWriteMiddleware:
+    """
+    Pin a client's reads to the primary for a short while after it writes.
+
+    Every response to a write carries a cookie with the end of the window;
+    get_read_db routes the client's reads to the primary until then, so it
+    does not miss its own changes on a lagging replica.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{PRIMARY_COOKIE}={primary_cookie_value()}; Max-Age={int(READ_AFTER_WRITE_SECONDS) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -2,9 +2,23 @@ from fastapi import APIRouter
 from .products import router as products_router
 from .customers import router as customers_router
 from .orders import router as orders_router
+from .stats import router as stats_router
+from .async_products import router as async_products_router
+from .async_customers import router as async_customers_router
+from .async_orders import router as async_orders_router
+from .async_stats import router as async_stats_router
 
 api_router = APIRouter()
 
 api_router.include_router(products_router, prefix="/products", tags=["Products"])
 api_router.include_router(customers_router, prefix="/customers", tags=["Customers"])
 api_router.include_router(orders_router, prefix="/orders", tags=["Orders"])
+api_router.include_router(stats_router, prefix="/stats", tags=["Stats"])
+
+# Same endpoints served by async def routes on the AsyncSession stack
+async_api_router = APIRouter()
+
+async_api_router.include_router(async_products_router, prefix="/products", tags=["Products"])
+async_api_router.include_router(async_customers_router, prefix="/customers", tags=["Customers"])
+async_api_router.include_router(async_orders_router, prefix="/orders", tags=["Orders"])
+async_api_router.include_router(async_stats_router, prefix="/stats", tags=["Stats"])
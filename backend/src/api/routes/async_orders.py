@@ -0,0 +1,243 @@
+from fastapi import APIRouter, Depends, Query, Header, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from src.infrastructure.database import get_async_db, get_async_read_db
+from src.application.services import AsyncOrderService
+from src.api.compression import compressible
+from src.api.conditional import etag_matches, list_etag, not_modified, resource_etag, set_etag
+from src.api.export import EXPORT_BATCH_SIZE, EXPORT_FORMAT_PATTERN, ExportEncoder, async_export_chunks, export_response
+from src.api.serialization import (
+    lean_item_response,
+    lean_list_response,
+    LEAN_SERIALIZATION,
+    list_format,
+    order_to_dict,
+    parse_fields,
+    pick_fields,
+)
+from src.api.schemas import (
+    ApiResponse,
+    OrderCreate,
+    OrderResponse,
+    OrderListResponse,
+    OrderStatusUpdate,
+    OrderBatchCreate,
+    OrderBatchResult,
+    OrderBatchResponse
+)
+import structlog
+
+logger = structlog.get_logger()
+router = APIRouter()
+
+
+@router.post("", response_model=ApiResponse[OrderResponse])
+async def create_order(
+    order: OrderCreate,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    """Create a new order with idempotency support."""
+    try:
+        service = AsyncOrderService(db)
+
+        # Prepare items
+        items = [item.model_dump() for item in order.items]
+
+        created_order = await service.create_order(
+            customer_id=order.customer_id,
+            items=items,
+            idempotency_key=idempotency_key
+        )
+
+        response_data = OrderResponse.model_validate(created_order)
+        return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Order creation failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
+    except Exception as e:
+        logger.error("Unexpected error creating order", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
+
+
+@router.post("/batch", response_model=ApiResponse[OrderBatchResponse])
+async def create_orders_batch(batch: OrderBatchCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create many orders in a single transaction, reporting a result per order."""
+    try:
+        service = AsyncOrderService(db)
+        outcomes = await service.create_orders_batch([o.model_dump() for o in batch.orders])
+
+        results = [
+            OrderBatchResult(
+                index=index,
+                cod_retorno=0 if order else 1,
+                mensagem=error,
+                data=OrderResponse.model_validate(order) if order else None
+            )
+            for index, (order, error) in enumerate(outcomes)
+        ]
+        created = sum(1 for r in results if r.cod_retorno == 0)
+        response_data = OrderBatchResponse(
+            results=results,
+            created=created,
+            failed=len(results) - created
+        )
+        return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Order batch creation failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
+    except Exception as e:
+        logger.error("Unexpected error creating order batch", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
+
+
+@router.get("/export")
+@compressible
+async def export_orders(
+    customer_id: Optional[int] = None,
+    status: Optional[str] = None,
+    fmt: str = Query("ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Stream every order matching the list filters as NDJSON or CSV."""
+    orders = AsyncOrderService(db).export_orders(customer_id, status, EXPORT_BATCH_SIZE)
+    chunks = async_export_chunks(orders, ExportEncoder("orders", fmt), db.close)
+    return export_response(chunks, "orders", fmt)
+
+
+@router.get("/{order_id}", response_model=ApiResponse[OrderResponse])
+async def get_order(
+    order_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    fields: Optional[str] = None
+):
+    """Get an order by ID."""
+    try:
+        service = AsyncOrderService(db)
+        field_list = parse_fields(fields)
+        if if_none_match:
+            # Answer from the row version alone, before loading the order
+            version = await service.get_order_version(order_id)
+            if version is not None and etag_matches(if_none_match, resource_etag("order", order_id, version, field_list)):
+                return not_modified(resource_etag("order", order_id, version, field_list))
+
+        if field_list:
+            order = await service.get_order_fields(order_id, field_list)
+            if not order:
+                return ApiResponse.error(mensagem=f"Order with id {order_id} not found")
+            set_etag(response, resource_etag("order", order["id"], order["version"], field_list))
+            return lean_item_response(pick_fields(order, field_list), response)
+
+        order = await service.get_order(order_id)
+
+        if not order:
+            return ApiResponse.error(mensagem=f"Order with id {order_id} not found")
+
+        response_data = OrderResponse.model_validate(order)
+        set_etag(response, resource_etag("order", order.id, order.version))
+        return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Fetching order failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
+    except Exception as e:
+        logger.error("Unexpected error fetching order", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
+
+
+@router.get("", response_model=ApiResponse[OrderListResponse])
+@compressible
+async def list_orders(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    customer_id: Optional[int] = None,
+    status: Optional[str] = None,
+    order_by: str = Query("created_at"),
+    order_dir: str = Query("desc"),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor from next_cursor; skip is ignored"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="How to compute total; null with none"),
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    fields: Optional[str] = None
+):
+    """List orders with pagination and filters."""
+    try:
+        service = AsyncOrderService(db)
+        fmt = list_format(accept)
+        field_list = parse_fields(fields)
+        if if_none_match:
+            # Answer from (id, version) of the page rows, before loading any of them
+            versions, total = await service.list_order_versions(skip, limit, customer_id, status, order_by, order_dir, cursor, count)
+            etag = list_etag("orders", versions, total, fmt, field_list)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+        if field_list:
+            rows, total = await service.list_order_fields(field_list, skip, limit, customer_id, status, order_by, order_dir, cursor, count)
+            set_etag(response, list_etag("orders", [(r["id"], r["version"]) for r in rows], total, fmt, field_list))
+            next_cursor = service.next_cursor(rows, order_by, limit)
+            items = [pick_fields(r, field_list) for r in rows]
+            return lean_list_response(items, total, skip, limit, next_cursor, response, fmt)
+
+        orders, total = await service.list_orders(skip, limit, customer_id, status, order_by, order_dir, cursor, count)
+        set_etag(response, list_etag("orders", [(o.id, o.version) for o in orders], total, fmt))
+        next_cursor = service.next_cursor(orders, order_by, limit)
+
+        if LEAN_SERIALIZATION:
+            items = [order_to_dict(o) for o in orders]
+            return lean_list_response(items, total, skip, limit, next_cursor, response, fmt)
+
+        response_data = OrderListResponse(
+            items=[OrderResponse.model_validate(o) for o in orders],
+            total=total,
+            skip=skip,
+            limit=limit,
+            next_cursor=next_cursor
+        )
+        return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Listing orders failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
+    except Exception as e:
+        logger.error("Unexpected error listing orders", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
+
+
+@router.patch("/{order_id}/status", response_model=ApiResponse[OrderResponse])
+async def update_order_status(
+    order_id: int,
+    status_update: OrderStatusUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update order status."""
+    try:
+        service = AsyncOrderService(db)
+        updated_order = await service.update_order_status(order_id, status_update.status.value)
+        response_data = OrderResponse.model_validate(updated_order)
+        return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Order status update failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
+    except Exception as e:
+        logger.error("Unexpected error updating order status", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
+
+
+@router.delete("/{order_id}", response_model=ApiResponse[dict])
+async def delete_order(order_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Delete an order."""
+    try:
+        service = AsyncOrderService(db)
+        result = await service.delete_order(order_id)
+
+        if not result:
+            return ApiResponse.error(mensagem=f"Order with id {order_id} not found")
+
+        return ApiResponse.success(data={"deleted": True})
+    except Exception as e:
+        logger.error("Unexpected error deleting order", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
@@ -0,0 +1,261 @@
+import io
+from fastapi import APIRouter, Depends, File, Query, Header, Response, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from src.infrastructure.database import get_async_db, get_async_read_db
+from src.application.services import AsyncProductService, detect_format, read_records
+from src.api.compression import compressible
+from src.api.conditional import etag_matches, list_etag, not_modified, resource_etag, set_etag
+from src.api.export import EXPORT_BATCH_SIZE, EXPORT_FORMAT_PATTERN, ExportEncoder, async_export_chunks, export_response
+from src.api.serialization import (
+    lean_item_response,
+    lean_list_response,
+    LEAN_SERIALIZATION,
+    list_format,
+    parse_fields,
+    pick_fields,
+    product_to_dict,
+)
+from src.api.schemas import (
+    ApiResponse,
+    ProductCreate,
+    ProductUpdate,
+    ProductResponse,
+    ProductListResponse,
+    ProductImportResponse,
+    ProductStockAdjustmentBatch,
+    ProductStockLevel,
+    ProductStockAdjustmentResponse
+)
+import structlog
+
+logger = structlog.get_logger()
+router = APIRouter()
+
+
+@router.post("", response_model=ApiResponse[ProductResponse])
+async def create_product(product: ProductCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create a new product."""
+    try:
+        service = AsyncProductService(db)
+        created_product = await service.create_product(**product.model_dump())
+        response_data = ProductResponse.model_validate(created_product)
+        return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Product creation failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
+    except Exception as e:
+        logger.error("Unexpected error creating product", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
+
+
+@router.post("/import", response_model=ApiResponse[ProductImportResponse])
+async def import_products(
+    file: UploadFile = File(...),
+    fmt: Optional[str] = Query(None, alias="format", pattern="^(csv|ndjson)$", description="Defaults to the file extension"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Upsert products by SKU from an uploaded CSV or NDJSON file."""
+    try:
+        lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        records = read_records(lines, fmt or detect_format(file.filename))
+        result = await AsyncProductService(db).import_products(records)
+        return ApiResponse.success(data=ProductImportResponse(**result.to_dict()))
+    except ValueError as e:
+        logger.warning("Product import failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
+    except Exception as e:
+        logger.error("Unexpected error importing products", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
+
+
+@router.get("/export")
+@compressible
+async def export_products(
+    search: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    fmt: str = Query("ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Stream every product matching the list filters as NDJSON or CSV."""
+    products = AsyncProductService(db).export_products(search, is_active, EXPORT_BATCH_SIZE)
+    chunks = async_export_chunks(products, ExportEncoder("products", fmt), db.close)
+    return export_response(chunks, "products", fmt)
+
+
+@router.get("/{product_id}", response_model=ApiResponse[ProductResponse])
+async def get_product(
+    product_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    fields: Optional[str] = None,
+    primary: AsyncSession = Depends(get_async_db)  # product cache fills
+):
+    """Get a product by ID."""
+    try:
+        service = AsyncProductService(db, primary)
+        field_list = parse_fields(fields)
+        if if_none_match:
+            # Answer from the row version alone, before loading the product
+            version = await service.get_product_version(product_id, cached=not field_list)
+            if version is not None and etag_matches(if_none_match, resource_etag("product", product_id, version, field_list)):
+                return not_modified(resource_etag("product", product_id, version, field_list))
+
+        if field_list:
+            product = await service.get_product_fields(product_id, field_list)
+            if not product:
+                return ApiResponse.error(mensagem=f"Product with id {product_id} not found")
+            set_etag(response, resource_etag("product", product["id"], product["version"], field_list))
+            return lean_item_response(pick_fields(product, field_list), response)
+
+        product = await service.get_product(product_id)
+
+        if not product:
+            return ApiResponse.error(mensagem=f"Product with id {product_id} not found")
+
+        response_data = ProductResponse.model_validate(product)
+        set_etag(response, resource_etag("product", product.id, product.version))
+        return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Fetching product failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
+    except Exception as e:
+        logger.error("Unexpected error fetching product", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
+
+
+@router.get("", response_model=ApiResponse[ProductListResponse])
+@compressible
+async def list_products(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    search: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    order_by: str = Query("created_at"),
+    order_dir: str = Query("desc"),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor from next_cursor; skip is ignored"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="How to compute total; null with none"),
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    fields: Optional[str] = None
+):
+    """List products with pagination and filters."""
+    try:
+        service = AsyncProductService(db)
+        fmt = list_format(accept)
+        field_list = parse_fields(fields)
+        if if_none_match:
+            # Answer from (id, version) of the page rows, before loading any of them
+            versions, total = await service.list_product_versions(skip, limit, search, is_active, order_by, order_dir, cursor, count)
+            etag = list_etag("products", versions, total, fmt, field_list)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+        if field_list:
+            rows, total = await service.list_product_fields(field_list, skip, limit, search, is_active, order_by, order_dir, cursor, count)
+            set_etag(response, list_etag("products", [(r["id"], r["version"]) for r in rows], total, fmt, field_list))
+            next_cursor = service.next_cursor(rows, order_by, limit)
+            items = [pick_fields(r, field_list) for r in rows]
+            return lean_list_response(items, total, skip, limit, next_cursor, response, fmt)
+
+        products, total = await service.list_products(skip, limit, search, is_active, order_by, order_dir, cursor, count)
+        set_etag(response, list_etag("products", [(p.id, p.version) for p in products], total, fmt))
+        next_cursor = service.next_cursor(products, order_by, limit)
+
+        if LEAN_SERIALIZATION:
+            items = [product_to_dict(p) for p in products]
+            return lean_list_response(items, total, skip, limit, next_cursor, response, fmt)
+
+        response_data = ProductListResponse(
+            items=[ProductResponse.model_validate(p) for p in products],
+            total=total,
+            skip=skip,
+            limit=limit,
+            next_cursor=next_cursor
+        )
+        return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Listing products failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
+    except Exception as e:
+        logger.error("Unexpected error listing products", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
+
+
+@router.patch("/stock", response_model=ApiResponse[ProductStockAdjustmentResponse])
+async def adjust_stock(batch: ProductStockAdjustmentBatch, db: AsyncSession = Depends(get_async_db)):
+    """Adjust the stock of many products in one statement and one transaction."""
+    try:
+        service = AsyncProductService(db)
+        levels = await service.adjust_stock([a.model_dump() for a in batch.adjustments])
+        response_data = ProductStockAdjustmentResponse(products=[
+            ProductStockLevel(product_id=product_id, sku=sku, stock_qty=stock_qty)
+            for product_id, sku, stock_qty in levels
+        ])
+        return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Stock adjustment failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
+    except Exception as e:
+        logger.error("Unexpected error adjusting stock", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
+
+
+@router.put("/{product_id}", response_model=ApiResponse[ProductResponse])
+async def update_product(product_id: int, product: ProductUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Update a product."""
+    try:
+        service = AsyncProductService(db)
+        updated_product = await service.update_product(
+            product_id,
+            **product.model_dump(exclude_unset=True)
+        )
+        response_data = ProductResponse.model_validate(updated_product)
+        return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Product update failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
+    except Exception as e:
+        logger.error("Unexpected error updating product", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
+
+
+@router.delete("/{product_id}", response_model=ApiResponse[dict])
+async def delete_product(product_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Delete a product."""
+    try:
+        service = AsyncProductService(db)
+        result = await service.delete_product(product_id)
+
+        if not result:
+            return ApiResponse.error(mensagem=f"Product with id {product_id} not found")
+
+        return ApiResponse.success(data={"deleted": True})
+    except ValueError as e:
+        logger.warning("Product deletion failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
+    except Exception as e:
+        logger.error("Unexpected error deleting product", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
+
+
+@router.get("/search/autocomplete", response_model=ApiResponse[list[ProductResponse]])
+async def search_products(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_read_db),
+    primary: AsyncSession = Depends(get_async_db)  # product cache fills
+):
+    """Search products for autocomplete."""
+    try:
+        service = AsyncProductService(db, primary)
+        products = await service.search_products(q, limit)
+        response_data = [ProductResponse.model_validate(p) for p in products]
+        return ApiResponse.success(data=response_data)
+    except Exception as e:
+        logger.error("Unexpected error searching products", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
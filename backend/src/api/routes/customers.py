@@ -1,9 +1,21 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Header, Response
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from src.infrastructure.database import get_db
+from src.infrastructure.database import get_db, get_read_db
 from src.application.services import CustomerService
+from src.api.compression import compressible
+from src.api.conditional import etag_matches, list_etag, not_modified, resource_etag, set_etag
+from src.api.export import EXPORT_BATCH_SIZE, EXPORT_FORMAT_PATTERN, ExportEncoder, export_chunks, export_response
+from src.api.serialization import (
+    customer_to_dict,
+    lean_item_response,
+    lean_list_response,
+    LEAN_SERIALIZATION,
+    list_format,
+    parse_fields,
+    pick_fields,
+)
 from src.api.schemas import (
     ApiResponse,
     CustomerCreate,
@@ -33,44 +45,114 @@ def create_customer(customer: CustomerCreate, db: Session = Depends(get_db)):
         return ApiResponse.error(mensagem="Internal server error")
 
 
+@router.get("/export")
+@compressible
+def export_customers(
+    search: Optional[str] = None,
+    fmt: str = Query("ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    db: Session = Depends(get_read_db)
+):
+    """Stream every customer matching the list filters as NDJSON or CSV."""
+    customers = CustomerService(db).export_customers(search, EXPORT_BATCH_SIZE)
+    chunks = export_chunks(customers, ExportEncoder("customers", fmt), db.close)
+    return export_response(chunks, "customers", fmt)
+
+
 @router.get("/{customer_id}", response_model=ApiResponse[CustomerResponse])
-def get_customer(customer_id: int, db: Session = Depends(get_db)):
+def get_customer(
+    customer_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+    fields: Optional[str] = None
+):
     """Get a customer by ID."""
     try:
         service = CustomerService(db)
+        field_list = parse_fields(fields)
+        if if_none_match:
+            # Answer from the row version alone, before loading the customer
+            version = service.get_customer_version(customer_id)
+            if version is not None and etag_matches(if_none_match, resource_etag("customer", customer_id, version, field_list)):
+                return not_modified(resource_etag("customer", customer_id, version, field_list))
+
+        if field_list:
+            customer = service.get_customer_fields(customer_id, field_list)
+            if not customer:
+                return ApiResponse.error(mensagem=f"Customer with id {customer_id} not found")
+            set_etag(response, resource_etag("customer", customer["id"], customer["version"], field_list))
+            return lean_item_response(pick_fields(customer, field_list), response)
+
         customer = service.get_customer(customer_id)
 
         if not customer:
             return ApiResponse.error(mensagem=f"Customer with id {customer_id} not found")
 
         response_data = CustomerResponse.model_validate(customer)
+        set_etag(response, resource_etag("customer", customer.id, customer.version))
         return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Fetching customer failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
     except Exception as e:
         logger.error("Unexpected error fetching customer", error=str(e))
         return ApiResponse.error(mensagem="Internal server error")
 
 
 @router.get("", response_model=ApiResponse[CustomerListResponse])
+@compressible
 def list_customers(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = None,
     order_by: str = Query("created_at"),
     order_dir: str = Query("desc"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor from next_cursor; skip is ignored"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="How to compute total; null with none"),
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+    fields: Optional[str] = None
 ):
     """List customers with pagination and filters."""
     try:
         service = CustomerService(db)
-        customers, total = service.list_customers(skip, limit, search, order_by, order_dir)
+        fmt = list_format(accept)
+        field_list = parse_fields(fields)
+        if if_none_match:
+            # Answer from (id, version) of the page rows, before loading any of them
+            versions, total = service.list_customer_versions(skip, limit, search, order_by, order_dir, cursor, count)
+            etag = list_etag("customers", versions, total, fmt, field_list)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+        if field_list:
+            rows, total = service.list_customer_fields(field_list, skip, limit, search, order_by, order_dir, cursor, count)
+            set_etag(response, list_etag("customers", [(r["id"], r["version"]) for r in rows], total, fmt, field_list))
+            next_cursor = service.next_cursor(rows, order_by, limit)
+            items = [pick_fields(r, field_list) for r in rows]
+            return lean_list_response(items, total, skip, limit, next_cursor, response, fmt)
+
+        customers, total = service.list_customers(skip, limit, search, order_by, order_dir, cursor, count)
+        set_etag(response, list_etag("customers", [(c.id, c.version) for c in customers], total, fmt))
+        next_cursor = service.next_cursor(customers, order_by, limit)
+
+        if LEAN_SERIALIZATION:
+            items = [customer_to_dict(c) for c in customers]
+            return lean_list_response(items, total, skip, limit, next_cursor, response, fmt)
 
         response_data = CustomerListResponse(
             items=[CustomerResponse.model_validate(c) for c in customers],
             total=total,
             skip=skip,
-            limit=limit
+            limit=limit,
+            next_cursor=next_cursor
         )
         return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Listing customers failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
     except Exception as e:
         logger.error("Unexpected error listing customers", error=str(e))
         return ApiResponse.error(mensagem="Internal server error")
@@ -1,15 +1,30 @@
-from fastapi import APIRouter, Depends, Query, Header
+from fastapi import APIRouter, Depends, Query, Header, Response
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from src.infrastructure.database import get_db
-from src.application.services import OrderService
+from src.infrastructure.database import get_db, get_read_db
+from src.application.services import OrderService, get_group_committer
+from src.api.compression import compressible
+from src.api.conditional import etag_matches, list_etag, not_modified, resource_etag, set_etag
+from src.api.export import EXPORT_BATCH_SIZE, EXPORT_FORMAT_PATTERN, ExportEncoder, export_chunks, export_response
+from src.api.serialization import (
+    lean_item_response,
+    lean_list_response,
+    LEAN_SERIALIZATION,
+    list_format,
+    order_to_dict,
+    parse_fields,
+    pick_fields,
+)
 from src.api.schemas import (
     ApiResponse,
     OrderCreate,
     OrderResponse,
     OrderListResponse,
-    OrderStatusUpdate
+    OrderStatusUpdate,
+    OrderBatchCreate,
+    OrderBatchResult,
+    OrderBatchResponse
 )
 import structlog
 
@@ -25,7 +40,7 @@ def create_order(
 ):
     """Create a new order with idempotency support."""
     try:
-        service = OrderService(db)
+        service = OrderService(db, group_committer=get_group_committer())
 
         # Prepare items
         items = [item.model_dump() for item in order.items]
@@ -46,45 +61,147 @@ def create_order(
         return ApiResponse.error(mensagem="Internal server error")
 
 
+@router.post("/batch", response_model=ApiResponse[OrderBatchResponse])
+def create_orders_batch(batch: OrderBatchCreate, db: Session = Depends(get_db)):
+    """Create many orders in a single transaction, reporting a result per order."""
+    try:
+        service = OrderService(db)
+        outcomes = service.create_orders_batch([o.model_dump() for o in batch.orders])
+
+        results = [
+            OrderBatchResult(
+                index=index,
+                cod_retorno=0 if order else 1,
+                mensagem=error,
+                data=OrderResponse.model_validate(order) if order else None
+            )
+            for index, (order, error) in enumerate(outcomes)
+        ]
+        created = sum(1 for r in results if r.cod_retorno == 0)
+        response_data = OrderBatchResponse(
+            results=results,
+            created=created,
+            failed=len(results) - created
+        )
+        return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Order batch creation failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
+    except Exception as e:
+        logger.error("Unexpected error creating order batch", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
+
+
+@router.get("/export")
+@compressible
+def export_orders(
+    customer_id: Optional[int] = None,
+    status: Optional[str] = None,
+    fmt: str = Query("ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    db: Session = Depends(get_read_db)
+):
+    """Stream every order matching the list filters as NDJSON or CSV."""
+    orders = OrderService(db).export_orders(customer_id, status, EXPORT_BATCH_SIZE)
+    chunks = export_chunks(orders, ExportEncoder("orders", fmt), db.close)
+    return export_response(chunks, "orders", fmt)
+
+
 @router.get("/{order_id}", response_model=ApiResponse[OrderResponse])
-def get_order(order_id: int, db: Session = Depends(get_db)):
+def get_order(
+    order_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+    fields: Optional[str] = None
+):
     """Get an order by ID."""
     try:
         service = OrderService(db)
+        field_list = parse_fields(fields)
+        if if_none_match:
+            # Answer from the row version alone, before loading the order
+            version = service.get_order_version(order_id)
+            if version is not None and etag_matches(if_none_match, resource_etag("order", order_id, version, field_list)):
+                return not_modified(resource_etag("order", order_id, version, field_list))
+
+        if field_list:
+            order = service.get_order_fields(order_id, field_list)
+            if not order:
+                return ApiResponse.error(mensagem=f"Order with id {order_id} not found")
+            set_etag(response, resource_etag("order", order["id"], order["version"], field_list))
+            return lean_item_response(pick_fields(order, field_list), response)
+
         order = service.get_order(order_id)
 
         if not order:
             return ApiResponse.error(mensagem=f"Order with id {order_id} not found")
 
         response_data = OrderResponse.model_validate(order)
+        set_etag(response, resource_etag("order", order.id, order.version))
         return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Fetching order failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
     except Exception as e:
         logger.error("Unexpected error fetching order", error=str(e))
         return ApiResponse.error(mensagem="Internal server error")
 
 
 @router.get("", response_model=ApiResponse[OrderListResponse])
+@compressible
 def list_orders(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     customer_id: Optional[int] = None,
     status: Optional[str] = None,
     order_by: str = Query("created_at"),
     order_dir: str = Query("desc"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor from next_cursor; skip is ignored"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="How to compute total; null with none"),
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+    fields: Optional[str] = None
 ):
     """List orders with pagination and filters."""
     try:
         service = OrderService(db)
-        orders, total = service.list_orders(skip, limit, customer_id, status, order_by, order_dir)
+        fmt = list_format(accept)
+        field_list = parse_fields(fields)
+        if if_none_match:
+            # Answer from (id, version) of the page rows, before loading any of them
+            versions, total = service.list_order_versions(skip, limit, customer_id, status, order_by, order_dir, cursor, count)
+            etag = list_etag("orders", versions, total, fmt, field_list)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+        if field_list:
+            rows, total = service.list_order_fields(field_list, skip, limit, customer_id, status, order_by, order_dir, cursor, count)
+            set_etag(response, list_etag("orders", [(r["id"], r["version"]) for r in rows], total, fmt, field_list))
+            next_cursor = service.next_cursor(rows, order_by, limit)
+            items = [pick_fields(r, field_list) for r in rows]
+            return lean_list_response(items, total, skip, limit, next_cursor, response, fmt)
+
+        orders, total = service.list_orders(skip, limit, customer_id, status, order_by, order_dir, cursor, count)
+        set_etag(response, list_etag("orders", [(o.id, o.version) for o in orders], total, fmt))
+        next_cursor = service.next_cursor(orders, order_by, limit)
+
+        if LEAN_SERIALIZATION:
+            items = [order_to_dict(o) for o in orders]
+            return lean_list_response(items, total, skip, limit, next_cursor, response, fmt)
 
         response_data = OrderListResponse(
             items=[OrderResponse.model_validate(o) for o in orders],
             total=total,
             skip=skip,
-            limit=limit
+            limit=limit,
+            next_cursor=next_cursor
         )
         return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Listing orders failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
     except Exception as e:
         logger.error("Unexpected error listing orders", error=str(e))
         return ApiResponse.error(mensagem="Internal server error")
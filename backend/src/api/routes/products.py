@@ -1,15 +1,32 @@
-from fastapi import APIRouter, Depends, Query
+import io
+from fastapi import APIRouter, Depends, File, Query, Header, Response, UploadFile
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from src.infrastructure.database import get_db
-from src.application.services import ProductService
+from src.infrastructure.database import get_db, get_read_db
+from src.application.services import ProductService, detect_format, read_records
+from src.api.compression import compressible
+from src.api.conditional import etag_matches, list_etag, not_modified, resource_etag, set_etag
+from src.api.export import EXPORT_BATCH_SIZE, EXPORT_FORMAT_PATTERN, ExportEncoder, export_chunks, export_response
+from src.api.serialization import (
+    lean_item_response,
+    lean_list_response,
+    LEAN_SERIALIZATION,
+    list_format,
+    parse_fields,
+    pick_fields,
+    product_to_dict,
+)
 from src.api.schemas import (
     ApiResponse,
     ProductCreate,
     ProductUpdate,
     ProductResponse,
-    ProductListResponse
+    ProductListResponse,
+    ProductImportResponse,
+    ProductStockAdjustmentBatch,
+    ProductStockLevel,
+    ProductStockAdjustmentResponse
 )
 import structlog
 
@@ -33,50 +50,161 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)):
         return ApiResponse.error(mensagem="Internal server error")
 
 
+@router.post("/import", response_model=ApiResponse[ProductImportResponse])
+def import_products(
+    file: UploadFile = File(...),
+    fmt: Optional[str] = Query(None, alias="format", pattern="^(csv|ndjson)$", description="Defaults to the file extension"),
+    db: Session = Depends(get_db)
+):
+    """Upsert products by SKU from an uploaded CSV or NDJSON file."""
+    try:
+        lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        records = read_records(lines, fmt or detect_format(file.filename))
+        result = ProductService(db).import_products(records)
+        return ApiResponse.success(data=ProductImportResponse(**result.to_dict()))
+    except ValueError as e:
+        logger.warning("Product import failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
+    except Exception as e:
+        logger.error("Unexpected error importing products", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
+
+
+@router.get("/export")
+@compressible
+def export_products(
+    search: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    fmt: str = Query("ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    db: Session = Depends(get_read_db)
+):
+    """Stream every product matching the list filters as NDJSON or CSV."""
+    products = ProductService(db).export_products(search, is_active, EXPORT_BATCH_SIZE)
+    chunks = export_chunks(products, ExportEncoder("products", fmt), db.close)
+    return export_response(chunks, "products", fmt)
+
+
 @router.get("/{product_id}", response_model=ApiResponse[ProductResponse])
-def get_product(product_id: int, db: Session = Depends(get_db)):
+def get_product(
+    product_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+    fields: Optional[str] = None,
+    primary: Session = Depends(get_db)  # product cache fills
+):
     """Get a product by ID."""
     try:
-        service = ProductService(db)
+        service = ProductService(db, primary)
+        field_list = parse_fields(fields)
+        if if_none_match:
+            # Answer from the row version alone, before loading the product
+            version = service.get_product_version(product_id, cached=not field_list)
+            if version is not None and etag_matches(if_none_match, resource_etag("product", product_id, version, field_list)):
+                return not_modified(resource_etag("product", product_id, version, field_list))
+
+        if field_list:
+            product = service.get_product_fields(product_id, field_list)
+            if not product:
+                return ApiResponse.error(mensagem=f"Product with id {product_id} not found")
+            set_etag(response, resource_etag("product", product["id"], product["version"], field_list))
+            return lean_item_response(pick_fields(product, field_list), response)
+
         product = service.get_product(product_id)
 
         if not product:
             return ApiResponse.error(mensagem=f"Product with id {product_id} not found")
 
         response_data = ProductResponse.model_validate(product)
+        set_etag(response, resource_etag("product", product.id, product.version))
         return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Fetching product failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
     except Exception as e:
         logger.error("Unexpected error fetching product", error=str(e))
         return ApiResponse.error(mensagem="Internal server error")
 
 
 @router.get("", response_model=ApiResponse[ProductListResponse])
+@compressible
 def list_products(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = None,
     is_active: Optional[bool] = None,
     order_by: str = Query("created_at"),
     order_dir: str = Query("desc"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor from next_cursor; skip is ignored"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$", description="How to compute total; null with none"),
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+    fields: Optional[str] = None
 ):
     """List products with pagination and filters."""
     try:
         service = ProductService(db)
-        products, total = service.list_products(skip, limit, search, is_active, order_by, order_dir)
+        fmt = list_format(accept)
+        field_list = parse_fields(fields)
+        if if_none_match:
+            # Answer from (id, version) of the page rows, before loading any of them
+            versions, total = service.list_product_versions(skip, limit, search, is_active, order_by, order_dir, cursor, count)
+            etag = list_etag("products", versions, total, fmt, field_list)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+        if field_list:
+            rows, total = service.list_product_fields(field_list, skip, limit, search, is_active, order_by, order_dir, cursor, count)
+            set_etag(response, list_etag("products", [(r["id"], r["version"]) for r in rows], total, fmt, field_list))
+            next_cursor = service.next_cursor(rows, order_by, limit)
+            items = [pick_fields(r, field_list) for r in rows]
+            return lean_list_response(items, total, skip, limit, next_cursor, response, fmt)
+
+        products, total = service.list_products(skip, limit, search, is_active, order_by, order_dir, cursor, count)
+        set_etag(response, list_etag("products", [(p.id, p.version) for p in products], total, fmt))
+        next_cursor = service.next_cursor(products, order_by, limit)
+
+        if LEAN_SERIALIZATION:
+            items = [product_to_dict(p) for p in products]
+            return lean_list_response(items, total, skip, limit, next_cursor, response, fmt)
 
         response_data = ProductListResponse(
             items=[ProductResponse.model_validate(p) for p in products],
             total=total,
             skip=skip,
-            limit=limit
+            limit=limit,
+            next_cursor=next_cursor
         )
         return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Listing products failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
     except Exception as e:
         logger.error("Unexpected error listing products", error=str(e))
         return ApiResponse.error(mensagem="Internal server error")
 
 
+@router.patch("/stock", response_model=ApiResponse[ProductStockAdjustmentResponse])
+def adjust_stock(batch: ProductStockAdjustmentBatch, db: Session = Depends(get_db)):
+    """Adjust the stock of many products in one statement and one transaction."""
+    try:
+        service = ProductService(db)
+        levels = service.adjust_stock([a.model_dump() for a in batch.adjustments])
+        response_data = ProductStockAdjustmentResponse(products=[
+            ProductStockLevel(product_id=product_id, sku=sku, stock_qty=stock_qty)
+            for product_id, sku, stock_qty in levels
+        ])
+        return ApiResponse.success(data=response_data)
+    except ValueError as e:
+        logger.warning("Stock adjustment failed", error=str(e))
+        return ApiResponse.error(mensagem=str(e))
+    except Exception as e:
+        logger.error("Unexpected error adjusting stock", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
+
+
 @router.put("/{product_id}", response_model=ApiResponse[ProductResponse])
 def update_product(product_id: int, product: ProductUpdate, db: Session = Depends(get_db)):
     """Update a product."""
@@ -119,11 +247,12 @@ def delete_product(product_id: int, db: Session = Depends(get_db)):
 def search_products(
     q: str = Query(..., min_length=1),
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db),
+    primary: Session = Depends(get_db)  # product cache fills
 ):
     """Search products for autocomplete."""
     try:
-        service = ProductService(db)
+        service = ProductService(db, primary)
         products = service.search_products(q, limit)
         response_data = [ProductResponse.model_validate(p) for p in products]
         return ApiResponse.success(data=response_data)
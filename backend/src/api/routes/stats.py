@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from src.infrastructure.database import get_read_db
+from src.application.services import StatsService
+from src.api.schemas import ApiResponse, DashboardStatsResponse, DbPoolStatsResponse, ProductCacheStatsResponse
+from src.infrastructure.database.pool import pool_stats
+from src.infrastructure.repositories import ProductCache
+import structlog
+
+logger = structlog.get_logger()
+router = APIRouter()
+
+
+@router.get("/dashboard", response_model=ApiResponse[DashboardStatsResponse])
+def get_dashboard_stats(
+    low_stock_threshold: int = Query(10, ge=0),
+    low_stock_limit: int = Query(5, ge=0, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """Get dashboard statistics computed with SQL aggregates."""
+    try:
+        service = StatsService(db)
+        stats = service.get_dashboard(low_stock_threshold, low_stock_limit)
+
+        response_data = DashboardStatsResponse.model_validate(stats)
+        return ApiResponse.success(data=response_data)
+    except Exception as e:
+        logger.error("Unexpected error fetching dashboard stats", error=str(e))
+        return ApiResponse.error(mensagem="Internal server error")
+
+
+@router.get("/product-cache", response_model=ApiResponse[ProductCacheStatsResponse])
+def get_product_cache_stats():
+    """Get hit rate and size of the product cache in the worker serving the request."""
+    return ApiResponse.success(data=ProductCacheStatsResponse.model_validate(ProductCache.snapshot()))
+
+
+@router.get("/db-pool", response_model=ApiResponse[DbPoolStatsResponse])
+def get_db_pool_stats():
+    """Get checkouts, waits and connection ages of the database pools in the worker serving the request."""
+    return ApiResponse.success(data=DbPoolStatsResponse.model_validate(pool_stats()))
@@ -1,7 +1,28 @@
 from .envelope import ApiResponse
-from .product import ProductCreate, ProductUpdate, ProductResponse, ProductListResponse
+from .product import (
+    ProductCreate,
+    ProductUpdate,
+    ProductResponse,
+    ProductListResponse,
+    ProductImportError,
+    ProductImportResponse,
+    ProductStockAdjustment,
+    ProductStockAdjustmentBatch,
+    ProductStockLevel,
+    ProductStockAdjustmentResponse,
+)
 from .customer import CustomerCreate, CustomerUpdate, CustomerResponse, CustomerListResponse
-from .order import OrderCreate, OrderItemCreate, OrderResponse, OrderListResponse, OrderStatusUpdate
+from .order import (
+    OrderCreate,
+    OrderItemCreate,
+    OrderResponse,
+    OrderListResponse,
+    OrderStatusUpdate,
+    OrderBatchCreate,
+    OrderBatchResult,
+    OrderBatchResponse,
+)
+from .stats import OrderStatusStats, DashboardStatsResponse, ProductCacheStatsResponse, DbPoolStats, DbPoolStatsResponse
 
 __all__ = [
     "ApiResponse",
@@ -9,6 +30,12 @@ __all__ = [
     "ProductUpdate",
     "ProductResponse",
     "ProductListResponse",
+    "ProductImportError",
+    "ProductImportResponse",
+    "ProductStockAdjustment",
+    "ProductStockAdjustmentBatch",
+    "ProductStockLevel",
+    "ProductStockAdjustmentResponse",
     "CustomerCreate",
     "CustomerUpdate",
     "CustomerResponse",
@@ -18,4 +45,12 @@ __all__ = [
     "OrderResponse",
     "OrderListResponse",
     "OrderStatusUpdate",
+    "OrderBatchCreate",
+    "OrderBatchResult",
+    "OrderBatchResponse",
+    "OrderStatusStats",
+    "DashboardStatsResponse",
+    "ProductCacheStatsResponse",
+    "DbPoolStats",
+    "DbPoolStatsResponse",
 ]
@@ -32,6 +32,7 @@ class CustomerResponse(BaseModel):
 class CustomerListResponse(BaseModel):
     """Schema for customer list response."""
     items: List[CustomerResponse]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
@@ -44,11 +44,32 @@ class OrderResponse(BaseModel):
 class OrderListResponse(BaseModel):
     """Schema for order list response."""
     items: List[OrderResponse]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 
 class OrderStatusUpdate(BaseModel):
     """Schema for updating order status."""
     status: OrderStatus
+
+
+class OrderBatchCreate(BaseModel):
+    """Schema for creating several orders in one request."""
+    orders: List[OrderCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class OrderBatchResult(BaseModel):
+    """Outcome of a single order inside a batch."""
+    index: int
+    cod_retorno: int
+    mensagem: Optional[str] = None
+    data: Optional[OrderResponse] = None
+
+
+class OrderBatchResponse(BaseModel):
+    """Schema for batch order creation response."""
+    results: List[OrderBatchResult]
+    created: int
+    failed: int
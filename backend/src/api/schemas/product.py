@@ -38,6 +38,48 @@ class ProductResponse(BaseModel):
 class ProductListResponse(BaseModel):
     """Schema for product list response."""
     items: List[ProductResponse]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
+
+
+class ProductImportError(BaseModel):
+    """A row rejected by a product import."""
+    row: int
+    sku: Optional[str] = None
+    mensagem: str
+
+
+class ProductImportResponse(BaseModel):
+    """Schema for product import response."""
+    inserted: int
+    updated: int
+    unchanged: int
+    rejected: int
+    errors: List[ProductImportError]
+
+
+class ProductStockAdjustment(BaseModel):
+    """One stock change: a product by id or SKU, and a delta or an absolute quantity."""
+    product_id: Optional[int] = Field(None, gt=0)
+    sku: Optional[str] = Field(None, min_length=1, max_length=100)
+    delta: Optional[int] = None
+    absolute: Optional[int] = Field(None, ge=0)
+
+
+class ProductStockAdjustmentBatch(BaseModel):
+    """Schema for adjusting the stock of several products at once."""
+    adjustments: List[ProductStockAdjustment] = Field(..., min_length=1, max_length=1000)
+
+
+class ProductStockLevel(BaseModel):
+    """New stock of an adjusted product."""
+    product_id: int
+    sku: str
+    stock_qty: int
+
+
+class ProductStockAdjustmentResponse(BaseModel):
+    """Schema for bulk stock adjustment response."""
+    products: List[ProductStockLevel]
@@ -0,0 +1,66 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from .product import ProductResponse
+
+
+class OrderStatusStats(BaseModel):
+    """Order count and revenue for one status."""
+    status: str
+    order_count: int
+    revenue: float
+
+
+class DashboardStatsResponse(BaseModel):
+    """Schema for dashboard statistics response."""
+    total_orders: int
+    total_revenue: float
+    orders_by_status: List[OrderStatusStats]
+    total_products: int
+    active_products: int
+    low_stock_count: int
+    total_customers: int
+    low_stock_products: List[ProductResponse]
+
+
+class ProductCacheStatsResponse(BaseModel):
+    """Schema for the product cache metrics of the serving worker."""
+    enabled: bool
+    products: int
+    searches: int
+    hits: int
+    misses: int
+    hit_rate: float
+    search_hits: int
+    search_misses: int
+    search_hit_rate: float
+    evictions: int
+    invalidations: int
+    notifications: int
+
+
+class DbPoolStats(BaseModel):
+    """Connection pool figures of one engine in the serving worker."""
+    name: str
+    pool_size: int
+    max_overflow: int
+    connections: int
+    checked_out: int
+    idle: int
+    overflow: int
+    checkouts: int
+    wait_avg_ms: float
+    wait_max_ms: float
+    timeouts: int
+    pings: int
+    ping_failures: int
+    oldest_connection_age_s: Optional[float] = None
+    mean_connection_age_s: Optional[float] = None
+
+
+class DbPoolStatsResponse(BaseModel):
+    """Schema for the connection pool settings and telemetry of the serving worker."""
+    pgbouncer: bool
+    pre_ping: str
+    pool_timeout: float
+    pool_recycle: int
+    pools: List[DbPoolStats]
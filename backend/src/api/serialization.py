@@ -0,0 +1,173 @@
+import os
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+import msgpack
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from src.domain.entities import Customer, Order, Product
+
+# "lean": list pages are built as plain dicts and encoded once with orjson.
+# "validated": list pages go through the Pydantic response models and are
+# validated again by FastAPI against response_model (the previous path).
+SERIALIZATION_MODE = os.getenv("SERIALIZATION_MODE", "lean").lower()
+LEAN_SERIALIZATION = SERIALIZATION_MODE == "lean"
+
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+class LeanJSONResponse(JSONResponse):
+    """JSON response encoded with orjson; UTC datetimes end in Z, as in Pydantic."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def _msgpack_default(value: Any) -> Any:
+    # Same values as the JSON representation: ISO timestamps and enum values
+    if isinstance(value, datetime):
+        return value.isoformat().replace("+00:00", "Z")
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot encode {type(value).__name__} as MessagePack")
+
+
+class MsgPackResponse(Response):
+    """The same document as LeanJSONResponse, encoded as MessagePack."""
+
+    media_type = MSGPACK_MEDIA_TYPES[0]
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, default=_msgpack_default)
+
+
+def _media_ranges(accept: str) -> Dict[str, float]:
+    ranges = {}
+    for part in accept.split(","):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type:
+            ranges[media_type.lower()] = quality
+    return ranges
+
+
+def list_format(accept: Optional[str]) -> str:
+    """
+    Representation of a list page for an Accept header: "json" or "msgpack".
+
+    MessagePack is chosen when listed and preferred at least as much as JSON,
+    and only on the lean path; the validated path always answers JSON.
+    """
+    if not accept or not LEAN_SERIALIZATION:
+        return "json"
+    ranges = _media_ranges(accept)
+    msgpack_q = max(ranges.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    json_q = ranges.get("application/json", ranges.get("application/*", ranges.get("*/*", 0.0)))
+    return "msgpack" if msgpack_q > 0 and msgpack_q >= json_q else "json"
+
+
+def product_to_dict(product: Product) -> Dict[str, Any]:
+    """Same fields as ProductResponse."""
+    return {
+        "id": product.id,
+        "name": product.name,
+        "sku": product.sku,
+        "price": product.price,
+        "stock_qty": product.stock_qty,
+        "is_active": product.is_active,
+        "created_at": product.created_at,
+    }
+
+
+def customer_to_dict(customer: Customer) -> Dict[str, Any]:
+    """Same fields as CustomerResponse."""
+    return {
+        "id": customer.id,
+        "name": customer.name,
+        "email": customer.email,
+        "document": customer.document,
+        "created_at": customer.created_at,
+    }
+
+
+def order_to_dict(order: Order) -> Dict[str, Any]:
+    """Same fields as OrderResponse, items included."""
+    return {
+        "id": order.id,
+        "customer_id": order.customer_id,
+        "total_amount": order.total_amount,
+        "status": order.status,
+        "created_at": order.created_at,
+        "items": [
+            {
+                "id": item.id,
+                "product_id": item.product_id,
+                "unit_price": item.unit_price,
+                "quantity": item.quantity,
+                "line_total": item.line_total,
+            }
+            for item in order.items
+        ],
+    }
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Names in a ?fields= parameter, in order and without repeats; None returns every field."""
+    if not fields:
+        return None
+    return list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip())) or None
+
+
+def pick_fields(row: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """The requested fields of a sparse row (id, version and the sort column are always in the row)."""
+    return {name: row[name] for name in fields}
+
+
+def lean_item_response(item: Dict[str, Any], response: Response) -> LeanJSONResponse:
+    """Encode one resource in the ApiResponse envelope, bypassing response_model (sparse fieldsets)."""
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return LeanJSONResponse({"cod_retorno": 0, "mensagem": None, "data": item}, headers=headers)
+
+
+def lean_list_response(
+    items: List[Dict[str, Any]],
+    total: Optional[int],
+    skip: int,
+    limit: int,
+    next_cursor: Optional[str],
+    response: Response,
+    fmt: str = "json"
+) -> Response:
+    """
+    Encode a list page in the ApiResponse envelope, bypassing response_model.
+
+    The whole envelope is encoded in one call, as JSON or MessagePack (`fmt`,
+    from list_format). Headers already set on the route's `response` (ETag)
+    are carried over.
+    """
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    headers["Vary"] = "Accept"
+    response_class = MsgPackResponse if fmt == "msgpack" else LeanJSONResponse
+    return response_class(
+        {
+            "cod_retorno": 0,
+            "mensagem": None,
+            "data": {
+                "items": items,
+                "total": total,
+                "skip": skip,
+                "limit": limit,
+                "next_cursor": next_cursor,
+            },
+        },
+        headers=headers,
+    )
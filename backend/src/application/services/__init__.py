@@ -1,5 +1,27 @@
 from .product_service import ProductService
 from .customer_service import CustomerService
 from .order_service import OrderService
+from .stats_service import StatsService
+from .product_import import ProductImportResult, detect_format, read_records
+from .order_group_commit import OrderGroupCommitter, get_group_committer, shutdown_group_committer
+from .async_product_service import AsyncProductService
+from .async_customer_service import AsyncCustomerService
+from .async_order_service import AsyncOrderService
+from .async_stats_service import AsyncStatsService
 
-__all__ = ["ProductService", "CustomerService", "OrderService"]
+__all__ = [
+    "ProductService",
+    "CustomerService",
+    "OrderService",
+    "StatsService",
+    "ProductImportResult",
+    "detect_format",
+    "read_records",
+    "OrderGroupCommitter",
+    "get_group_committer",
+    "shutdown_group_committer",
+    "AsyncProductService",
+    "AsyncCustomerService",
+    "AsyncOrderService",
+    "AsyncStatsService",
+]
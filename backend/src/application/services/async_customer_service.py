@@ -0,0 +1,165 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.domain.entities import Customer
+from src.infrastructure.repositories import AsyncCustomerRepository, RowCountCache
+import structlog
+
+logger = structlog.get_logger()
+
+
+class AsyncCustomerService:
+    """Async service layer for Customer operations (mirrors CustomerService)."""
+
+    def __init__(self, db: AsyncSession):
+        self.repository = AsyncCustomerRepository(db)
+        self.db = db
+
+    async def create_customer(self, name: str, email: str, document: str) -> Customer:
+        """Create a new customer."""
+        logger.info("Creating customer", email=email, document=document)
+
+        # Check if email already exists
+        existing_email = await self.repository.get_by_email(email)
+        if existing_email:
+            logger.warning("Customer with email already exists", email=email)
+            raise ValueError(f"Customer with email '{email}' already exists")
+
+        # Check if document already exists
+        existing_doc = await self.repository.get_by_document(document)
+        if existing_doc:
+            logger.warning("Customer with document already exists", document=document)
+            raise ValueError(f"Customer with document '{document}' already exists")
+
+        # Create and validate customer entity
+        customer = Customer(name=name, email=email, document=document)
+        customer.validate()
+
+        # Save to database
+        created_customer = await self.repository.create(customer)
+        RowCountCache.adjust("customers", 1)
+        logger.info("Customer created successfully", customer_id=created_customer.id)
+
+        return created_customer
+
+    async def get_customer(self, customer_id: int) -> Optional[Customer]:
+        """Get customer by ID."""
+        logger.debug("Fetching customer", customer_id=customer_id)
+        return await self.repository.get_by_id(customer_id)
+
+    async def get_customer_fields(self, customer_id: int, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Get only `fields` of a customer (plus id and version), as a dict."""
+        logger.debug("Fetching customer", customer_id=customer_id, fields=fields)
+        return await self.repository.get_fields_by_id(customer_id, fields)
+
+    async def list_customers(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Customer], Optional[int]]:
+        """List customers with pagination and filters."""
+        logger.debug("Listing customers", skip=skip, limit=limit, search=search, cursor=cursor, count=count)
+        return await self.repository.get_all(skip, limit, search, order_by, order_dir, cursor, count)
+
+    async def list_customer_fields(
+        self,
+        fields: List[str],
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        """List only `fields` of the customers (plus id, version and the sort column), as dicts."""
+        logger.debug("Listing customers", skip=skip, limit=limit, search=search, cursor=cursor, count=count, fields=fields)
+        return await self.repository.get_all_fields(fields, skip, limit, search, order_by, order_dir, cursor, count)
+
+    def next_cursor(self, customers: List[Customer], order_by: str, limit: int) -> Optional[str]:
+        """Return the cursor for the page after `customers`."""
+        return self.repository.next_cursor(customers, order_by, limit)
+
+    def export_customers(self, search: Optional[str] = None, batch_size: int = 1000) -> AsyncIterator[Customer]:
+        """Stream every customer matching the list filters, in id order."""
+        logger.info("Exporting customers", search=search, batch_size=batch_size)
+        return self.repository.stream(search, batch_size)
+
+    async def get_customer_version(self, customer_id: int) -> Optional[int]:
+        """Get a customer's row version without loading it."""
+        return await self.repository.get_version(customer_id)
+
+    async def list_customer_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Tuple[int, int]], Optional[int]]:
+        """Get (id, version) of the customers list_customers would return, and the total."""
+        return await self.repository.get_page_versions(skip, limit, search, order_by, order_dir, cursor, count)
+
+    async def update_customer(
+        self,
+        customer_id: int,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        document: Optional[str] = None
+    ) -> Customer:
+        """Update an existing customer."""
+        logger.info("Updating customer", customer_id=customer_id)
+
+        # Get existing customer
+        customer = await self.repository.get_by_id(customer_id)
+        if not customer:
+            logger.warning("Customer not found", customer_id=customer_id)
+            raise ValueError(f"Customer with id {customer_id} not found")
+
+        # Check email uniqueness if changing
+        if email and email != customer.email:
+            existing = await self.repository.get_by_email(email)
+            if existing:
+                logger.warning("Customer with email already exists", email=email)
+                raise ValueError(f"Customer with email '{email}' already exists")
+
+        # Check document uniqueness if changing
+        if document and document != customer.document:
+            existing = await self.repository.get_by_document(document)
+            if existing:
+                logger.warning("Customer with document already exists", document=document)
+                raise ValueError(f"Customer with document '{document}' already exists")
+
+        # Update fields
+        if name is not None:
+            customer.name = name
+        if email is not None:
+            customer.email = email
+        if document is not None:
+            customer.document = document
+
+        # Validate and save
+        customer.validate()
+        updated_customer = await self.repository.update(customer)
+
+        logger.info("Customer updated successfully", customer_id=customer_id)
+        return updated_customer
+
+    async def delete_customer(self, customer_id: int) -> bool:
+        """Delete a customer."""
+        logger.info("Deleting customer", customer_id=customer_id)
+
+        result = await self.repository.delete(customer_id)
+        if result:
+            RowCountCache.adjust("customers", -1)
+            logger.info("Customer deleted successfully", customer_id=customer_id)
+        else:
+            logger.warning("Customer not found", customer_id=customer_id)
+
+        return result
@@ -0,0 +1,368 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.domain.entities import Order
+from src.infrastructure.repositories import (
+    AsyncOrderRepository,
+    AsyncProductRepository,
+    AsyncCustomerRepository,
+    AsyncIdempotencyRepository,
+    AsyncStatsRepository,
+    ProductCache,
+    RowCountCache,
+)
+from src.infrastructure.metrics import IDEMPOTENCY_HITS, ORDERS_CREATED, STOCK_REJECTIONS
+from .order_service import IdempotencyStore, OrderService
+import structlog
+
+logger = structlog.get_logger()
+
+
+class AsyncIdempotencyStore(IdempotencyStore):
+    """
+    Async counterpart of IdempotencyStore.
+
+    Shares the configuration and the completed-key LRU with IdempotencyStore;
+    in-flight requests of this worker wait on asyncio events instead of
+    blocking a thread.
+    """
+
+    _in_flight: Dict[str, asyncio.Event] = {}
+
+    def __init__(self, db: AsyncSession):
+        self.repository = AsyncIdempotencyRepository(db)
+
+    async def get(self, key: str) -> Optional[int]:
+        """Get order ID for a completed idempotency key."""
+        now = datetime.utcnow()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[1] > now:
+                self._cache.move_to_end(key)
+                return cached[0]
+
+        stored = await self.repository.get_order_id(key, now)
+        if not stored:
+            return None
+        self._remember(key, *stored)
+        return stored[0]
+
+    async def acquire(self, key: str) -> Optional[int]:
+        """Claim a key for the current request (see IdempotencyStore.acquire)."""
+        await self._maybe_sweep()
+        deadline = time.monotonic() + self.wait_timeout
+
+        while True:
+            order_id = await self.get(key)
+            if order_id:
+                return order_id
+
+            with self._lock:
+                event = self._in_flight.get(key)
+                if event is None:
+                    self._in_flight[key] = asyncio.Event()
+
+            if event is not None:
+                # Another request in this worker holds the key
+                try:
+                    await asyncio.wait_for(event.wait(), max(deadline - time.monotonic(), 0))
+                except asyncio.TimeoutError:
+                    raise ValueError("A request with this Idempotency-Key is still being processed")
+                continue
+
+            now = datetime.utcnow()
+            if await self.repository.claim(key, now, now + self.pending_ttl):
+                return None
+
+            # Another worker holds the key: let local waiters retry and poll
+            self._signal(key)
+            if time.monotonic() >= deadline:
+                raise ValueError("A request with this Idempotency-Key is still being processed")
+            await asyncio.sleep(self.poll_interval)
+
+    async def complete(self, key: str, order_id: int) -> datetime:
+        """Record the order for a claimed key in the caller's transaction."""
+        expires_at = datetime.utcnow() + self.ttl
+        await self.repository.complete(key, order_id, expires_at)
+        return expires_at
+
+    async def release(self, key: str, order_id: Optional[int] = None, expires_at: Optional[datetime] = None) -> None:
+        """Release a claimed key and wake up waiting requests."""
+        try:
+            if order_id:
+                self._remember(key, order_id, expires_at)
+            else:
+                await self.repository.delete(key)
+        finally:
+            self._signal(key)
+
+    async def forget(self, key: str) -> None:
+        """Drop a key whose order no longer exists."""
+        with self._lock:
+            self._cache.pop(key, None)
+        await self.repository.delete(key)
+
+    async def _maybe_sweep(self) -> None:
+        """Delete expired keys at most once per sweep interval per worker."""
+        with self._lock:
+            if time.monotonic() - IdempotencyStore._last_sweep < self.sweep_interval:
+                return
+            IdempotencyStore._last_sweep = time.monotonic()
+
+        purged = await self.repository.purge_expired(datetime.utcnow())
+        if purged:
+            logger.info("Purged expired idempotency keys", count=purged)
+
+
+class AsyncOrderService:
+    """Async service layer for Order operations (mirrors OrderService)."""
+
+    def __init__(self, db: AsyncSession):
+        self.order_repository = AsyncOrderRepository(db)
+        self.product_repository = AsyncProductRepository(db)
+        self.customer_repository = AsyncCustomerRepository(db)
+        self.stats_repository = AsyncStatsRepository(db)
+        self.idempotency_store = AsyncIdempotencyStore(db)
+        self.db = db
+
+    async def create_order(
+        self,
+        customer_id: int,
+        items: List[dict],
+        idempotency_key: Optional[str] = None
+    ) -> Order:
+        """Create a new order with atomic transaction and idempotency."""
+        logger.info(
+            "Creating order",
+            customer_id=customer_id,
+            items_count=len(items),
+            idempotency_key=idempotency_key
+        )
+
+        # Check idempotency
+        if idempotency_key:
+            existing_order = await self._find_idempotent_order(idempotency_key)
+            if existing_order:
+                return existing_order
+
+        try:
+            created_order, expires_at = await self.place_order(customer_id, items, idempotency_key)
+
+            # Commit transaction
+            await self.db.commit()
+
+            ProductCache.invalidate(item.product_id for item in created_order.items)
+            RowCountCache.adjust("orders", 1)
+            ORDERS_CREATED.inc()
+            logger.info(
+                "Order created successfully",
+                order_id=created_order.id,
+                total_amount=created_order.total_amount
+            )
+
+        except Exception as e:
+            # Rollback transaction on error
+            await self.db.rollback()
+            logger.error("Failed to create order", error=str(e))
+            if idempotency_key:
+                await self.idempotency_store.release(idempotency_key)
+            raise
+
+        if idempotency_key:
+            await self.idempotency_store.release(idempotency_key, created_order.id, expires_at)
+        return created_order
+
+    async def _find_idempotent_order(self, idempotency_key: str) -> Optional[Order]:
+        """Return the order already created for a key, or claim the key."""
+        while True:
+            existing_order_id = await self.idempotency_store.acquire(idempotency_key)
+            if not existing_order_id:
+                return None
+
+            existing_order = await self.order_repository.get_by_id(existing_order_id)
+            if existing_order:
+                IDEMPOTENCY_HITS.inc()
+                logger.info(
+                    "Idempotent request detected, returning existing order",
+                    order_id=existing_order_id,
+                    idempotency_key=idempotency_key
+                )
+                return existing_order
+
+            # The order was deleted; the key is free to be used again
+            await self.idempotency_store.forget(idempotency_key)
+
+    async def place_order(
+        self,
+        customer_id: int,
+        items: List[dict],
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[Order, Optional[datetime]]:
+        """Validate an order, reserve its stock and flush it (see OrderService.place_order)."""
+        # Verify customer exists
+        customer = await self.customer_repository.get_by_id(customer_id)
+        if not customer:
+            raise ValueError(f"Customer with id {customer_id} not found")
+
+        # Lock the products (in id order) for the rest of the transaction
+        quantities = OrderService._aggregate_quantities(items)
+        products = {
+            p.id: p
+            for p in await self.product_repository.get_by_ids(list(quantities), for_update=True)
+        }
+        order = OrderService._build_order(customer_id, items, quantities, products)
+
+        # Reserve stock for every line in one conditional UPDATE
+        if not await self.product_repository.reserve_stock(quantities):
+            STOCK_REJECTIONS.labels("reserve").inc()
+            raise ValueError("Insufficient stock to reserve the requested items")
+
+        # Other workers drop the reserved products from their cache on commit
+        await self.product_repository.announce_changes(quantities)
+
+        # Save order and items without committing
+        created_order = await self.order_repository.create(order, commit=False)
+
+        # Count the order in the daily rollup within the same transaction
+        await self.stats_repository.add_orders([created_order])
+
+        # Store idempotency key in the same transaction as the order
+        expires_at = None
+        if idempotency_key:
+            expires_at = await self.idempotency_store.complete(idempotency_key, created_order.id)
+
+        return created_order, expires_at
+
+    async def create_orders_batch(
+        self,
+        orders: List[dict]
+    ) -> List[Tuple[Optional[Order], Optional[str]]]:
+        """
+        Create many orders in one transaction.
+
+        The batch path is pure set-based SQL without waits, so it runs the
+        sync OrderService on this session's connection via run_sync.
+        """
+        return await self.db.run_sync(lambda db: OrderService(db).create_orders_batch(orders))
+
+    async def get_order(self, order_id: int) -> Optional[Order]:
+        """Get order by ID."""
+        logger.debug("Fetching order", order_id=order_id)
+        return await self.order_repository.get_by_id(order_id)
+
+    async def get_order_fields(self, order_id: int, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Get only `fields` of an order (plus id and version), as a dict; items are read only if requested."""
+        logger.debug("Fetching order", order_id=order_id, fields=fields)
+        return await self.order_repository.get_fields_by_id(order_id, fields)
+
+    async def list_orders(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        customer_id: Optional[int] = None,
+        status: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Order], Optional[int]]:
+        """List orders with pagination and filters."""
+        logger.debug(
+            "Listing orders",
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            count=count,
+            customer_id=customer_id,
+            status=status
+        )
+        return await self.order_repository.get_all(skip, limit, customer_id, status, order_by, order_dir, cursor, count)
+
+    async def list_order_fields(
+        self,
+        fields: List[str],
+        skip: int = 0,
+        limit: int = 100,
+        customer_id: Optional[int] = None,
+        status: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        """List only `fields` of the orders (plus id, version and the sort column), as dicts."""
+        logger.debug("Listing orders", skip=skip, limit=limit, cursor=cursor, count=count, customer_id=customer_id, status=status, fields=fields)
+        return await self.order_repository.get_all_fields(fields, skip, limit, customer_id, status, order_by, order_dir, cursor, count)
+
+    def next_cursor(self, orders: List[Order], order_by: str, limit: int) -> Optional[str]:
+        """Return the cursor for the page after `orders`."""
+        return self.order_repository.next_cursor(orders, order_by, limit)
+
+    def export_orders(self, customer_id: Optional[int] = None, status: Optional[str] = None, batch_size: int = 1000) -> AsyncIterator[Order]:
+        """Stream every order matching the list filters, in id order."""
+        logger.info("Exporting orders", customer_id=customer_id, status=status, batch_size=batch_size)
+        return self.order_repository.stream(customer_id, status, batch_size)
+
+    async def get_order_version(self, order_id: int) -> Optional[int]:
+        """Get an order's row version without loading it."""
+        return await self.order_repository.get_version(order_id)
+
+    async def list_order_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        customer_id: Optional[int] = None,
+        status: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Tuple[int, int]], Optional[int]]:
+        """Get (id, version) of the orders list_orders would return, and the total."""
+        return await self.order_repository.get_page_versions(skip, limit, customer_id, status, order_by, order_dir, cursor, count)
+
+    async def update_order_status(self, order_id: int, new_status: str) -> Order:
+        """Update order status."""
+        logger.info("Updating order status", order_id=order_id, new_status=new_status)
+
+        # Lock the order so concurrent status changes update the rollup once
+        order = await self.order_repository.get_by_id(order_id, for_update=True)
+        if not order:
+            logger.warning("Order not found", order_id=order_id)
+            raise ValueError(f"Order with id {order_id} not found")
+
+        # Update status based on business rules
+        previous_status = order.status
+        if new_status == "PAID":
+            order.mark_as_paid()
+        elif new_status == "CANCELLED":
+            order.cancel()
+        else:
+            raise ValueError(f"Invalid status: {new_status}")
+
+        # Committed together with the status by the repository update
+        await self.stats_repository.move_order(order, previous_status)
+        updated_order = await self.order_repository.update(order)
+        logger.info("Order status updated successfully", order_id=order_id, status=new_status)
+
+        return updated_order
+
+    async def delete_order(self, order_id: int) -> bool:
+        """Delete an order."""
+        logger.info("Deleting order", order_id=order_id)
+
+        order = await self.order_repository.get_by_id(order_id, for_update=True)
+        if order:
+            # Committed together with the deletion by the repository
+            await self.stats_repository.add_orders([order], sign=-1)
+
+        result = await self.order_repository.delete(order_id)
+        if result:
+            RowCountCache.adjust("orders", -1)
+            logger.info("Order deleted successfully", order_id=order_id)
+        else:
+            logger.warning("Order not found", order_id=order_id)
+
+        return result
@@ -0,0 +1,312 @@
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.domain.entities import Product
+from src.infrastructure.database.models import OrderItemModel
+from src.infrastructure.repositories import AsyncProductRepository, ProductCache, RowCountCache
+from .product_service import ProductService
+from .product_import import IMPORT_CHUNK_SIZE, ProductImportResult, import_chunks
+import structlog
+
+logger = structlog.get_logger()
+
+
+class AsyncProductService:
+    """Async service layer for Product operations (mirrors ProductService)."""
+
+    def __init__(self, db: AsyncSession, primary: Optional[AsyncSession] = None):
+        self.repository = AsyncProductRepository(db)
+        self.db = db
+        # Product cache fills read from the primary, as in ProductService
+        reads_replica = primary is not None and primary.bind is not db.bind
+        self.fill_repository = AsyncProductRepository(primary) if reads_replica else self.repository
+
+    async def create_product(
+        self,
+        name: str,
+        sku: str,
+        price: float,
+        stock_qty: int,
+        is_active: bool = True
+    ) -> Product:
+        """Create a new product."""
+        logger.info("Creating product", sku=sku, name=name)
+
+        # Check if SKU already exists
+        existing = await self.repository.get_by_sku(sku)
+        if existing:
+            logger.warning("Product with SKU already exists", sku=sku)
+            raise ValueError(f"Product with SKU '{sku}' already exists")
+
+        # Create and validate product entity
+        product = Product(
+            name=name,
+            sku=sku,
+            price=price,
+            stock_qty=stock_qty,
+            is_active=is_active
+        )
+        product.validate()
+
+        # Save to database; cached searches may now match the new product
+        await self.repository.announce_changes(catalog=True)
+        created_product = await self.repository.create(product)
+        ProductCache.invalidate(catalog=True)
+        RowCountCache.adjust("products", 1)
+        logger.info("Product created successfully", product_id=created_product.id, sku=sku)
+
+        return created_product
+
+    async def import_products(self, records: Iterable[Tuple[int, Any]], chunk_size: int = IMPORT_CHUNK_SIZE) -> ProductImportResult:
+        """Upsert products by SKU from parsed file records (see ProductService.import_products)."""
+        logger.info("Importing products", chunk_size=chunk_size)
+        result = ProductImportResult()
+
+        for chunk, update_active in import_chunks(records, chunk_size, result):
+            try:
+                existing, written = await self.repository.upsert_by_sku([p for _, p in chunk], update_active)
+                if written:
+                    await self.repository.announce_changes(written, catalog=True)
+                await self.db.commit()
+            except SQLAlchemyError as e:
+                await self.db.rollback()
+                logger.error("Product import chunk failed", first_row=chunk[0][0], error=str(e))
+                for number, product in chunk:
+                    result.reject(number, product.sku, f"Database error: {e.__class__.__name__}")
+                continue
+
+            updated = result.add_chunk(existing, written)
+            ProductCache.invalidate(updated, catalog=bool(written))
+            RowCountCache.adjust("products", len(written) - len(updated))
+
+        logger.info(
+            "Products imported",
+            inserted=result.inserted,
+            updated=result.updated,
+            unchanged=result.unchanged,
+            rejected=result.rejected
+        )
+        return result
+
+    async def get_product(self, product_id: int) -> Optional[Product]:
+        """Get product by ID, read through the product cache."""
+        logger.debug("Fetching product", product_id=product_id)
+        product = ProductCache.get(product_id)
+        if product:
+            return product
+
+        token = ProductCache.token()
+        product = await self.fill_repository.get_by_id(product_id)
+        if product:
+            ProductCache.put([product], token)
+        return product
+
+    async def get_product_fields(self, product_id: int, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Get only `fields` of a product (plus id and version), bypassing the product cache."""
+        return await self.repository.get_fields_by_id(product_id, fields)
+
+    async def list_products(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Product], Optional[int]]:
+        """List products with pagination and filters."""
+        logger.debug(
+            "Listing products",
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            count=count,
+            search=search,
+            is_active=is_active
+        )
+        return await self.repository.get_all(skip, limit, search, is_active, order_by, order_dir, cursor, count)
+
+    async def list_product_fields(
+        self,
+        fields: List[str],
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        """List only `fields` of the products (plus id, version and the sort column), as dicts."""
+        logger.debug("Listing products", skip=skip, limit=limit, cursor=cursor, count=count, search=search, fields=fields)
+        return await self.repository.get_all_fields(fields, skip, limit, search, is_active, order_by, order_dir, cursor, count)
+
+    def next_cursor(self, products: List[Product], order_by: str, limit: int) -> Optional[str]:
+        """Return the cursor for the page after `products`."""
+        return self.repository.next_cursor(products, order_by, limit)
+
+    def export_products(self, search: Optional[str] = None, is_active: Optional[bool] = None, batch_size: int = 1000) -> AsyncIterator[Product]:
+        """Stream every product matching the list filters, in id order."""
+        logger.info("Exporting products", search=search, is_active=is_active, batch_size=batch_size)
+        return self.repository.stream(search, is_active, batch_size)
+
+    async def get_product_version(self, product_id: int, cached: bool = True) -> Optional[int]:
+        """Get a product's row version: of get_product's result with `cached`, else of get_product_fields'."""
+        if not cached:
+            return await self.repository.get_version(product_id)
+        product = ProductCache.get(product_id)
+        if product:
+            return product.version
+        return await self.fill_repository.get_version(product_id)
+
+    async def list_product_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Tuple[int, int]], Optional[int]]:
+        """Get (id, version) of the products list_products would return, and the total."""
+        return await self.repository.get_page_versions(skip, limit, search, is_active, order_by, order_dir, cursor, count)
+
+    async def update_product(
+        self,
+        product_id: int,
+        name: Optional[str] = None,
+        sku: Optional[str] = None,
+        price: Optional[float] = None,
+        stock_qty: Optional[int] = None,
+        is_active: Optional[bool] = None
+    ) -> Product:
+        """Update an existing product."""
+        logger.info("Updating product", product_id=product_id)
+
+        # Get existing product
+        product = await self.repository.get_by_id(product_id)
+        if not product:
+            logger.warning("Product not found", product_id=product_id)
+            raise ValueError(f"Product with id {product_id} not found")
+
+        # Check SKU uniqueness if changing
+        if sku and sku != product.sku:
+            existing = await self.repository.get_by_sku(sku)
+            if existing:
+                logger.warning("Product with SKU already exists", sku=sku)
+                raise ValueError(f"Product with SKU '{sku}' already exists")
+
+        # Update fields
+        if name is not None:
+            product.name = name
+        if sku is not None:
+            product.sku = sku
+        if price is not None:
+            product.price = price
+        if stock_qty is not None:
+            product.stock_qty = stock_qty
+        if is_active is not None:
+            product.is_active = is_active
+
+        # Validate and save; price and stock changes leave search results intact
+        product.validate()
+        catalog = name is not None or sku is not None or is_active is not None
+        await self.repository.announce_changes([product_id], catalog)
+        updated_product = await self.repository.update(product)
+        ProductCache.invalidate([product_id], catalog)
+
+        logger.info("Product updated successfully", product_id=product_id)
+        return updated_product
+
+    async def adjust_stock(self, adjustments: List[dict]) -> List[Tuple[int, str, int]]:
+        """Apply many stock changes in one UPDATE and one transaction (see ProductService.adjust_stock)."""
+        logger.info("Adjusting stock", adjustments_count=len(adjustments))
+        product_ids, skus = ProductService._stock_targets(adjustments)
+        identities = await self.repository.resolve(product_ids, skus)
+        order, deltas, levels = ProductService._plan_stock_adjustments(adjustments, identities)
+
+        try:
+            await self.repository.announce_changes(order)
+            stock = await self.repository.adjust_stock(deltas, levels)
+            negative = [product_id for product_id in order if product_id not in stock]
+            if negative:
+                logger.warning("Stock adjustment rejected", product_ids=negative)
+                raise ValueError(f"Stock cannot become negative for products: {negative}")
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+        ProductCache.invalidate(order)
+        logger.info("Stock adjusted", products_count=len(order))
+        return [(product_id, identities[product_id], stock[product_id]) for product_id in order]
+
+    async def delete_product(self, product_id: int) -> bool:
+        """Delete a product."""
+        logger.info("Deleting product", product_id=product_id)
+
+        # Check if product exists
+        product = await self.repository.get_by_id(product_id)
+        if not product:
+            logger.warning("Product not found", product_id=product_id)
+            raise ValueError(f"Product with id {product_id} not found")
+
+        # Check if product is used in any orders
+        order_items_count = await self.db.scalar(
+            select(func.count()).select_from(OrderItemModel).where(OrderItemModel.product_id == product_id)
+        )
+
+        if order_items_count > 0:
+            logger.warning(
+                "Cannot delete product in use",
+                product_id=product_id,
+                order_items_count=order_items_count
+            )
+            raise ValueError(
+                f"Não é possível deletar o produto '{product.name}' pois ele está sendo usado em {order_items_count} pedido(s). "
+                "Considere marcá-lo como inativo em vez de deletar."
+            )
+
+        await self.repository.announce_changes([product_id], catalog=True)
+        result = await self.repository.delete(product_id)
+        if result:
+            ProductCache.invalidate([product_id], catalog=True)
+            RowCountCache.adjust("products", -1)
+            logger.info("Product deleted successfully", product_id=product_id)
+
+        return result
+
+    async def search_products(self, query: str, limit: int = 10) -> List[Product]:
+        """Search products by name or SKU, cached like ProductService.search_products."""
+        logger.debug("Searching products", query=query, limit=limit)
+        key = (query, limit)
+        product_ids = ProductCache.get_search(key)
+        if product_ids is not None:
+            found, missing = ProductCache.get_many(product_ids)
+            if missing:
+                token = ProductCache.token()
+                loaded = await self.fill_repository.get_by_ids(missing)
+                ProductCache.put(loaded, token)
+                found.update((p.id, p) for p in loaded)
+            return [found[pid] for pid in product_ids if pid in found]
+
+        token = ProductCache.token()
+        products, _ = await self.repository.get_all(
+            skip=0,
+            limit=limit,
+            search=query,
+            is_active=True,
+            order_by="relevance",
+            count="none"
+        )
+        if self.fill_repository is not self.repository:
+            return products
+        ProductCache.put_search(key, [p.id for p in products], token)
+        ProductCache.put(products, token)
+        return products
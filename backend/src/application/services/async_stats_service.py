@@ -0,0 +1,23 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.infrastructure.repositories import AsyncStatsRepository
+from .stats_service import StatsService
+import structlog
+
+logger = structlog.get_logger()
+
+
+class AsyncStatsService:
+    """Async service layer for dashboard statistics (mirrors StatsService)."""
+
+    def __init__(self, db: AsyncSession):
+        self.repository = AsyncStatsRepository(db)
+        self.db = db
+
+    async def get_dashboard(self, low_stock_threshold: int = 10, low_stock_limit: int = 5) -> dict:
+        """Build the dashboard figures from SQL aggregates."""
+        logger.debug("Building dashboard stats", low_stock_threshold=low_stock_threshold)
+        return StatsService.build_dashboard(
+            await self.repository.order_totals(),
+            await self.repository.catalog_totals(low_stock_threshold),
+            await self.repository.low_stock_products(low_stock_threshold, low_stock_limit),
+        )
@@ -1,7 +1,7 @@
-from typing import List, Optional
+from typing import Any, Iterator, Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from src.domain.entities import Customer
-from src.infrastructure.repositories import CustomerRepository
+from src.infrastructure.repositories import CustomerRepository, RowCountCache
 import structlog
 
 logger = structlog.get_logger()
@@ -36,6 +36,7 @@ class CustomerService:
 
         # Save to database
         created_customer = self.repository.create(customer)
+        RowCountCache.adjust("customers", 1)
         logger.info("Customer created successfully", customer_id=created_customer.id)
 
         return created_customer
@@ -45,17 +46,65 @@ class CustomerService:
         logger.debug("Fetching customer", customer_id=customer_id)
         return self.repository.get_by_id(customer_id)
 
+    def get_customer_fields(self, customer_id: int, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Get only `fields` of a customer (plus id and version), as a dict."""
+        logger.debug("Fetching customer", customer_id=customer_id, fields=fields)
+        return self.repository.get_fields_by_id(customer_id, fields)
+
     def list_customers(
         self,
         skip: int = 0,
         limit: int = 100,
         search: Optional[str] = None,
         order_by: str = "created_at",
-        order_dir: str = "desc"
-    ) -> tuple[List[Customer], int]:
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Customer], Optional[int]]:
         """List customers with pagination and filters."""
-        logger.debug("Listing customers", skip=skip, limit=limit, search=search)
-        return self.repository.get_all(skip, limit, search, order_by, order_dir)
+        logger.debug("Listing customers", skip=skip, limit=limit, search=search, cursor=cursor, count=count)
+        return self.repository.get_all(skip, limit, search, order_by, order_dir, cursor, count)
+
+    def list_customer_fields(
+        self,
+        fields: List[str],
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        """List only `fields` of the customers (plus id, version and the sort column), as dicts."""
+        logger.debug("Listing customers", skip=skip, limit=limit, search=search, cursor=cursor, count=count, fields=fields)
+        return self.repository.get_all_fields(fields, skip, limit, search, order_by, order_dir, cursor, count)
+
+    def next_cursor(self, customers: List[Customer], order_by: str, limit: int) -> Optional[str]:
+        """Return the cursor for the page after `customers`."""
+        return self.repository.next_cursor(customers, order_by, limit)
+
+    def export_customers(self, search: Optional[str] = None, batch_size: int = 1000) -> Iterator[Customer]:
+        """Stream every customer matching the list filters, in id order."""
+        logger.info("Exporting customers", search=search, batch_size=batch_size)
+        return self.repository.stream(search, batch_size)
+
+    def get_customer_version(self, customer_id: int) -> Optional[int]:
+        """Get a customer's row version without loading it."""
+        return self.repository.get_version(customer_id)
+
+    def list_customer_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Tuple[int, int]], Optional[int]]:
+        """Get (id, version) of the customers list_customers would return, and the total."""
+        return self.repository.get_page_versions(skip, limit, search, order_by, order_dir, cursor, count)
 
     def update_customer(
         self,
@@ -108,6 +157,7 @@ class CustomerService:
 
         result = self.repository.delete(customer_id)
         if result:
+            RowCountCache.adjust("customers", -1)
             logger.info("Customer deleted successfully", customer_id=customer_id)
         else:
             logger.warning("Customer not found", customer_id=customer_id)
@@ -0,0 +1,223 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from src.domain.entities import Order
+from src.infrastructure.metrics import GROUP_COMMIT_BATCH_SIZE, GROUP_COMMIT_SECONDS
+from .order_service import OrderService
+import structlog
+
+logger = structlog.get_logger()
+
+GROUP_COMMIT_ENABLED = os.getenv("ORDER_GROUP_COMMIT_ENABLED", "false").lower() == "true"
+GROUP_COMMIT_WINDOW_MS = float(os.getenv("ORDER_GROUP_COMMIT_WINDOW_MS", "5"))
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("ORDER_GROUP_COMMIT_MAX_BATCH", "50"))
+
+
+class _PendingOrder:
+    """An order creation waiting for the next group commit."""
+
+    def __init__(self, customer_id: int, items: List[dict], idempotency_key: Optional[str]):
+        self.customer_id = customer_id
+        self.items = items
+        self.idempotency_key = idempotency_key
+        self.future: Future = Future()
+
+
+class GroupCommitMetrics:
+    """Counters for batch sizes and commit latency of the group committer (also exported to Prometheus)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.orders = 0
+        self.failed_orders = 0
+        self.max_batch_size = 0
+        self.commit_seconds_total = 0.0
+        self.max_commit_seconds = 0.0
+
+    def record(self, batch_size: int, failed: int, commit_seconds: float) -> None:
+        """Record one committed batch."""
+        GROUP_COMMIT_BATCH_SIZE.observe(batch_size)
+        GROUP_COMMIT_SECONDS.observe(commit_seconds)
+        with self._lock:
+            self.batches += 1
+            self.orders += batch_size
+            self.failed_orders += failed
+            self.max_batch_size = max(self.max_batch_size, batch_size)
+            self.commit_seconds_total += commit_seconds
+            self.max_commit_seconds = max(self.max_commit_seconds, commit_seconds)
+
+    def snapshot(self) -> dict:
+        """Return the current values, including averages."""
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "orders": self.orders,
+                "failed_orders": self.failed_orders,
+                "avg_batch_size": self.orders / self.batches if self.batches else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "avg_commit_seconds": self.commit_seconds_total / self.batches if self.batches else 0.0,
+                "max_commit_seconds": self.max_commit_seconds,
+            }
+
+
+class OrderGroupCommitter:
+    """
+    Group-commit write path for order creation.
+
+    Callers queue order creations; a background thread collects them for up
+    to `window_ms` (or until `max_batch` are waiting), places each one inside
+    its own SAVEPOINT and commits them all in one transaction. An order that
+    fails only rolls back its savepoint and fails its own caller.
+
+    The products of the whole batch are locked first, in ascending id order,
+    as place_order does for a single order; locking them order by order would
+    take them out of global id order across the batch and could deadlock with
+    checkouts and stock adjustments running outside the committer.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        window_ms: float = GROUP_COMMIT_WINDOW_MS,
+        max_batch: int = GROUP_COMMIT_MAX_BATCH,
+    ):
+        self.session_factory = session_factory
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.metrics = GroupCommitMetrics()
+        self._queue: "queue.Queue[Optional[_PendingOrder]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the background committer thread."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="order-group-commit", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Commit what is queued and stop the background thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread:
+            self._queue.put(None)
+            thread.join()
+
+    def submit(
+        self,
+        customer_id: int,
+        items: List[dict],
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[Order, Optional[datetime]]:
+        """Queue an order and block until its batch is committed."""
+        self.start()
+        pending = _PendingOrder(customer_id, items, idempotency_key)
+        self._queue.put(pending)
+        return pending.future.result()
+
+    def _run(self) -> None:
+        """Collect queued orders into batches and commit them."""
+        while True:
+            pending = self._queue.get()
+            if pending is None:
+                return
+
+            batch = [pending]
+            stopping = False
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if pending is None:
+                    stopping = True
+                    break
+                batch.append(pending)
+
+            self._commit_batch(batch)
+            if stopping:
+                return
+
+    def _commit_batch(self, batch: List[_PendingOrder]) -> None:
+        """Place every order in its own savepoint and commit them together."""
+        session = self.session_factory()
+        placed = []
+        try:
+            service = OrderService(session)
+            product_ids = sorted({item["product_id"] for pending in batch for item in pending.items})
+            service.product_repository.get_by_ids(product_ids, for_update=True)
+            for pending in batch:
+                try:
+                    with session.begin_nested():
+                        placed.append((pending, service.place_order(
+                            pending.customer_id, pending.items, pending.idempotency_key
+                        )))
+                except Exception as e:
+                    pending.future.set_exception(e)
+
+            started = time.perf_counter()
+            try:
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.error("Group commit failed", batch_size=len(batch), error=str(e))
+                for pending, _ in placed:
+                    pending.future.set_exception(e)
+                return
+            commit_seconds = time.perf_counter() - started
+
+            for pending, result in placed:
+                pending.future.set_result(result)
+
+            self.metrics.record(len(batch), len(batch) - len(placed), commit_seconds)
+            logger.debug(
+                "Group commit completed",
+                batch_size=len(batch),
+                failed=len(batch) - len(placed),
+                commit_ms=round(commit_seconds * 1000, 2)
+            )
+        except Exception as e:
+            session.rollback()
+            logger.error("Group commit batch aborted", batch_size=len(batch), error=str(e))
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+        finally:
+            session.close()
+
+
+_group_committer: Optional[OrderGroupCommitter] = None
+_group_committer_lock = threading.Lock()
+
+
+def get_group_committer() -> Optional[OrderGroupCommitter]:
+    """Return the shared group committer, or None when the mode is disabled."""
+    global _group_committer
+    if not GROUP_COMMIT_ENABLED:
+        return None
+    with _group_committer_lock:
+        if _group_committer is None:
+            from src.infrastructure.database.config import SessionLocal
+            _group_committer = OrderGroupCommitter(SessionLocal)
+        return _group_committer
+
+
+def shutdown_group_committer() -> None:
+    """Flush and stop the shared group committer, if it was started."""
+    global _group_committer
+    with _group_committer_lock:
+        committer, _group_committer = _group_committer, None
+    if committer:
+        committer.stop()
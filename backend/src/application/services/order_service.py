@@ -1,39 +1,180 @@
-from typing import List, Optional, Dict
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from src.domain.entities import Order, OrderItem
-from src.infrastructure.repositories import OrderRepository, ProductRepository, CustomerRepository
+from src.domain.entities import Order, OrderItem, Product
+from src.infrastructure.repositories import (
+    OrderRepository,
+    ProductRepository,
+    CustomerRepository,
+    IdempotencyRepository,
+    StatsRepository,
+    ProductCache,
+    RowCountCache,
+)
+from src.infrastructure.metrics import IDEMPOTENCY_HITS, ORDERS_CREATED, STOCK_REJECTIONS
 import structlog
 
 logger = structlog.get_logger()
 
 
 class IdempotencyStore:
-    """Simple in-memory idempotency store."""
-    _store: Dict[str, int] = {}
+    """
+    Idempotency keys persisted in the idempotency_keys table.
+
+    Completed keys are cached in a bounded, process-wide LRU. Concurrent
+    requests with the same key are deduplicated: inside a worker the later
+    request waits for the first one, across workers the PENDING row claimed
+    in the table makes the later request poll until the first completes.
+    """
+
+    ttl = timedelta(seconds=int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")))
+    pending_ttl = timedelta(seconds=int(os.getenv("IDEMPOTENCY_PENDING_TTL_SECONDS", "60")))
+    cache_size = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+    wait_timeout = float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT_SECONDS", "10"))
+    sweep_interval = float(os.getenv("IDEMPOTENCY_SWEEP_INTERVAL_SECONDS", "300"))
+    poll_interval = 0.05
+
+    _cache: "OrderedDict[str, Tuple[int, datetime]]" = OrderedDict()
+    _in_flight: Dict[str, threading.Event] = {}
+    _lock = threading.Lock()
+    _last_sweep = 0.0
 
-    @classmethod
-    def get(cls, key: str) -> Optional[int]:
-        """Get order ID for idempotency key."""
-        return cls._store.get(key)
-
-    @classmethod
-    def set(cls, key: str, order_id: int) -> None:
-        """Store order ID for idempotency key."""
-        cls._store[key] = order_id
+    def __init__(self, db: Session):
+        self.repository = IdempotencyRepository(db)
+
+    def get(self, key: str) -> Optional[int]:
+        """Get order ID for a completed idempotency key."""
+        now = datetime.utcnow()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[1] > now:
+                self._cache.move_to_end(key)
+                return cached[0]
+
+        stored = self.repository.get_order_id(key, now)
+        if not stored:
+            return None
+        self._remember(key, *stored)
+        return stored[0]
+
+    def acquire(self, key: str) -> Optional[int]:
+        """
+        Claim a key for the current request.
+
+        Returns the order ID if another request already completed the key,
+        or None once this request holds it and must call release().
+        """
+        self._maybe_sweep()
+        deadline = time.monotonic() + self.wait_timeout
+
+        while True:
+            order_id = self.get(key)
+            if order_id:
+                return order_id
+
+            with self._lock:
+                event = self._in_flight.get(key)
+                if event is None:
+                    self._in_flight[key] = threading.Event()
+
+            if event is not None:
+                # Another request in this worker holds the key
+                if not event.wait(max(deadline - time.monotonic(), 0)):
+                    raise ValueError("A request with this Idempotency-Key is still being processed")
+                continue
+
+            now = datetime.utcnow()
+            if self.repository.claim(key, now, now + self.pending_ttl):
+                return None
+
+            # Another worker holds the key: let local waiters retry and poll
+            self._signal(key)
+            if time.monotonic() >= deadline:
+                raise ValueError("A request with this Idempotency-Key is still being processed")
+            time.sleep(self.poll_interval)
+
+    def complete(self, key: str, order_id: int) -> datetime:
+        """Record the order for a claimed key in the caller's transaction."""
+        expires_at = datetime.utcnow() + self.ttl
+        self.repository.complete(key, order_id, expires_at)
+        return expires_at
+
+    def release(self, key: str, order_id: Optional[int] = None, expires_at: Optional[datetime] = None) -> None:
+        """
+        Release a claimed key and wake up waiting requests.
+
+        Pass the committed order to cache it; without one the claim is
+        dropped so a retry can run again.
+        """
+        try:
+            if order_id:
+                self._remember(key, order_id, expires_at)
+            else:
+                self.repository.delete(key)
+        finally:
+            self._signal(key)
+
+    def forget(self, key: str) -> None:
+        """Drop a key whose order no longer exists."""
+        with self._lock:
+            self._cache.pop(key, None)
+        self.repository.delete(key)
 
     @classmethod
-    def exists(cls, key: str) -> bool:
-        """Check if idempotency key exists."""
-        return key in cls._store
+    def reset(cls) -> None:
+        """Clear the in-process cache and in-flight registry."""
+        with cls._lock:
+            cls._cache.clear()
+            cls._in_flight.clear()
+            cls._last_sweep = 0.0
+
+    def _remember(self, key: str, order_id: int, expires_at: datetime) -> None:
+        """Cache a completed key, evicting the least recently used ones."""
+        with self._lock:
+            self._cache[key] = (order_id, expires_at)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _signal(self, key: str) -> None:
+        """Wake up requests of this worker waiting on the key."""
+        with self._lock:
+            event = self._in_flight.pop(key, None)
+        if event:
+            event.set()
+
+    def _maybe_sweep(self) -> None:
+        """Delete expired keys at most once per sweep interval per worker."""
+        cls = type(self)
+        with self._lock:
+            if time.monotonic() - cls._last_sweep < self.sweep_interval:
+                return
+            cls._last_sweep = time.monotonic()
+
+        purged = self.repository.purge_expired(datetime.utcnow())
+        if purged:
+            logger.info("Purged expired idempotency keys", count=purged)
 
 
 class OrderService:
-    """Service layer for Order operations with idempotency support."""
+    """
+    Service layer for Order operations with idempotency support.
 
-    def __init__(self, db: Session):
+    When a group committer is given, order placement is handed to it and
+    committed together with other concurrent orders.
+    """
+
+    def __init__(self, db: Session, group_committer=None):
         self.order_repository = OrderRepository(db)
         self.product_repository = ProductRepository(db)
         self.customer_repository = CustomerRepository(db)
+        self.stats_repository = StatsRepository(db)
+        self.idempotency_store = IdempotencyStore(db)
+        self.group_committer = group_committer
         self.db = db
 
     def create_order(
@@ -52,97 +193,292 @@ class OrderService:
 
         # Check idempotency
         if idempotency_key:
-            existing_order_id = IdempotencyStore.get(idempotency_key)
-            if existing_order_id:
+            existing_order = self._find_idempotent_order(idempotency_key)
+            if existing_order:
+                return existing_order
+
+        try:
+            if self.group_committer:
+                # Committed by the group committer with other queued orders
+                created_order, expires_at = self.group_committer.submit(
+                    customer_id, items, idempotency_key
+                )
+            else:
+                created_order, expires_at = self.place_order(customer_id, items, idempotency_key)
+
+                # Commit transaction
+                self.db.commit()
+
+            ProductCache.invalidate(item.product_id for item in created_order.items)
+            RowCountCache.adjust("orders", 1)
+            ORDERS_CREATED.inc()
+            logger.info(
+                "Order created successfully",
+                order_id=created_order.id,
+                total_amount=created_order.total_amount
+            )
+
+        except Exception as e:
+            # Rollback transaction on error
+            self.db.rollback()
+            logger.error("Failed to create order", error=str(e))
+            if idempotency_key:
+                self.idempotency_store.release(idempotency_key)
+            raise
+
+        if idempotency_key:
+            self.idempotency_store.release(idempotency_key, created_order.id, expires_at)
+        return created_order
+
+    def _find_idempotent_order(self, idempotency_key: str) -> Optional[Order]:
+        """
+        Return the order already created for a key, or claim the key.
+
+        Blocks while another request holding the same key is in flight.
+        """
+        while True:
+            existing_order_id = self.idempotency_store.acquire(idempotency_key)
+            if not existing_order_id:
+                return None
+
+            existing_order = self.order_repository.get_by_id(existing_order_id)
+            if existing_order:
+                IDEMPOTENCY_HITS.inc()
                 logger.info(
                     "Idempotent request detected, returning existing order",
                     order_id=existing_order_id,
                     idempotency_key=idempotency_key
                 )
-                existing_order = self.order_repository.get_by_id(existing_order_id)
-                if existing_order:
-                    return existing_order
+                return existing_order
 
-        try:
-            # Start transaction
-            # Verify customer exists
-            customer = self.customer_repository.get_by_id(customer_id)
-            if not customer:
-                raise ValueError(f"Customer with id {customer_id} not found")
-
-            # Validate and prepare order items
-            order_items = []
-            product_ids = [item["product_id"] for item in items]
-            products = {p.id: p for p in self.product_repository.get_by_ids(product_ids)}
-
-            for item_data in items:
-                product_id = item_data["product_id"]
-                quantity = item_data["quantity"]
-
-                # Check if product exists
-                product = products.get(product_id)
-                if not product:
-                    raise ValueError(f"Product with id {product_id} not found")
-
-                # Validate stock
-                if not product.has_sufficient_stock(quantity):
-                    logger.warning(
-                        "Insufficient stock",
-                        product_id=product_id,
-                        requested=quantity,
-                        available=product.stock_qty
-                    )
-                    raise ValueError(
-                        f"Insufficient stock for product '{product.name}'. "
-                        f"Available: {product.stock_qty}, Requested: {quantity}"
-                    )
+            # The order was deleted; the key is free to be used again
+            self.idempotency_store.forget(idempotency_key)
 
-                # Create order item
-                order_item = OrderItem(
-                    product_id=product_id,
-                    unit_price=product.price,
-                    quantity=quantity
-                )
-                order_item.validate()
-                order_items.append(order_item)
-
-                # Reduce stock
-                product.reduce_stock(quantity)
-                self.product_repository.update(product)
-
-            # Create order entity
-            order = Order(customer_id=customer_id, items=order_items)
-            order.validate()
+    def place_order(
+        self,
+        customer_id: int,
+        items: List[dict],
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[Order, Optional[datetime]]:
+        """
+        Validate an order, reserve its stock and flush it.
+
+        A claimed idempotency key is completed in the same transaction, and
+        its expiry is returned with the order. Does not commit; the caller
+        owns the transaction.
+        """
+        # Verify customer exists
+        customer = self.customer_repository.get_by_id(customer_id)
+        if not customer:
+            raise ValueError(f"Customer with id {customer_id} not found")
+
+        # Lock the products (in id order) for the rest of the transaction
+        quantities = self._aggregate_quantities(items)
+        products = {
+            p.id: p
+            for p in self.product_repository.get_by_ids(list(quantities), for_update=True)
+        }
+        order = self._build_order(customer_id, items, quantities, products)
+
+        # Reserve stock for every line in one conditional UPDATE
+        # (only fails when another transaction took the stock after our read)
+        if not self.product_repository.reserve_stock(quantities):
+            STOCK_REJECTIONS.labels("reserve").inc()
+            raise ValueError("Insufficient stock to reserve the requested items")
+
+        # Other workers drop the reserved products from their cache on commit
+        self.product_repository.announce_changes(quantities)
+
+        # Save order and items without committing
+        created_order = self.order_repository.create(order, commit=False)
+
+        # Count the order in the daily rollup within the same transaction
+        self.stats_repository.add_orders([created_order])
+
+        # Store idempotency key in the same transaction as the order
+        expires_at = None
+        if idempotency_key:
+            expires_at = self.idempotency_store.complete(idempotency_key, created_order.id)
 
-            # Save order
-            created_order = self.order_repository.create(order)
+        return created_order, expires_at
 
-            # Store idempotency key
-            if idempotency_key:
-                IdempotencyStore.set(idempotency_key, created_order.id)
+    def create_orders_batch(
+        self,
+        orders: List[dict]
+    ) -> List[Tuple[Optional[Order], Optional[str]]]:
+        """
+        Create many orders in one transaction.
+
+        Customers and products are resolved with one query each, stock is
+        allocated in payload order and reserved with a single conditional
+        UPDATE, and all orders and items are inserted with multi-row
+        statements. Returns one (order, error) pair per payload, in order.
+        """
+        logger.info("Creating order batch", orders_count=len(orders))
 
-            # Commit transaction
+        try:
+            customer_ids = {o["customer_id"] for o in orders}
+            known_customers = {c.id for c in self.customer_repository.get_by_ids(list(customer_ids))}
+
+            product_ids = {item["product_id"] for o in orders for item in o["items"]}
+            products = {
+                p.id: p
+                for p in self.product_repository.get_by_ids(list(product_ids), for_update=True)
+            }
+            remaining = {pid: p.stock_qty for pid, p in products.items()}
+
+            results: List[Tuple[Optional[Order], Optional[str]]] = []
+            accepted: List[Order] = []
+            reserved: Dict[int, int] = {}
+
+            for order_data in orders:
+                try:
+                    order, quantities = self._build_batch_order(
+                        order_data, known_customers, products, remaining
+                    )
+                except ValueError as e:
+                    results.append((None, str(e)))
+                    continue
+
+                for product_id, quantity in quantities.items():
+                    remaining[product_id] -= quantity
+                    reserved[product_id] = reserved.get(product_id, 0) + quantity
+                accepted.append(order)
+                results.append((order, None))
+
+            if not self.product_repository.reserve_stock(reserved):
+                STOCK_REJECTIONS.labels("reserve").inc()
+                self.db.rollback()
+                raise ValueError("Stock changed while processing the batch, please retry")
+
+            self.order_repository.create_many(accepted)
+            self.stats_repository.add_orders(accepted)
+            self.product_repository.announce_changes(reserved)
             self.db.commit()
+            ProductCache.invalidate(reserved)
+            RowCountCache.adjust("orders", len(accepted))
+            ORDERS_CREATED.inc(len(accepted))
 
             logger.info(
-                "Order created successfully",
-                order_id=created_order.id,
-                total_amount=created_order.total_amount
+                "Order batch created",
+                created=len(accepted),
+                failed=len(orders) - len(accepted)
             )
-
-            return created_order
+            return results
 
         except Exception as e:
-            # Rollback transaction on error
             self.db.rollback()
-            logger.error("Failed to create order", error=str(e))
+            logger.error("Failed to create order batch", error=str(e))
             raise
 
+    @staticmethod
+    def _build_batch_order(
+        order_data: dict,
+        known_customers: set,
+        products: Dict[int, Product],
+        remaining: Dict[int, int]
+    ) -> Tuple[Order, Dict[int, int]]:
+        """Validate one batch entry against the stock still unallocated."""
+        customer_id = order_data["customer_id"]
+        if customer_id not in known_customers:
+            raise ValueError(f"Customer with id {customer_id} not found")
+
+        quantities = OrderService._aggregate_quantities(order_data["items"])
+        for product_id, quantity in quantities.items():
+            product = products.get(product_id)
+            if not product:
+                raise ValueError(f"Product with id {product_id} not found")
+            if not product.is_active:
+                raise ValueError(f"Product '{product.name}' is not active")
+            if remaining[product_id] < quantity:
+                STOCK_REJECTIONS.labels("check").inc()
+                raise ValueError(
+                    f"Insufficient stock for product '{product.name}'. "
+                    f"Available: {remaining[product_id]}, Requested: {quantity}"
+                )
+
+        order = Order(
+            customer_id=customer_id,
+            items=[
+                OrderItem(
+                    product_id=item_data["product_id"],
+                    unit_price=products[item_data["product_id"]].price,
+                    quantity=item_data["quantity"]
+                )
+                for item_data in order_data["items"]
+            ]
+        )
+        order.validate()
+        return order, quantities
+
+    @staticmethod
+    def _aggregate_quantities(items: List[dict]) -> Dict[int, int]:
+        """Sum requested quantities per product."""
+        quantities: Dict[int, int] = {}
+        for item_data in items:
+            product_id = item_data["product_id"]
+            quantities[product_id] = quantities.get(product_id, 0) + item_data["quantity"]
+        return quantities
+
+    @classmethod
+    def _build_order(
+        cls,
+        customer_id: int,
+        items: List[dict],
+        quantities: Dict[int, int],
+        products: Dict[int, Product]
+    ) -> Order:
+        """Check the locked products are active and in stock, and build a validated order."""
+        for product_id, quantity in quantities.items():
+            product = products.get(product_id)
+            if not product:
+                raise ValueError(f"Product with id {product_id} not found")
+            if not product.is_active:
+                raise ValueError(f"Product '{product.name}' is not active")
+            cls._check_stock(product, quantity)
+
+        # Validate and prepare order items
+        order_items = []
+        for item_data in items:
+            order_item = OrderItem(
+                product_id=item_data["product_id"],
+                unit_price=products[item_data["product_id"]].price,
+                quantity=item_data["quantity"]
+            )
+            order_item.validate()
+            order_items.append(order_item)
+
+        # Create order entity
+        order = Order(customer_id=customer_id, items=order_items)
+        order.validate()
+        return order
+
+    @staticmethod
+    def _check_stock(product: Product, quantity: int) -> None:
+        """Raise if the product cannot fulfil the requested quantity."""
+        if not product.has_sufficient_stock(quantity):
+            STOCK_REJECTIONS.labels("check").inc()
+            logger.warning(
+                "Insufficient stock",
+                product_id=product.id,
+                requested=quantity,
+                available=product.stock_qty
+            )
+            raise ValueError(
+                f"Insufficient stock for product '{product.name}'. "
+                f"Available: {product.stock_qty}, Requested: {quantity}"
+            )
+
     def get_order(self, order_id: int) -> Optional[Order]:
         """Get order by ID."""
         logger.debug("Fetching order", order_id=order_id)
         return self.order_repository.get_by_id(order_id)
 
+    def get_order_fields(self, order_id: int, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Get only `fields` of an order (plus id and version), as a dict; items are read only if requested."""
+        logger.debug("Fetching order", order_id=order_id, fields=fields)
+        return self.order_repository.get_fields_by_id(order_id, fields)
+
     def list_orders(
         self,
         skip: int = 0,
@@ -150,28 +486,77 @@ class OrderService:
         customer_id: Optional[int] = None,
         status: Optional[str] = None,
         order_by: str = "created_at",
-        order_dir: str = "desc"
-    ) -> tuple[List[Order], int]:
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Order], Optional[int]]:
         """List orders with pagination and filters."""
         logger.debug(
             "Listing orders",
             skip=skip,
             limit=limit,
+            cursor=cursor,
+            count=count,
             customer_id=customer_id,
             status=status
         )
-        return self.order_repository.get_all(skip, limit, customer_id, status, order_by, order_dir)
+        return self.order_repository.get_all(skip, limit, customer_id, status, order_by, order_dir, cursor, count)
+
+    def list_order_fields(
+        self,
+        fields: List[str],
+        skip: int = 0,
+        limit: int = 100,
+        customer_id: Optional[int] = None,
+        status: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        """List only `fields` of the orders (plus id, version and the sort column), as dicts."""
+        logger.debug("Listing orders", skip=skip, limit=limit, cursor=cursor, count=count, customer_id=customer_id, status=status, fields=fields)
+        return self.order_repository.get_all_fields(fields, skip, limit, customer_id, status, order_by, order_dir, cursor, count)
+
+    def next_cursor(self, orders: List[Order], order_by: str, limit: int) -> Optional[str]:
+        """Return the cursor for the page after `orders`."""
+        return self.order_repository.next_cursor(orders, order_by, limit)
+
+    def export_orders(self, customer_id: Optional[int] = None, status: Optional[str] = None, batch_size: int = 1000) -> Iterator[Order]:
+        """Stream every order matching the list filters, in id order."""
+        logger.info("Exporting orders", customer_id=customer_id, status=status, batch_size=batch_size)
+        return self.order_repository.stream(customer_id, status, batch_size)
+
+    def get_order_version(self, order_id: int) -> Optional[int]:
+        """Get an order's row version without loading it."""
+        return self.order_repository.get_version(order_id)
+
+    def list_order_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        customer_id: Optional[int] = None,
+        status: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Tuple[int, int]], Optional[int]]:
+        """Get (id, version) of the orders list_orders would return, and the total."""
+        return self.order_repository.get_page_versions(skip, limit, customer_id, status, order_by, order_dir, cursor, count)
 
     def update_order_status(self, order_id: int, new_status: str) -> Order:
         """Update order status."""
         logger.info("Updating order status", order_id=order_id, new_status=new_status)
 
-        order = self.order_repository.get_by_id(order_id)
+        # Lock the order so concurrent status changes update the rollup once
+        order = self.order_repository.get_by_id(order_id, for_update=True)
         if not order:
             logger.warning("Order not found", order_id=order_id)
             raise ValueError(f"Order with id {order_id} not found")
 
         # Update status based on business rules
+        previous_status = order.status
         if new_status == "PAID":
             order.mark_as_paid()
         elif new_status == "CANCELLED":
@@ -179,6 +564,8 @@ class OrderService:
         else:
             raise ValueError(f"Invalid status: {new_status}")
 
+        # Committed together with the status by the repository update
+        self.stats_repository.move_order(order, previous_status)
         updated_order = self.order_repository.update(order)
         logger.info("Order status updated successfully", order_id=order_id, status=new_status)
 
@@ -188,8 +575,14 @@ class OrderService:
         """Delete an order."""
         logger.info("Deleting order", order_id=order_id)
 
+        order = self.order_repository.get_by_id(order_id, for_update=True)
+        if order:
+            # Committed together with the deletion by the repository
+            self.stats_repository.add_orders([order], sign=-1)
+
         result = self.order_repository.delete(order_id)
         if result:
+            RowCountCache.adjust("orders", -1)
             logger.info("Order deleted successfully", order_id=order_id)
         else:
             logger.warning("Order not found", order_id=order_id)
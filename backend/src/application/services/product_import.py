@@ -0,0 +1,181 @@
+import csv
+import json
+import math
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from src.domain.entities import Product
+
+IMPORT_CHUNK_SIZE = int(os.getenv("PRODUCT_IMPORT_CHUNK_SIZE", "1000"))
+# Rejected rows beyond this are counted but not listed
+IMPORT_MAX_ERRORS = int(os.getenv("PRODUCT_IMPORT_MAX_ERRORS", "1000"))
+
+IMPORT_FORMATS = ("csv", "ndjson")
+REQUIRED_COLUMNS = ("sku", "name", "price", "stock_qty")
+
+# (row number, product) pairs of one upsert; rows omitting is_active keep it on update
+ImportChunk = Tuple[List[Tuple[int, Product]], bool]
+
+_TRUE = {"true", "1", "yes", "sim"}
+_FALSE = {"false", "0", "no", "nao", "não"}
+
+
+class ProductImportResult:
+    """Counts and per-row errors of a product import."""
+
+    def __init__(self):
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.rejected = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def reject(self, row: int, sku: Optional[str], error: str) -> None:
+        """Record a rejected row."""
+        self.rejected += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({"row": row, "sku": sku, "mensagem": error})
+
+    def add_chunk(self, existing: Dict[str, int], written: List[int]) -> List[int]:
+        """Count one committed upsert; returns the ids of the updated products."""
+        existing_ids = set(existing.values())
+        updated = [product_id for product_id in written if product_id in existing_ids]
+        self.inserted += len(written) - len(updated)
+        self.updated += len(updated)
+        self.unchanged += len(existing) - len(updated)
+        return updated
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "rejected": self.rejected,
+            "errors": self.errors,
+        }
+
+
+def detect_format(filename: Optional[str]) -> str:
+    """Pick the import format from a file name extension."""
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    if extension == "csv":
+        return "csv"
+    if extension in ("ndjson", "jsonl"):
+        return "ndjson"
+    raise ValueError("Unknown file format; use a .csv or .ndjson file or pass format")
+
+
+def read_records(lines: Iterable[str], fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Parse CSV or NDJSON lines lazily into (row number, record) pairs.
+
+    Rows are numbered from 1, excluding the CSV header. A record that
+    could not be parsed is passed on as a ValueError, to be rejected.
+    Raises ValueError when the CSV header lacks a required column.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        for number, record in enumerate(reader, start=1):
+            yield number, record
+        return
+
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            yield number, json.loads(line)
+        except ValueError as e:
+            yield number, ValueError(f"Invalid JSON: {e}")
+
+
+def build_product(record: Any) -> Tuple[Product, bool]:
+    """
+    Validate one record into a Product; also tells whether is_active was given.
+
+    CSV cells arrive as strings and empty cells count as absent.
+    """
+    if isinstance(record, ValueError):
+        raise record
+    if not isinstance(record, dict):
+        raise ValueError("Row must be an object")
+
+    values = {k: v.strip() if isinstance(v, str) else v for k, v in record.items() if k}
+    values = {k: v for k, v in values.items() if v not in ("", None)}
+    missing = [c for c in REQUIRED_COLUMNS if c not in values]
+    if missing:
+        raise ValueError(f"Missing {', '.join(missing)}")
+
+    product = Product(
+        name=str(values["name"]),
+        sku=str(values["sku"]),
+        price=_number(values["price"], float, "price"),
+        stock_qty=_number(values["stock_qty"], int, "stock_qty"),
+        is_active=_flag(values.get("is_active", True)),
+    )
+    product.validate()
+    if len(product.name) > 255:
+        raise ValueError("Product name longer than 255 characters")
+    if len(product.sku) > 100:
+        raise ValueError("Product SKU longer than 100 characters")
+    return product, "is_active" in values
+
+
+def import_chunks(records: Iterable[Tuple[int, Any]], chunk_size: int, result: ProductImportResult) -> Iterator[ImportChunk]:
+    """
+    Validate records and group the valid ones into upsert chunks.
+
+    Invalid rows and repeated SKUs are rejected into `result`. Rows with
+    and without is_active go to separate chunks, as they update different
+    columns.
+    """
+    seen: Dict[str, int] = {}
+    pending: Dict[bool, List[Tuple[int, Product]]] = {True: [], False: []}
+    for number, record in records:
+        try:
+            product, has_active = build_product(record)
+        except ValueError as e:
+            sku = record.get("sku") if isinstance(record, dict) else None
+            result.reject(number, sku, str(e))
+            continue
+
+        if product.sku in seen:
+            result.reject(number, product.sku, f"Duplicate SKU, already on row {seen[product.sku]}")
+            continue
+        seen[product.sku] = number
+
+        chunk = pending[has_active]
+        chunk.append((number, product))
+        if len(chunk) >= chunk_size:
+            pending[has_active] = []
+            yield chunk, has_active
+
+    for has_active, chunk in pending.items():
+        if chunk:
+            yield chunk, has_active
+
+
+def _number(value: Any, kind: type, field: str):
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid {field}: {value!r}")
+    try:
+        number = kind(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {field}: {value!r}")
+    if (kind is int and isinstance(value, float) and value != number) or not math.isfinite(number):
+        raise ValueError(f"Invalid {field}: {value!r}")
+    return number
+
+
+def _flag(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"Invalid is_active: {value!r}")
@@ -1,7 +1,9 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from src.domain.entities import Product
-from src.infrastructure.repositories import ProductRepository
+from src.infrastructure.repositories import ProductCache, ProductRepository, RowCountCache
+from .product_import import IMPORT_CHUNK_SIZE, ProductImportResult, import_chunks
 import structlog
 
 logger = structlog.get_logger()
@@ -10,9 +12,14 @@ logger = structlog.get_logger()
 class ProductService:
     """Service layer for Product operations."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, primary: Optional[Session] = None):
         self.repository = ProductRepository(db)
         self.db = db
+        # When db reads from a replica, the product cache is filled from the
+        # primary: a lagging replica could put rows older than the last
+        # invalidation into the cache
+        reads_replica = primary is not None and primary.get_bind() is not db.get_bind()
+        self.fill_repository = ProductRepository(primary) if reads_replica else self.repository
 
     def create_product(
         self,
@@ -41,16 +48,81 @@ class ProductService:
         )
         product.validate()
 
-        # Save to database
+        # Save to database; cached searches may now match the new product
+        self.repository.announce_changes(catalog=True)
         created_product = self.repository.create(product)
+        ProductCache.invalidate(catalog=True)
+        RowCountCache.adjust("products", 1)
         logger.info("Product created successfully", product_id=created_product.id, sku=sku)
 
         return created_product
 
+    def import_products(self, records: Iterable[Tuple[int, Any]], chunk_size: int = IMPORT_CHUNK_SIZE) -> ProductImportResult:
+        """
+        Upsert products by SKU from parsed file records (see read_records).
+
+        Valid rows are written in chunks, one multi-row INSERT ... ON CONFLICT
+        and one commit each, instead of a lookup and a commit per product.
+        Invalid rows are rejected with their row number; a chunk the database
+        refuses is rolled back and its rows rejected.
+        """
+        logger.info("Importing products", chunk_size=chunk_size)
+        result = ProductImportResult()
+
+        for chunk, update_active in import_chunks(records, chunk_size, result):
+            try:
+                existing, written = self.repository.upsert_by_sku([p for _, p in chunk], update_active)
+                if written:
+                    self.repository.announce_changes(written, catalog=True)
+                self.db.commit()
+            except SQLAlchemyError as e:
+                self.db.rollback()
+                logger.error("Product import chunk failed", first_row=chunk[0][0], error=str(e))
+                for number, product in chunk:
+                    result.reject(number, product.sku, f"Database error: {e.__class__.__name__}")
+                continue
+
+            updated = result.add_chunk(existing, written)
+            ProductCache.invalidate(updated, catalog=bool(written))
+            RowCountCache.adjust("products", len(written) - len(updated))
+
+        logger.info(
+            "Products imported",
+            inserted=result.inserted,
+            updated=result.updated,
+            unchanged=result.unchanged,
+            rejected=result.rejected
+        )
+        return result
+
     def get_product(self, product_id: int) -> Optional[Product]:
-        """Get product by ID."""
+        """Get product by ID, read through the product cache."""
         logger.debug("Fetching product", product_id=product_id)
-        return self.repository.get_by_id(product_id)
+        product = ProductCache.get(product_id)
+        if product:
+            return product
+
+        token = ProductCache.token()
+        product = self.fill_repository.get_by_id(product_id)
+        if product:
+            ProductCache.put([product], token)
+        return product
+
+    def get_product_fields(self, product_id: int, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Get only `fields` of a product (plus id and version), as a dict.
+
+        One SELECT of those columns, bypassing the product cache, so that
+        get_product_version(cached=False) reads the version the same way.
+        """
+        return self.repository.get_fields_by_id(product_id, fields)
+
+    def warm_cache(self, limit: int) -> int:
+        """Load the newest active products into the product cache."""
+        token = ProductCache.token()
+        products, _ = self.repository.get_all(limit=limit, is_active=True, count="none")
+        ProductCache.put(products, token)
+        return len(products)
 
     def list_products(
         self,
@@ -59,17 +131,75 @@ class ProductService:
         search: Optional[str] = None,
         is_active: Optional[bool] = None,
         order_by: str = "created_at",
-        order_dir: str = "desc"
-    ) -> tuple[List[Product], int]:
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Product], Optional[int]]:
         """List products with pagination and filters."""
         logger.debug(
             "Listing products",
             skip=skip,
             limit=limit,
+            cursor=cursor,
+            count=count,
             search=search,
             is_active=is_active
         )
-        return self.repository.get_all(skip, limit, search, is_active, order_by, order_dir)
+        return self.repository.get_all(skip, limit, search, is_active, order_by, order_dir, cursor, count)
+
+    def list_product_fields(
+        self,
+        fields: List[str],
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        """List only `fields` of the products (plus id, version and the sort column), as dicts."""
+        logger.debug("Listing products", skip=skip, limit=limit, cursor=cursor, count=count, search=search, fields=fields)
+        return self.repository.get_all_fields(fields, skip, limit, search, is_active, order_by, order_dir, cursor, count)
+
+    def next_cursor(self, products: List[Product], order_by: str, limit: int) -> Optional[str]:
+        """Return the cursor for the page after `products`."""
+        return self.repository.next_cursor(products, order_by, limit)
+
+    def export_products(self, search: Optional[str] = None, is_active: Optional[bool] = None, batch_size: int = 1000) -> Iterator[Product]:
+        """Stream every product matching the list filters, in id order."""
+        logger.info("Exporting products", search=search, is_active=is_active, batch_size=batch_size)
+        return self.repository.stream(search, is_active, batch_size)
+
+    def get_product_version(self, product_id: int, cached: bool = True) -> Optional[int]:
+        """
+        Get a product's row version without loading it.
+
+        With `cached`, the version of what get_product returns: the cached
+        product's, else the one in the database that fills the cache.
+        Without, the version of what get_product_fields returns.
+        """
+        if not cached:
+            return self.repository.get_version(product_id)
+        product = ProductCache.get(product_id)
+        if product:
+            return product.version
+        return self.fill_repository.get_version(product_id)
+
+    def list_product_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Tuple[int, int]], Optional[int]]:
+        """Get (id, version) of the products list_products would return, and the total."""
+        return self.repository.get_page_versions(skip, limit, search, is_active, order_by, order_dir, cursor, count)
 
     def update_product(
         self,
@@ -108,13 +238,92 @@ class ProductService:
         if is_active is not None:
             product.is_active = is_active
 
-        # Validate and save
+        # Validate and save; price and stock changes leave search results intact
         product.validate()
+        catalog = name is not None or sku is not None or is_active is not None
+        self.repository.announce_changes([product_id], catalog)
         updated_product = self.repository.update(product)
+        ProductCache.invalidate([product_id], catalog)
 
         logger.info("Product updated successfully", product_id=product_id)
         return updated_product
 
+    def adjust_stock(self, adjustments: List[dict]) -> List[Tuple[int, str, int]]:
+        """
+        Apply many stock changes in one UPDATE and one transaction.
+
+        Each adjustment names a product by product_id or sku and gives a
+        delta or an absolute quantity; deltas to the same product add up.
+        Nothing is written when a product is unknown or a stock would become
+        negative (ValueError). Returns (product_id, sku, stock_qty) with the
+        new quantities, in request order.
+        """
+        logger.info("Adjusting stock", adjustments_count=len(adjustments))
+        product_ids, skus = self._stock_targets(adjustments)
+        identities = self.repository.resolve(product_ids, skus)
+        order, deltas, levels = self._plan_stock_adjustments(adjustments, identities)
+
+        try:
+            self.repository.announce_changes(order)
+            stock = self.repository.adjust_stock(deltas, levels)
+            negative = [product_id for product_id in order if product_id not in stock]
+            if negative:
+                logger.warning("Stock adjustment rejected", product_ids=negative)
+                raise ValueError(f"Stock cannot become negative for products: {negative}")
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        ProductCache.invalidate(order)
+        logger.info("Stock adjusted", products_count=len(order))
+        return [(product_id, identities[product_id], stock[product_id]) for product_id in order]
+
+    @staticmethod
+    def _stock_targets(adjustments: List[dict]) -> Tuple[List[int], List[str]]:
+        """Check that every adjustment has one product reference and one change; collect the references."""
+        product_ids, skus = [], []
+        for index, adjustment in enumerate(adjustments):
+            if (adjustment.get("product_id") is None) == (adjustment.get("sku") is None):
+                raise ValueError(f"Adjustment {index}: give either product_id or sku")
+            if (adjustment.get("delta") is None) == (adjustment.get("absolute") is None):
+                raise ValueError(f"Adjustment {index}: give either delta or absolute")
+            if adjustment.get("product_id") is not None:
+                product_ids.append(adjustment["product_id"])
+            else:
+                skus.append(adjustment["sku"])
+        return product_ids, skus
+
+    @staticmethod
+    def _plan_stock_adjustments(
+        adjustments: List[dict],
+        identities: Dict[int, str]
+    ) -> Tuple[List[int], Dict[int, int], Dict[int, int]]:
+        """Resolve adjustments to product ids; returns the ids in request order, the summed deltas and the levels."""
+        ids_by_sku = {sku: product_id for product_id, sku in identities.items()}
+        resolved = [
+            a["product_id"] if a.get("product_id") is not None else ids_by_sku.get(a["sku"])
+            for a in adjustments
+        ]
+        missing = [
+            a.get("product_id") or a["sku"]
+            for a, product_id in zip(adjustments, resolved)
+            if product_id not in identities
+        ]
+        if missing:
+            raise ValueError(f"Products not found: {missing}")
+
+        deltas: Dict[int, int] = {}
+        levels: Dict[int, int] = {}
+        for index, (adjustment, product_id) in enumerate(zip(adjustments, resolved)):
+            if product_id in levels or (adjustment.get("absolute") is not None and product_id in deltas):
+                raise ValueError(f"Adjustment {index}: product {product_id} is already set to an absolute quantity or adjusted by a delta")
+            if adjustment.get("absolute") is not None:
+                levels[product_id] = adjustment["absolute"]
+            else:
+                deltas[product_id] = deltas.get(product_id, 0) + adjustment["delta"]
+        return list(dict.fromkeys(resolved)), deltas, levels
+
     def delete_product(self, product_id: int) -> bool:
         """Delete a product."""
         logger.info("Deleting product", product_id=product_id)
@@ -142,19 +351,46 @@ class ProductService:
                 "Considere marcá-lo como inativo em vez de deletar."
             )
 
+        self.repository.announce_changes([product_id], catalog=True)
         result = self.repository.delete(product_id)
         if result:
+            ProductCache.invalidate([product_id], catalog=True)
+            RowCountCache.adjust("products", -1)
             logger.info("Product deleted successfully", product_id=product_id)
 
         return result
 
     def search_products(self, query: str, limit: int = 10) -> List[Product]:
-        """Search products by name or SKU (for autocomplete)."""
+        """
+        Search products by name or SKU (for autocomplete).
+
+        Results are cached as product ids and hydrated from the product
+        cache, so stock changes do not evict cached searches. A search read
+        from a replica is answered but not cached.
+        """
         logger.debug("Searching products", query=query, limit=limit)
+        key = (query, limit)
+        product_ids = ProductCache.get_search(key)
+        if product_ids is not None:
+            found, missing = ProductCache.get_many(product_ids)
+            if missing:
+                token = ProductCache.token()
+                loaded = self.fill_repository.get_by_ids(missing)
+                ProductCache.put(loaded, token)
+                found.update((p.id, p) for p in loaded)
+            return [found[pid] for pid in product_ids if pid in found]
+
+        token = ProductCache.token()
         products, _ = self.repository.get_all(
             skip=0,
             limit=limit,
             search=query,
-            is_active=True
+            is_active=True,
+            order_by="relevance",
+            count="none"
         )
+        if self.fill_repository is not self.repository:
+            return products
+        ProductCache.put_search(key, [p.id for p in products], token)
+        ProductCache.put(products, token)
         return products
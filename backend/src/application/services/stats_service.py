@@ -0,0 +1,50 @@
+from sqlalchemy.orm import Session
+from src.domain.entities import OrderStatus
+from src.infrastructure.repositories import StatsRepository
+import structlog
+
+logger = structlog.get_logger()
+
+
+class StatsService:
+    """Service layer for dashboard statistics."""
+
+    def __init__(self, db: Session):
+        self.repository = StatsRepository(db)
+        self.db = db
+
+    def get_dashboard(self, low_stock_threshold: int = 10, low_stock_limit: int = 5) -> dict:
+        """
+        Build the dashboard figures from SQL aggregates.
+
+        Order figures come from the daily rollup kept by OrderService, so the
+        cost does not depend on the size of the order history.
+        """
+        logger.debug("Building dashboard stats", low_stock_threshold=low_stock_threshold)
+        return self.build_dashboard(
+            self.repository.order_totals(),
+            self.repository.catalog_totals(low_stock_threshold),
+            self.repository.low_stock_products(low_stock_threshold, low_stock_limit),
+        )
+
+    @staticmethod
+    def build_dashboard(order_totals, catalog_totals, low_stock_products) -> dict:
+        """Shape repository aggregates into the dashboard payload."""
+        by_status = {status: (0, 0.0) for status in OrderStatus}
+        for status, order_count, revenue in order_totals:
+            by_status[OrderStatus(status)] = (int(order_count), float(revenue))
+
+        total_products, active_products, low_stock_count, total_customers = catalog_totals
+        return {
+            "total_orders": sum(count for count, _ in by_status.values()),
+            "total_revenue": round(sum(revenue for _, revenue in by_status.values()), 2),
+            "orders_by_status": [
+                {"status": status.value, "order_count": count, "revenue": round(revenue, 2)}
+                for status, (count, revenue) in by_status.items()
+            ],
+            "total_products": total_products,
+            "active_products": active_products,
+            "low_stock_count": low_stock_count,
+            "total_customers": total_customers,
+            "low_stock_products": low_stock_products,
+        }
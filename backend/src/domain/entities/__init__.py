@@ -1,5 +1,5 @@
 from .product import Product
 from .customer import Customer
-from .order import Order, OrderItem
+from .order import Order, OrderItem, OrderStatus
 
-__all__ = ["Product", "Customer", "Order", "OrderItem"]
+__all__ = ["Product", "Customer", "Order", "OrderItem", "OrderStatus"]
@@ -13,12 +13,14 @@ class Customer:
         document: str,
         id: Optional[int] = None,
         created_at: Optional[datetime] = None,
+        version: int = 1,
     ):
         self.id = id
         self.name = name
         self.email = email
         self.document = document
         self.created_at = created_at or datetime.utcnow()
+        self.version = version
 
     def validate(self) -> None:
         """Validate customer business rules."""
@@ -51,12 +51,14 @@ class Order:
         status: OrderStatus = OrderStatus.CREATED,
         id: Optional[int] = None,
         created_at: Optional[datetime] = None,
+        version: int = 1,
     ):
         self.id = id
         self.customer_id = customer_id
         self.items = items
         self.status = status
         self.created_at = created_at or datetime.utcnow()
+        self.version = version
 
     @property
     def total_amount(self) -> float:
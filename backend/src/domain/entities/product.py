@@ -14,6 +14,7 @@ class Product:
         is_active: bool = True,
         id: Optional[int] = None,
         created_at: Optional[datetime] = None,
+        version: int = 1,
     ):
         self.id = id
         self.name = name
@@ -22,6 +23,7 @@ class Product:
         self.stock_qty = stock_qty
         self.is_active = is_active
         self.created_at = created_at or datetime.utcnow()
+        self.version = version
 
     def has_sufficient_stock(self, quantity: int) -> bool:
         """Check if product has sufficient stock for the requested quantity."""
@@ -1,12 +1,18 @@
-from .config import get_db, engine, Base
-from .models import ProductModel, CustomerModel, OrderModel, OrderItemModel
+from .config import get_db, get_async_db, get_read_db, get_async_read_db, engine, Base, DB_STACK
+from .models import ProductModel, CustomerModel, OrderModel, OrderItemModel, IdempotencyKeyModel, OrderDailyStatsModel
 
 __all__ = [
     "get_db",
+    "get_async_db",
+    "get_read_db",
+    "get_async_read_db",
     "engine",
     "Base",
+    "DB_STACK",
     "ProductModel",
     "CustomerModel",
     "OrderModel",
     "OrderItemModel",
+    "IdempotencyKeyModel",
+    "OrderDailyStatsModel",
 ]
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 
 from src.infrastructure.database.config import SessionLocal
 from src.infrastructure.database.models import OrderModel, OrderItemModel
+from src.infrastructure.repositories import StatsRepository
 import structlog
 
 structlog.configure(
@@ -49,6 +50,7 @@ def clear_orders(db: Session):
 
         # Then delete orders
         db.query(OrderModel).delete()
+        StatsRepository(db).rebuild()
         db.commit()
 
         logger.info(f"Successfully deleted {order_count} orders and {order_items_count} order items")
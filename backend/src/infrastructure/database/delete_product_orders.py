@@ -1,6 +1,7 @@
 """Script to delete orders containing a specific product."""
 from src.infrastructure.database.config import SessionLocal
 from src.infrastructure.database.models import OrderModel, OrderItemModel, ProductModel
+from src.infrastructure.repositories import StatsRepository
 
 
 def delete_orders_with_product(product_name: str):
@@ -41,6 +42,9 @@ def delete_orders_with_product(product_name: str):
                 db.delete(order)
                 print(f"  - Pedido {order_id} deletado")
 
+        # Orders were deleted directly, so recompute the dashboard rollup
+        db.flush()
+        StatsRepository(db).rebuild()
         db.commit()
         print(f"\n✅ {len(order_ids)} pedido(s) deletado(s) com sucesso!")
         print(f"Agora você pode deletar o produto '{product.name}'")
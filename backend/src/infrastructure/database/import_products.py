@@ -0,0 +1,44 @@
+"""
+Import a supplier catalog (CSV or NDJSON), upserting products by SKU.
+
+Usage (from backend/):
+    python -m src.infrastructure.database.import_products catalogo.csv
+    python -m src.infrastructure.database.import_products catalogo.jsonl --format ndjson --chunk-size 5000
+"""
+import argparse
+import sys
+
+from src.infrastructure.database.config import SessionLocal
+from src.application.services import ProductService, detect_format, read_records
+from src.application.services.product_import import IMPORT_CHUNK_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV with a header (sku,name,price,stock_qty[,is_active]) or NDJSON")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Rows per INSERT ... ON CONFLICT")
+    parser.add_argument("--show-errors", type=int, default=20, help="Rejected rows to print")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8-sig", newline="") as lines:
+            records = read_records(lines, args.format or detect_format(args.path))
+            result = ProductService(db).import_products(records, args.chunk_size)
+    except ValueError as e:
+        print(f"❌ Erro ao importar produtos: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print(f"✅ Inseridos: {result.inserted} | Atualizados: {result.updated} | "
+          f"Sem alteração: {result.unchanged} | Rejeitados: {result.rejected}")
+    for error in result.errors[:args.show_errors]:
+        print(f"  - Linha {error['row']} ({error['sku']}): {error['mensagem']}")
+    if result.rejected > args.show_errors:
+        print(f"  ... e mais {result.rejected - args.show_errors} linhas rejeitadas")
+
+
+if __name__ == "__main__":
+    main()
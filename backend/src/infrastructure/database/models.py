@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, Boolean, Date, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from .config import Base
 from src.domain.entities.order import OrderStatus
 
@@ -17,10 +17,17 @@ class ProductModel(Base):
     stock_qty = Column(Integer, nullable=False, default=0)
     is_active = Column(Boolean, default=True, nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Row version for ETags, incremented by every UPDATE of the row (ORM or Core)
+    version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("version + 1"))
 
     # Relationships
     order_items = relationship("OrderItemModel", back_populates="product")
 
+    # Keyset pagination on the default sort (created_at, id)
+    __table_args__ = (Index("ix_products_created_at_id", "created_at", "id"),)
+    # Load the incremented version with the UPDATE (RETURNING) instead of on access
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class CustomerModel(Base):
     """Customer database model."""
@@ -32,10 +39,17 @@ class CustomerModel(Base):
     email = Column(String(255), unique=True, nullable=False, index=True)
     document = Column(String(20), unique=True, nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Row version for ETags, incremented by every UPDATE of the row (ORM or Core)
+    version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("version + 1"))
 
     # Relationships
     orders = relationship("OrderModel", back_populates="customer")
 
+    # Keyset pagination on the default sort (created_at, id)
+    __table_args__ = (Index("ix_customers_created_at_id", "created_at", "id"),)
+    # Load the incremented version with the UPDATE (RETURNING) instead of on access
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class OrderModel(Base):
     """Order database model."""
@@ -52,11 +66,18 @@ class OrderModel(Base):
         index=True
     )
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Row version for ETags, incremented by every UPDATE of the row (ORM or Core)
+    version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("version + 1"))
 
     # Relationships
     customer = relationship("CustomerModel", back_populates="orders")
     items = relationship("OrderItemModel", back_populates="order", cascade="all, delete-orphan")
 
+    # Keyset pagination on the default sort (created_at, id)
+    __table_args__ = (Index("ix_orders_created_at_id", "created_at", "id"),)
+    # Load the incremented version with the UPDATE (RETURNING) instead of on access
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class OrderItemModel(Base):
     """Order item database model."""
@@ -73,3 +94,26 @@ class OrderItemModel(Base):
     # Relationships
     order = relationship("OrderModel", back_populates="items")
     product = relationship("ProductModel", back_populates="order_items")
+
+
+class IdempotencyKeyModel(Base):
+    """Idempotency key database model."""
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    status = Column(String(20), nullable=False)
+    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class OrderDailyStatsModel(Base):
+    """Daily order rollup: order count and revenue per creation day and status."""
+
+    __tablename__ = "order_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    status = Column(SQLEnum(OrderStatus, name="order_status"), primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
@@ -0,0 +1,226 @@
+"""
+Connection pool configuration and per-worker pool telemetry.
+
+Pool size, overflow, checkout timeout, recycle age and the liveness check
+come from the environment. With DB_PGBOUNCER=true (pgbouncer in transaction
+pooling mode) pgbouncer is the pool: each checkout opens a connection to it
+(NullPool), and asyncpg keeps no server-side prepared statements, which
+would not survive the server connection changing between transactions.
+
+DB_POOL_PRE_PING chooses the liveness check done on checkout:
+  always  ping every checkout (one extra round trip each time)
+  idle    ping connections left idle for DB_POOL_PING_IDLE_SECONDS or more
+  never   no ping; a dropped connection fails the request that gets it
+"""
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from src.infrastructure.metrics import DB_POOL_CHECKOUT_SECONDS, METRICS_ENABLED
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Connections older than this are replaced on checkout; -1 keeps them
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "idle").lower()
+DB_POOL_PING_IDLE_SECONDS = float(os.getenv("DB_POOL_PING_IDLE_SECONDS", "30"))
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
+if DB_POOL_PRE_PING not in PRE_PING_STRATEGIES:
+    raise ValueError(f"DB_POOL_PRE_PING must be one of {', '.join(PRE_PING_STRATEGIES)}")
+
+_telemetry: Dict[str, "PoolTelemetry"] = {}
+
+
+class PoolTelemetry:
+    """Checkouts, checkout waits, pings and connection ages of one engine's pool in this worker."""
+
+    def __init__(self, name: str, pool_size: int = 0, max_overflow: int = 0, pre_ping: str = "never",
+                 ping_idle_seconds: float = DB_POOL_PING_IDLE_SECONDS):
+        self.name = name
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pre_ping = pre_ping
+        self.ping_idle_seconds = ping_idle_seconds
+        self._lock = threading.Lock()
+        self._opened: Dict[int, float] = {}
+        self._checked_out = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._timeouts = 0
+        self._pings = 0
+        self._ping_failures = 0
+
+    def observe_wait(self, seconds: float, timed_out: bool = False) -> None:
+        """Record the time one connect() call waited, successful or not."""
+        with self._lock:
+            self._waits += 1
+            self._wait_seconds += seconds
+            self._max_wait_seconds = max(self._max_wait_seconds, seconds)
+            self._timeouts += timed_out
+
+    def attach(self, engine: Engine) -> None:
+        """Listen to the pool events of `engine` (the sync_engine of an async engine)."""
+        dialect = engine.dialect
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, record):
+            record.info["checked_in_at"] = time.monotonic()
+            with self._lock:
+                self._opened[id(dbapi_connection)] = time.monotonic()
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_connection, record, proxy):
+            idle = time.monotonic() - record.info.get("checked_in_at", time.monotonic())
+            if self.pre_ping == "idle" and idle >= self.ping_idle_seconds:
+                self._ping(dialect, dbapi_connection)
+            with self._lock:
+                self._checkouts += 1
+                self._checked_out += 1
+
+        @event.listens_for(engine, "checkin")
+        def on_checkin(dbapi_connection, record):
+            record.info["checked_in_at"] = time.monotonic()
+            with self._lock:
+                self._checked_out -= 1
+
+        @event.listens_for(engine, "close")
+        def on_close(dbapi_connection, record):
+            with self._lock:
+                self._opened.pop(id(dbapi_connection), None)
+
+        @event.listens_for(engine, "close_detached")
+        def on_close_detached(dbapi_connection):
+            with self._lock:
+                self._opened.pop(id(dbapi_connection), None)
+
+    def _ping(self, dialect, dbapi_connection) -> None:
+        with self._lock:
+            self._pings += 1
+        try:
+            dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            with self._lock:
+                self._ping_failures += 1
+            # The pool discards the connection and checks out another one
+            raise exc.DisconnectionError(str(e)) from e
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            ages = [now - opened for opened in self._opened.values()]
+            checked_out = self._checked_out
+            return {
+                "name": self.name,
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "connections": len(ages),
+                "checked_out": checked_out,
+                "idle": max(0, len(ages) - checked_out),
+                "overflow": max(0, len(ages) - self.pool_size) if self.pool_size else 0,
+                "checkouts": self._checkouts,
+                "wait_avg_ms": round(self._wait_seconds / self._waits * 1000, 3) if self._waits else 0.0,
+                "wait_max_ms": round(self._max_wait_seconds * 1000, 3),
+                "timeouts": self._timeouts,
+                "pings": self._pings,
+                "ping_failures": self._ping_failures,
+                "oldest_connection_age_s": round(max(ages), 1) if ages else None,
+                "mean_connection_age_s": round(sum(ages) / len(ages), 1) if ages else None,
+            }
+
+
+class _TimedCheckout:
+    """Pool mixin recording how long connect() waits for a connection."""
+
+    telemetry: Optional[PoolTelemetry] = None
+
+    def connect(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            if METRICS_ENABLED:
+                DB_POOL_CHECKOUT_SECONDS.observe(waited)
+            if self.telemetry is not None:
+                self.telemetry.observe_wait(waited, timed_out)
+
+    def recreate(self):
+        # engine.dispose() replaces the pool; keep reporting to the same telemetry
+        pool = super().recreate()
+        pool.telemetry = self.telemetry
+        return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool recording checkout wait time."""
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool recording checkout wait time."""
+
+
+class TimedNullPool(_TimedCheckout, NullPool):
+    """NullPool (pgbouncer mode) recording connect time."""
+
+
+def pool_options(is_async: bool = False) -> dict:
+    """create_engine()/create_async_engine() pool arguments for the configured mode."""
+    if DB_PGBOUNCER:
+        options = {"poolclass": TimedNullPool}
+        if is_async:
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                # Unique names, so statements never collide on a shared server connection
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            }
+        return options
+    return {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING == "always",
+    }
+
+
+def instrument(engine: Engine, name: str) -> PoolTelemetry:
+    """Attach telemetry named `name` to a pooled engine (the sync_engine of an async one)."""
+    pgbouncer = isinstance(engine.pool, NullPool)
+    telemetry = PoolTelemetry(
+        name,
+        pool_size=0 if pgbouncer else engine.pool.size(),
+        max_overflow=0 if pgbouncer else DB_MAX_OVERFLOW,
+        pre_ping="never" if pgbouncer else DB_POOL_PRE_PING,
+    )
+    telemetry.attach(engine)
+    if isinstance(engine.pool, _TimedCheckout):
+        engine.pool.telemetry = telemetry
+    _telemetry[name] = telemetry
+    return telemetry
+
+
+def pool_stats() -> dict:
+    """Pool settings and the telemetry of every instrumented engine in this worker."""
+    return {
+        "pgbouncer": DB_PGBOUNCER,
+        "pre_ping": "never" if DB_PGBOUNCER else DB_POOL_PRE_PING,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pools": [telemetry.snapshot() for telemetry in _telemetry.values()],
+    }
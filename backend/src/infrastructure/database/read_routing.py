@@ -0,0 +1,60 @@
+"""
+Routing of read-only requests between the primary and a read replica.
+
+A client that just wrote reads from the primary for READ_AFTER_WRITE_SECONDS,
+so it sees its own changes despite replication lag: the API sets a cookie
+holding the deadline on every write response. When a connection to the
+replica fails, reads go to the primary for REPLICA_RETRY_SECONDS before the
+replica is tried again.
+"""
+import os
+import threading
+import time
+from typing import Mapping
+import structlog
+
+logger = structlog.get_logger()
+
+READ_AFTER_WRITE_SECONDS = float(os.getenv("READ_AFTER_WRITE_SECONDS", "5"))
+REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+PRIMARY_COOKIE = "db_primary_until"
+
+
+def primary_cookie_value(now: float = None) -> str:
+    """Deadline of the read-after-write window, as stored in the cookie."""
+    return f"{(now or time.time()) + READ_AFTER_WRITE_SECONDS:.3f}"
+
+
+def wrote_recently(cookies: Mapping[str, str]) -> bool:
+    """Whether the client's read-after-write window is still open."""
+    try:
+        return float(cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReplicaStatus:
+    """Process-wide availability of the read replica."""
+
+    retry_seconds = REPLICA_RETRY_SECONDS
+
+    _down_until = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def available(cls) -> bool:
+        return time.monotonic() >= cls._down_until
+
+    @classmethod
+    def mark_down(cls, error: Exception) -> None:
+        """Send reads to the primary for retry_seconds."""
+        with cls._lock:
+            if time.monotonic() < cls._down_until:
+                return
+            cls._down_until = time.monotonic() + cls.retry_seconds
+        logger.warning("Read replica unavailable, reading from primary", error=str(error), retry_seconds=cls.retry_seconds)
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._down_until = 0.0
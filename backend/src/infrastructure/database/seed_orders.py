@@ -2,6 +2,7 @@
 from sqlalchemy.orm import Session
 from src.infrastructure.database.config import SessionLocal
 from src.infrastructure.database.models import OrderModel, OrderItemModel, ProductModel, CustomerModel
+from src.infrastructure.repositories import StatsRepository
 from src.domain.entities.order import OrderStatus
 from datetime import datetime, timedelta
 import random
@@ -89,6 +90,9 @@ def seed_sample_orders():
                 'items': num_items
             })
 
+        # Orders were written directly, so recompute the dashboard rollup
+        db.flush()
+        StatsRepository(db).rebuild()
         db.commit()
 
         print(f"\n✅ {len(orders_data)} pedidos de exemplo criados com sucesso!")
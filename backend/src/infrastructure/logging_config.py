@@ -0,0 +1,209 @@
+"""
+Structured logging with rendering and I/O off the request thread.
+
+The request thread runs only the cheap processors (level filter, sampling,
+lazy fields, timestamp) and puts the event on a bounded queue. A
+QueueListener thread renders the JSON and writes it to stdout. When the
+queue is full the event is dropped and counted; the request never waits
+for the writer.
+
+LOG_SAMPLE_RATES keeps a fraction of high-volume debug/info events, by
+event name: "Creating order=0.1,Listing orders=0.01". Nothing is sampled
+unless it is set. Kept events carry sample_rate so counts can be scaled
+back up. Warnings and errors are never sampled.
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from typing import Any, Callable, Dict, Optional, Tuple
+import structlog
+from src.infrastructure.metrics import LOG_EVENTS_DROPPED
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
+SAMPLED_LEVELS = ("debug", "info")
+
+_handler: Optional["NonBlockingQueueHandler"] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """'event=rate,...' to {event: rate}; rates are between 0 and 1."""
+    rates = {}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        event, _, rate = entry.rpartition("=")
+        try:
+            fraction = float(rate)
+        except ValueError:
+            fraction = -1.0
+        if not event.strip() or not 0 <= fraction <= 1:
+            raise ValueError(f"Invalid LOG_SAMPLE_RATES entry: {entry!r}")
+        rates[event.strip()] = fraction
+    return rates
+
+
+class LazyField:
+    """Log field computed only when the event is emitted."""
+
+    __slots__ = ("fn",)
+
+    def __init__(self, fn: Callable[[], Any]):
+        self.fn = fn
+
+
+def lazy(fn: Callable[[], Any]) -> LazyField:
+    """Defer an expensive field: logger.debug("...", rows=lazy(lambda: summarize(rows)))."""
+    return LazyField(fn)
+
+
+class EventSampler:
+    """Processor keeping `rate` of the debug/info events listed in `rates`."""
+
+    def __init__(self, rates: Dict[str, float], random_fn: Callable[[], float] = random.random):
+        self.rates = rates
+        self.random = random_fn
+
+    def __call__(self, logger, method_name: str, event_dict: dict) -> dict:
+        if method_name not in SAMPLED_LEVELS:
+            return event_dict
+        rate = self.rates.get(event_dict.get("event"))
+        if rate is None or rate >= 1:
+            return event_dict
+        if self.random() >= rate:
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = rate
+        return event_dict
+
+
+def resolve_lazy_fields(logger, method_name: str, event_dict: dict) -> dict:
+    # On the request thread: the callables may use request-scoped state
+    for key, value in event_dict.items():
+        if isinstance(value, LazyField):
+            event_dict[key] = value.fn()
+    return event_dict
+
+
+def capture_exc_info(logger, method_name: str, event_dict: dict) -> dict:
+    # exc_info=True means "the exception being handled", which only this thread knows
+    if event_dict.get("exc_info") is True:
+        event_dict["exc_info"] = sys.exc_info()
+    return event_dict
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener and drops events when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same process, no pickling: hand the record over as is
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_EVENTS_DROPPED.inc()
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Writes to the current sys.stdout, like logging's last-resort handler does for stderr."""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def request_processors(sampler: Callable) -> list:
+    """Processors run on the calling thread, up to the hand-off to the stdlib handler."""
+    return [
+        structlog.stdlib.filter_by_level,
+        sampler,
+        resolve_lazy_fields,
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+        structlog.processors.StackInfoRenderer(),
+        capture_exc_info,
+        structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+    ]
+
+
+def json_formatter() -> structlog.stdlib.ProcessorFormatter:
+    """Renders structlog events, and records of other libraries, as JSON lines."""
+    return structlog.stdlib.ProcessorFormatter(
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            structlog.processors.JSONRenderer(),
+        ],
+        foreign_pre_chain=[
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+        ],
+    )
+
+
+def start_writer(
+    writer: logging.Handler, queue_size: int = LOG_QUEUE_SIZE
+) -> Tuple[NonBlockingQueueHandler, logging.handlers.QueueListener]:
+    """A queue handler feeding `writer` from a started background listener."""
+    log_queue: queue.Queue = queue.Queue(queue_size)
+    listener = logging.handlers.QueueListener(log_queue, writer, respect_handler_level=True)
+    listener.start()
+    return NonBlockingQueueHandler(log_queue), listener
+
+
+def configure_logging(level: str = LOG_LEVEL, sample_rates: str = LOG_SAMPLE_RATES) -> None:
+    """Route structlog and stdlib logging through the background JSON writer."""
+    global _handler, _listener
+    sampler = EventSampler(parse_sample_rates(sample_rates))
+    stop_logging()
+
+    writer = _StdoutHandler()
+    writer.setFormatter(json_formatter())
+    _handler, _listener = start_writer(writer)
+    root = logging.getLogger()
+    root.addHandler(_handler)
+    root.setLevel(level)
+    atexit.register(stop_logging)
+
+    structlog.configure(
+        processors=request_processors(sampler),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+
+
+def stop_logging() -> None:
+    """Write out the queued events and stop the writer thread (also run at exit)."""
+    global _handler, _listener
+    atexit.unregister(stop_logging)
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+
+
+def dropped_events() -> int:
+    """Events dropped because the queue was full, since configure_logging()."""
+    return _handler.dropped if _handler is not None else 0
@@ -0,0 +1,93 @@
+"""
+Prometheus metrics of the API, the services and the database pool.
+
+With several workers set PROMETHEUS_MULTIPROC_DIR to an empty directory
+shared by them: each worker then writes its samples to memory-mapped files
+there and /metrics aggregates all workers, whichever one answers.
+"""
+import os
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+# HTTP
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+# Database pool
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time waiting for a pooled database connection, including opening new ones",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_CONNECTIONS_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Database connections checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONNECTIONS_OPEN = Gauge(
+    "db_pool_connections_open",
+    "Database connections opened by the pool and not yet closed",
+    multiprocess_mode="livesum",
+)
+
+# Business
+ORDERS_CREATED = Counter("orders_created_total", "Orders created")
+STOCK_REJECTIONS = Counter(
+    "order_stock_rejections_total",
+    "Order lines or orders rejected for lack of stock, at the check or at the reservation UPDATE",
+    ["stage"],
+)
+IDEMPOTENCY_HITS = Counter("idempotency_hits_total", "Order requests answered from an Idempotency-Key")
+GROUP_COMMIT_BATCH_SIZE = Histogram(
+    "order_group_commit_batch_size",
+    "Orders per group commit, failed ones included",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+)
+GROUP_COMMIT_SECONDS = Histogram(
+    "order_group_commit_seconds",
+    "Duration of the COMMIT of a group commit batch",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+
+# Logging
+LOG_EVENTS_DROPPED = Counter("log_events_dropped_total", "Log events dropped because the writer queue was full")
+
+
+def instrument_pool(engine: Engine) -> None:
+    """Track the connections in use and open in an engine's pool."""
+    event.listen(engine, "checkout", lambda *args: DB_POOL_CONNECTIONS_IN_USE.inc())
+    event.listen(engine, "checkin", lambda *args: DB_POOL_CONNECTIONS_IN_USE.dec())
+    event.listen(engine, "connect", lambda *args: DB_POOL_CONNECTIONS_OPEN.inc())
+    event.listen(engine, "close", lambda *args: DB_POOL_CONNECTIONS_OPEN.dec())
+    event.listen(engine, "close_detached", lambda *args: DB_POOL_CONNECTIONS_OPEN.dec())
+
+
+def render_metrics() -> bytes:
+    """Render all metrics in the Prometheus text format, across workers when multiprocess."""
+    if not MULTIPROCESS:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the multiprocess aggregation."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
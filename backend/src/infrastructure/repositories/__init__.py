@@ -1,5 +1,31 @@
 from .product_repository import ProductRepository
 from .customer_repository import CustomerRepository
 from .order_repository import OrderRepository
+from .idempotency_repository import IdempotencyRepository
+from .stats_repository import StatsRepository
+from .async_product_repository import AsyncProductRepository
+from .async_customer_repository import AsyncCustomerRepository
+from .async_order_repository import AsyncOrderRepository
+from .async_idempotency_repository import AsyncIdempotencyRepository
+from .async_stats_repository import AsyncStatsRepository
+from .counting import RowCountCache
+from .fields import check_fields
+from .product_cache import ProductCache, start_product_cache_listener, stop_product_cache_listener
 
-__all__ = ["ProductRepository", "CustomerRepository", "OrderRepository"]
+__all__ = [
+    "ProductRepository",
+    "CustomerRepository",
+    "OrderRepository",
+    "IdempotencyRepository",
+    "StatsRepository",
+    "AsyncProductRepository",
+    "AsyncCustomerRepository",
+    "AsyncOrderRepository",
+    "AsyncIdempotencyRepository",
+    "AsyncStatsRepository",
+    "RowCountCache",
+    "check_fields",
+    "ProductCache",
+    "start_product_cache_listener",
+    "stop_product_cache_listener",
+]
@@ -0,0 +1,151 @@
+from typing import AsyncIterator, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.infrastructure.database.models import CustomerModel
+from src.domain.entities import Customer
+from .customer_repository import CustomerRepository
+from .counting import async_page_total, check_count_mode, count_key, page_statement
+from .fields import check_fields, field_columns, row_dicts
+
+
+class AsyncCustomerRepository:
+    """Async repository for Customer entity, sharing statements with CustomerRepository."""
+
+    _to_entity = staticmethod(CustomerRepository._to_entity)
+    next_cursor = staticmethod(CustomerRepository.next_cursor)
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, customer: Customer) -> Customer:
+        """Create a new customer."""
+        db_customer = CustomerModel(
+            name=customer.name,
+            email=customer.email,
+            document=customer.document,
+        )
+        self.db.add(db_customer)
+        await self.db.commit()
+        await self.db.refresh(db_customer)
+        return self._to_entity(db_customer)
+
+    async def get_by_id(self, customer_id: int) -> Optional[Customer]:
+        """Get customer by ID."""
+        db_customer = await self.db.scalar(select(CustomerModel).where(CustomerModel.id == customer_id))
+        return self._to_entity(db_customer) if db_customer else None
+
+    async def get_by_email(self, email: str) -> Optional[Customer]:
+        """Get customer by email."""
+        db_customer = await self.db.scalar(select(CustomerModel).where(CustomerModel.email == email))
+        return self._to_entity(db_customer) if db_customer else None
+
+    async def get_by_document(self, document: str) -> Optional[Customer]:
+        """Get customer by document."""
+        db_customer = await self.db.scalar(select(CustomerModel).where(CustomerModel.document == document))
+        return self._to_entity(db_customer) if db_customer else None
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Customer], Optional[int]]:
+        """Get all customers with pagination and filters."""
+        check_count_mode(count)
+        stmt = CustomerRepository._list_statement(search)
+
+        # Apply ordering and pagination (keyset when a cursor is given); an
+        # exact total is fetched with the page in the same query
+        ordered = CustomerRepository._order_statement(stmt, order_by, order_dir, cursor)
+        rows = (await self.db.execute(page_statement(ordered, stmt, skip, limit, cursor, count))).all()
+
+        total = await async_page_total(self.db, stmt, rows, count, count_key("customers", search=search))
+        return [self._to_entity(row[0]) for row in rows], total
+
+    async def get_fields_by_id(self, customer_id: int, fields: List[str]) -> Optional[dict]:
+        """Get only `fields` of a customer (plus id and version), as a dict."""
+        check_fields(fields, CustomerRepository.FIELDS)
+        columns = field_columns(CustomerModel, fields)
+        row = (await self.db.execute(CustomerRepository._fields_by_id_statement(customer_id, columns))).first()
+        return row_dicts([row], columns)[0] if row else None
+
+    async def get_all_fields(
+        self,
+        fields: List[str],
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[dict], Optional[int]]:
+        """Get only `fields` of the customers get_all would return, as dicts."""
+        check_count_mode(count)
+        check_fields(fields, CustomerRepository.FIELDS)
+        stmt = CustomerRepository._list_statement(search)
+        columns = field_columns(CustomerModel, fields, order_by)
+        ordered = CustomerRepository._order_statement(stmt, order_by, order_dir, cursor)
+        page = page_statement(ordered.with_only_columns(*columns), stmt, skip, limit, cursor, count)
+        rows = (await self.db.execute(page)).all()
+
+        total = await async_page_total(self.db, stmt, rows, count, count_key("customers", search=search))
+        return row_dicts(rows, columns), total
+
+    async def get_version(self, customer_id: int) -> Optional[int]:
+        """Get the row version of a customer without loading it."""
+        return await self.db.scalar(CustomerRepository._version_statement(customer_id))
+
+    async def get_page_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Tuple[int, int]], Optional[int]]:
+        """Get (id, version) of a page and the total (see CustomerRepository.get_page_versions)."""
+        check_count_mode(count)
+        stmt = CustomerRepository._list_statement(search)
+        ordered = CustomerRepository._order_statement(stmt, order_by, order_dir, cursor)
+        page = page_statement(ordered.with_only_columns(CustomerModel.id, CustomerModel.version), stmt, skip, limit, cursor, count)
+        rows = (await self.db.execute(page)).all()
+
+        total = await async_page_total(self.db, stmt, rows, count, count_key("customers", search=search))
+        return [(row.id, row.version) for row in rows], total
+
+    async def stream(self, search: Optional[str] = None, batch_size: int = 1000) -> AsyncIterator[Customer]:
+        """Yield every matching customer in id order (see CustomerRepository.stream)."""
+        result = await self.db.stream_scalars(CustomerRepository._export_statement(search, batch_size))
+        async for db_customer in result:
+            yield self._to_entity(db_customer)
+
+    async def update(self, customer: Customer) -> Customer:
+        """Update an existing customer."""
+        db_customer = await self.db.get(CustomerModel, customer.id)
+        if not db_customer:
+            raise ValueError(f"Customer with id {customer.id} not found")
+
+        db_customer.name = customer.name
+        db_customer.email = customer.email
+        db_customer.document = customer.document
+
+        await self.db.commit()
+        await self.db.refresh(db_customer)
+        return self._to_entity(db_customer)
+
+    async def delete(self, customer_id: int) -> bool:
+        """Delete a customer."""
+        db_customer = await self.db.get(CustomerModel, customer_id)
+        if not db_customer:
+            return False
+
+        await self.db.delete(db_customer)
+        await self.db.commit()
+        return True
@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.infrastructure.database.models import IdempotencyKeyModel
+from .idempotency_repository import COMPLETED, PENDING
+
+
+class AsyncIdempotencyRepository:
+    """Async repository for idempotency keys (see IdempotencyRepository)."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_order_id(self, key: str, now: datetime) -> Optional[tuple[int, datetime]]:
+        """Get the order ID and expiry of a completed, unexpired key."""
+        row = (
+            await self.db.execute(
+                select(IdempotencyKeyModel.order_id, IdempotencyKeyModel.expires_at).where(
+                    IdempotencyKeyModel.key == key,
+                    IdempotencyKeyModel.status == COMPLETED,
+                    IdempotencyKeyModel.expires_at > now,
+                )
+            )
+        ).first()
+        return (row.order_id, row.expires_at) if row else None
+
+    async def claim(self, key: str, now: datetime, expires_at: datetime) -> bool:
+        """Claim a key by inserting a PENDING row, taking over an expired one."""
+        for _ in range(2):
+            try:
+                self.db.add(IdempotencyKeyModel(key=key, status=PENDING, expires_at=expires_at))
+                await self.db.commit()
+                return True
+            except IntegrityError:
+                await self.db.rollback()
+
+            result = await self.db.execute(
+                delete(IdempotencyKeyModel).where(
+                    IdempotencyKeyModel.key == key, IdempotencyKeyModel.expires_at <= now
+                )
+            )
+            await self.db.commit()
+            if not result.rowcount:
+                return False
+        return False
+
+    async def complete(self, key: str, order_id: int, expires_at: datetime) -> None:
+        """Mark a claimed key as completed. Does not commit."""
+        await self.db.execute(
+            update(IdempotencyKeyModel)
+            .where(IdempotencyKeyModel.key == key)
+            .values(status=COMPLETED, order_id=order_id, expires_at=expires_at)
+        )
+
+    async def delete(self, key: str) -> None:
+        """Delete a key, e.g. after the request holding it failed."""
+        await self.db.execute(delete(IdempotencyKeyModel).where(IdempotencyKeyModel.key == key))
+        await self.db.commit()
+
+    async def purge_expired(self, now: datetime) -> int:
+        """Delete every expired key and return how many were removed."""
+        result = await self.db.execute(
+            delete(IdempotencyKeyModel).where(IdempotencyKeyModel.expires_at <= now)
+        )
+        await self.db.commit()
+        return result.rowcount
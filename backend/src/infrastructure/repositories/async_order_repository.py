@@ -0,0 +1,169 @@
+from typing import AsyncIterator, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.infrastructure.database.models import OrderModel, OrderItemModel
+from src.domain.entities import Order
+from .order_repository import OrderRepository
+from .counting import async_page_total, check_count_mode, count_key, page_statement
+from .fields import check_fields, field_columns, row_dicts
+
+
+class AsyncOrderRepository:
+    """Async repository for Order entity, sharing statements with OrderRepository."""
+
+    _to_entity = staticmethod(OrderRepository._to_entity)
+    next_cursor = staticmethod(OrderRepository.next_cursor)
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, order: Order, commit: bool = True) -> Order:
+        """
+        Create a new order with items.
+
+        With commit=False the order is only flushed, leaving the surrounding
+        transaction to the caller.
+        """
+        db_order = OrderModel(
+            customer_id=order.customer_id,
+            total_amount=order.total_amount,
+            status=order.status,
+            items=[
+                OrderItemModel(
+                    product_id=item.product_id,
+                    unit_price=item.unit_price,
+                    quantity=item.quantity,
+                    line_total=item.line_total,
+                )
+                for item in order.items
+            ],
+        )
+        self.db.add(db_order)
+
+        if commit:
+            await self.db.commit()
+        else:
+            # Server defaults come back through INSERT ... RETURNING
+            await self.db.flush()
+        return self._to_entity(db_order)
+
+    async def get_by_id(self, order_id: int, for_update: bool = False) -> Optional[Order]:
+        """Get order by ID with items, optionally locking the order row."""
+        db_order = (await self.db.scalars(OrderRepository._by_id_statement(order_id, for_update))).first()
+        return self._to_entity(db_order) if db_order else None
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        customer_id: Optional[int] = None,
+        status: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Order], Optional[int]]:
+        """Get all orders with pagination and filters."""
+        check_count_mode(count)
+        stmt = OrderRepository._list_statement(customer_id, status)
+
+        # Apply ordering and pagination (keyset when a cursor is given); an
+        # exact total is fetched with the page in the same query
+        ordered = OrderRepository._order_statement(stmt, order_by, order_dir, cursor)
+        page = page_statement(ordered, stmt, skip, limit, cursor, count)
+        rows = (await self.db.execute(OrderRepository._with_items(page))).all()
+
+        total = await async_page_total(self.db, stmt, rows, count, count_key("orders", customer_id=customer_id, status=status))
+        return [self._to_entity(row[0]) for row in rows], total
+
+    async def get_fields_by_id(self, order_id: int, fields: List[str]) -> Optional[dict]:
+        """Get only `fields` of an order (plus id and version), as a dict; items only if requested."""
+        check_fields(fields, OrderRepository.FIELDS)
+        columns = field_columns(OrderModel, fields)
+        row = (await self.db.execute(OrderRepository._fields_by_id_statement(order_id, columns))).first()
+        if not row:
+            return None
+        orders = row_dicts([row], columns)
+        if "items" in fields:
+            OrderRepository._attach_items(orders, (await self.db.execute(OrderRepository._items_statement([order_id]))).all())
+        return orders[0]
+
+    async def get_all_fields(
+        self,
+        fields: List[str],
+        skip: int = 0,
+        limit: int = 100,
+        customer_id: Optional[int] = None,
+        status: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[dict], Optional[int]]:
+        """Get only `fields` of the orders get_all would return, as dicts; items only if requested."""
+        check_count_mode(count)
+        check_fields(fields, OrderRepository.FIELDS)
+        stmt = OrderRepository._list_statement(customer_id, status)
+        columns = field_columns(OrderModel, fields, order_by)
+        ordered = OrderRepository._order_statement(stmt, order_by, order_dir, cursor)
+        page = page_statement(ordered.with_only_columns(*columns), stmt, skip, limit, cursor, count)
+        rows = (await self.db.execute(page)).all()
+
+        total = await async_page_total(self.db, stmt, rows, count, count_key("orders", customer_id=customer_id, status=status))
+        orders = row_dicts(rows, columns)
+        if "items" in fields and orders:
+            item_rows = (await self.db.execute(OrderRepository._items_statement([o["id"] for o in orders]))).all()
+            OrderRepository._attach_items(orders, item_rows)
+        return orders, total
+
+    async def get_version(self, order_id: int) -> Optional[int]:
+        """Get the row version of a order without loading it."""
+        return await self.db.scalar(OrderRepository._version_statement(order_id))
+
+    async def get_page_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        customer_id: Optional[int] = None,
+        status: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Tuple[int, int]], Optional[int]]:
+        """Get (id, version) of a page and the total (see OrderRepository.get_page_versions)."""
+        check_count_mode(count)
+        stmt = OrderRepository._list_statement(customer_id, status)
+        ordered = OrderRepository._order_statement(stmt, order_by, order_dir, cursor)
+        page = page_statement(ordered.with_only_columns(OrderModel.id, OrderModel.version), stmt, skip, limit, cursor, count)
+        rows = (await self.db.execute(page)).all()
+
+        total = await async_page_total(self.db, stmt, rows, count, count_key("orders", customer_id=customer_id, status=status))
+        return [(row.id, row.version) for row in rows], total
+
+    async def stream(self, customer_id: Optional[int] = None, status: Optional[str] = None, batch_size: int = 1000) -> AsyncIterator[Order]:
+        """Yield every matching order in id order (see OrderRepository.stream)."""
+        result = await self.db.stream_scalars(OrderRepository._export_statement(customer_id, status, batch_size))
+        async for db_order in result:
+            yield self._to_entity(db_order)
+
+    async def update(self, order: Order) -> Order:
+        """Update an existing order."""
+        db_order = (await self.db.scalars(OrderRepository._by_id_statement(order.id))).first()
+        if not db_order:
+            raise ValueError(f"Order with id {order.id} not found")
+
+        db_order.status = order.status
+        db_order.total_amount = order.total_amount
+
+        await self.db.commit()
+        return self._to_entity(db_order)
+
+    async def delete(self, order_id: int) -> bool:
+        """Delete an order."""
+        db_order = (await self.db.scalars(OrderRepository._by_id_statement(order_id))).first()
+        if not db_order:
+            return False
+
+        await self.db.delete(db_order)
+        await self.db.commit()
+        return True
@@ -0,0 +1,189 @@
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.infrastructure.database.models import ProductModel
+from src.domain.entities import Product
+from .product_repository import ProductRepository
+from .counting import async_page_total, check_count_mode, count_key, page_statement
+from .fields import check_fields, field_columns, row_dicts
+from .product_cache import ProductCache
+
+
+class AsyncProductRepository:
+    """Async repository for Product entity, sharing statements with ProductRepository."""
+
+    _to_entity = staticmethod(ProductRepository._to_entity)
+    next_cursor = staticmethod(ProductRepository.next_cursor)
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, product: Product) -> Product:
+        """Create a new product."""
+        db_product = ProductModel(
+            name=product.name,
+            sku=product.sku,
+            price=product.price,
+            stock_qty=product.stock_qty,
+            is_active=product.is_active,
+        )
+        self.db.add(db_product)
+        await self.db.commit()
+        await self.db.refresh(db_product)
+        return self._to_entity(db_product)
+
+    async def get_by_id(self, product_id: int) -> Optional[Product]:
+        """Get product by ID."""
+        db_product = await self.db.scalar(select(ProductModel).where(ProductModel.id == product_id))
+        return self._to_entity(db_product) if db_product else None
+
+    async def get_fields_by_id(self, product_id: int, fields: List[str]) -> Optional[dict]:
+        """Get only `fields` of a product (plus id and version), as a dict."""
+        check_fields(fields, ProductRepository.FIELDS)
+        columns = field_columns(ProductModel, fields)
+        row = (await self.db.execute(ProductRepository._fields_by_id_statement(product_id, columns))).first()
+        return row_dicts([row], columns)[0] if row else None
+
+    async def get_by_sku(self, sku: str) -> Optional[Product]:
+        """Get product by SKU."""
+        db_product = await self.db.scalar(select(ProductModel).where(ProductModel.sku == sku))
+        return self._to_entity(db_product) if db_product else None
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Product], Optional[int]]:
+        """Get all products with pagination and filters."""
+        check_count_mode(count)
+        stmt = ProductRepository._list_statement(search, is_active)
+
+        # Apply ordering and pagination (keyset when a cursor is given); an
+        # exact total is fetched with the page in the same query
+        ordered = ProductRepository._order_statement(stmt, order_by, order_dir, cursor, search)
+        rows = (await self.db.execute(page_statement(ordered, stmt, skip, limit, cursor, count))).all()
+
+        total = await async_page_total(self.db, stmt, rows, count, count_key("products", search=search, is_active=is_active))
+        return [self._to_entity(row[0]) for row in rows], total
+
+    async def get_all_fields(
+        self,
+        fields: List[str],
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[dict], Optional[int]]:
+        """Get only `fields` of the products get_all would return, as dicts."""
+        check_count_mode(count)
+        check_fields(fields, ProductRepository.FIELDS)
+        stmt = ProductRepository._list_statement(search, is_active)
+        columns = field_columns(ProductModel, fields, order_by)
+        ordered = ProductRepository._order_statement(stmt, order_by, order_dir, cursor, search)
+        page = page_statement(ordered.with_only_columns(*columns), stmt, skip, limit, cursor, count)
+        rows = (await self.db.execute(page)).all()
+
+        total = await async_page_total(self.db, stmt, rows, count, count_key("products", search=search, is_active=is_active))
+        return row_dicts(rows, columns), total
+
+    async def get_version(self, product_id: int) -> Optional[int]:
+        """Get the row version of a product without loading it."""
+        return await self.db.scalar(ProductRepository._version_statement(product_id))
+
+    async def get_page_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Tuple[int, int]], Optional[int]]:
+        """Get (id, version) of a page and the total (see ProductRepository.get_page_versions)."""
+        check_count_mode(count)
+        stmt = ProductRepository._list_statement(search, is_active)
+        ordered = ProductRepository._order_statement(stmt, order_by, order_dir, cursor, search)
+        page = page_statement(ordered.with_only_columns(ProductModel.id, ProductModel.version), stmt, skip, limit, cursor, count)
+        rows = (await self.db.execute(page)).all()
+
+        total = await async_page_total(self.db, stmt, rows, count, count_key("products", search=search, is_active=is_active))
+        return [(row.id, row.version) for row in rows], total
+
+    async def stream(self, search: Optional[str] = None, is_active: Optional[bool] = None, batch_size: int = 1000) -> AsyncIterator[Product]:
+        """Yield every matching product in id order (see ProductRepository.stream)."""
+        result = await self.db.stream_scalars(ProductRepository._export_statement(search, is_active, batch_size))
+        async for db_product in result:
+            yield self._to_entity(db_product)
+
+    async def update(self, product: Product) -> Product:
+        """Update an existing product."""
+        db_product = await self.db.get(ProductModel, product.id)
+        if not db_product:
+            raise ValueError(f"Product with id {product.id} not found")
+
+        db_product.name = product.name
+        db_product.sku = product.sku
+        db_product.price = product.price
+        db_product.stock_qty = product.stock_qty
+        db_product.is_active = product.is_active
+
+        await self.db.commit()
+        await self.db.refresh(db_product)
+        return self._to_entity(db_product)
+
+    async def delete(self, product_id: int) -> bool:
+        """Delete a product."""
+        db_product = await self.db.get(ProductModel, product_id)
+        if not db_product:
+            return False
+
+        await self.db.delete(db_product)
+        await self.db.commit()
+        return True
+
+    async def get_by_ids(self, product_ids: List[int], for_update: bool = False) -> List[Product]:
+        """Get multiple products by their IDs, optionally locking them in id order."""
+        stmt = ProductRepository._by_ids_statement(product_ids, for_update)
+        db_products = (await self.db.scalars(stmt)).all()
+        return [self._to_entity(p) for p in db_products]
+
+    async def reserve_stock(self, quantities: Dict[int, int]) -> bool:
+        """Decrement stock with one conditional UPDATE (see ProductRepository.reserve_stock)."""
+        if not quantities:
+            return True
+
+        result = await self.db.execute(ProductRepository._reserve_stock_statement(quantities))
+        return result.rowcount == len(quantities)
+
+    async def resolve(self, product_ids: List[int], skus: List[str]) -> Dict[int, str]:
+        """Map the given product ids and SKUs that exist to id -> sku."""
+        return dict((await self.db.execute(ProductRepository._resolve_statement(product_ids, skus))).all())
+
+    async def adjust_stock(self, deltas: Dict[int, int], levels: Dict[int, int]) -> Dict[int, int]:
+        """Apply stock deltas and levels in one UPDATE (see ProductRepository.adjust_stock)."""
+        if not deltas and not levels:
+            return {}
+        return dict((await self.db.execute(ProductRepository._adjust_stock_statement(deltas, levels))).all())
+
+    async def upsert_by_sku(self, products: List[Product], update_active: bool = True) -> Tuple[Dict[str, int], List[int]]:
+        """Insert or update products by SKU (see ProductRepository.upsert_by_sku)."""
+        existing = dict((await self.db.execute(ProductRepository._skus_statement([p.sku for p in products]))).all())
+        stmt = ProductRepository._upsert_statement(self.db.get_bind().dialect.name, update_active)
+        return existing, list(await self.db.scalars(stmt, ProductRepository._upsert_rows(products)))
+
+    async def announce_changes(self, product_ids: Iterable[int] = (), catalog: bool = False) -> None:
+        """Announce a product cache invalidation (see ProductRepository.announce_changes)."""
+        if ProductCache.enabled and self.db.get_bind().dialect.name == "postgresql":
+            await self.db.execute(ProductCache.notify_statement(product_ids, catalog))
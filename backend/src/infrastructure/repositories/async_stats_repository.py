@@ -0,0 +1,39 @@
+from typing import List, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.domain.entities import Order, OrderStatus, Product
+from .product_repository import ProductRepository
+from .stats_repository import StatsRepository
+
+
+class AsyncStatsRepository:
+    """Async repository for dashboard aggregates, sharing statements with StatsRepository."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add_orders(self, orders: List[Order], sign: int = 1) -> None:
+        """Count or discount orders in the rollup (see StatsRepository.add_orders)."""
+        if orders:
+            dialect_name = self.db.get_bind().dialect.name
+            await self.db.execute(StatsRepository._add_orders_statement(dialect_name, [order.id for order in orders], sign))
+
+    async def move_order(self, order: Order, previous_status: OrderStatus) -> None:
+        """Move an order from its previous status to its current one. Does not commit."""
+        if OrderStatus(previous_status) != OrderStatus(order.status):
+            dialect_name = self.db.get_bind().dialect.name
+            await self.db.execute(StatsRepository._move_order_statement(dialect_name, order.id, previous_status, order.status))
+
+    async def order_totals(self) -> List[Tuple[OrderStatus, int, float]]:
+        """Return (status, order count, revenue) summed over the rollup."""
+        result = await self.db.execute(StatsRepository._order_totals_statement())
+        return [tuple(row) for row in result.all()]
+
+    async def catalog_totals(self, low_stock_threshold: int) -> Tuple[int, int, int, int]:
+        """Return (products, active products, low-stock products, customers)."""
+        result = await self.db.execute(StatsRepository._catalog_totals_statement(low_stock_threshold))
+        return tuple(result.one())
+
+    async def low_stock_products(self, low_stock_threshold: int, limit: int) -> List[Product]:
+        """Return the products with the least stock below the threshold."""
+        db_products = (await self.db.scalars(StatsRepository._low_stock_statement(low_stock_threshold, limit))).all()
+        return [ProductRepository._to_entity(p) for p in db_products]
@@ -0,0 +1,193 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+COUNT_MODES = ("exact", "estimated", "none")
+COUNT_CACHE_TTL_SECONDS = float(os.getenv("COUNT_CACHE_TTL_SECONDS", "60"))
+
+
+class RowCountCache:
+    """
+    Process-wide cache of list totals used by count=estimated.
+
+    Keys are (table, filters...). Unfiltered totals are kept current by the
+    services through adjust(); filtered totals simply expire after the TTL.
+    """
+
+    _counts: Dict[Tuple, Tuple[int, float]] = {}
+    _lock = threading.Lock()
+    ttl = COUNT_CACHE_TTL_SECONDS
+
+    @classmethod
+    def get(cls, key: Tuple) -> Optional[int]:
+        """Return a cached total that has not expired."""
+        with cls._lock:
+            cached = cls._counts.get(key)
+            if cached and cached[1] > time.monotonic():
+                return cached[0]
+        return None
+
+    @classmethod
+    def set(cls, key: Tuple, total: int) -> None:
+        """Cache a freshly computed total."""
+        with cls._lock:
+            cls._counts[key] = (total, time.monotonic() + cls.ttl)
+
+    @classmethod
+    def adjust(cls, table: str, delta: int) -> None:
+        """Apply rows created (+) or deleted (-) to the cached unfiltered total."""
+        key = count_key(table)
+        with cls._lock:
+            cached = cls._counts.get(key)
+            if cached:
+                cls._counts[key] = (max(cached[0] + delta, 0), cached[1])
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop every cached total."""
+        with cls._lock:
+            cls._counts.clear()
+
+
+def count_key(table: str, **filters: Any) -> Tuple:
+    """Build the cache key of a filtered list; filters set to None are ignored."""
+    return (table,) + tuple(sorted((k, str(v)) for k, v in filters.items() if v is not None))
+
+
+def check_count_mode(count: str) -> None:
+    """Reject unknown count modes."""
+    if count not in COUNT_MODES:
+        raise ValueError(f"Invalid count mode: {count}. Use one of: {', '.join(COUNT_MODES)}")
+
+
+def with_total_count(page: Select, stmt: Select, cursor: Optional[str] = None) -> Select:
+    """
+    Add the filtered total of `stmt` to every row of `page`.
+
+    Offset pages use COUNT(*) OVER (), which is evaluated before LIMIT and
+    OFFSET. A cursor page is already narrowed by the keyset predicate, so the
+    total comes from a scalar subquery over the unpaged statement instead.
+    Either way the page and the exact total share one round trip.
+    """
+    if cursor:
+        return page.add_columns(count_statement(stmt).scalar_subquery().label("total_count"))
+    return page.add_columns(func.count().over().label("total_count"))
+
+
+def page_statement(
+    ordered: Select,
+    stmt: Select,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    count: str
+) -> Select:
+    """
+    Limit an ordered statement to one page (keyset when a cursor is given).
+
+    With count="exact" the total of the filtered `stmt` is added to the
+    rows, so the page and the total share one query.
+    """
+    page = ordered.limit(limit)
+    if not cursor:
+        page = page.offset(skip)
+    if count == "exact":
+        page = with_total_count(page, stmt, cursor)
+    return page
+
+
+def count_statement(stmt: Select) -> Select:
+    """Build a COUNT(*) over a filtered SELECT."""
+    return select(func.count()).select_from(stmt.order_by(None).subquery())
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a SELECT, whose top plan node holds the planner's row estimate."""
+
+    inherit_cache = False
+
+    def __init__(self, stmt: Select):
+        self.stmt = stmt
+
+
+@compiles(Explain)
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    # The SELECT is compiled in place, so its values stay bound parameters
+    # (search terms are never spliced into the SQL)
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.stmt, **kw)}"
+
+
+def plan_rows(plan: Any) -> int:
+    """Read the estimated row count from EXPLAIN (FORMAT JSON) output."""
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _uses_planner(db_dialect, key: Tuple) -> bool:
+    """Filtered lists on PostgreSQL are estimated by the planner; the rest by the cache."""
+    return db_dialect.name == "postgresql" and len(key) > 1
+
+
+def _exact_total(rows: Sequence[Any]) -> Optional[int]:
+    """Return the windowed total carried by the page, if the page has rows."""
+    return rows[0].total_count if rows else None
+
+
+def page_total(db: Session, stmt: Select, rows: Sequence[Any], count: str, key: Tuple) -> Optional[int]:
+    """
+    Resolve the total of a list page for the requested count mode.
+
+    `stmt` is the filtered SELECT without ordering or paging and `rows` the
+    page fetched with with_total_count() when count is "exact".
+    """
+    if count == "none":
+        return None
+
+    if count == "exact":
+        total = _exact_total(rows)
+        # An empty page carries no window value (e.g. skip past the end)
+        return total if total is not None else db.scalar(count_statement(stmt))
+
+    dialect = db.get_bind().dialect
+    if _uses_planner(dialect, key):
+        return plan_rows(db.scalar(Explain(stmt)))
+
+    total = RowCountCache.get(key)
+    if total is None:
+        total = db.scalar(count_statement(stmt))
+        RowCountCache.set(key, total)
+    return total
+
+
+async def async_page_total(
+    db: AsyncSession,
+    stmt: Select,
+    rows: Sequence[Any],
+    count: str,
+    key: Tuple
+) -> Optional[int]:
+    """Async counterpart of page_total."""
+    if count == "none":
+        return None
+
+    if count == "exact":
+        total = _exact_total(rows)
+        return total if total is not None else await db.scalar(count_statement(stmt))
+
+    dialect = db.get_bind().dialect
+    if _uses_planner(dialect, key):
+        return plan_rows(await db.scalar(Explain(stmt)))
+
+    total = RowCountCache.get(key)
+    if total is None:
+        total = await db.scalar(count_statement(stmt))
+        RowCountCache.set(key, total)
+    return total
@@ -1,13 +1,19 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import Select, or_, select
 from src.infrastructure.database.models import CustomerModel
 from src.domain.entities import Customer
+from .pagination import apply_ordering, build_next_cursor
+from .counting import check_count_mode, count_key, page_statement, page_total
+from .fields import check_fields, field_columns, row_dicts
 
 
 class CustomerRepository:
     """Repository for Customer entity."""
 
+    # Fields of the API representation, selectable with ?fields=
+    FIELDS = ("id", "name", "email", "document", "created_at")
+
     def __init__(self, db: Session):
         self.db = db
 
@@ -28,6 +34,18 @@ class CustomerRepository:
         db_customer = self.db.query(CustomerModel).filter(CustomerModel.id == customer_id).first()
         return self._to_entity(db_customer) if db_customer else None
 
+    def get_fields_by_id(self, customer_id: int, fields: List[str]) -> Optional[dict]:
+        """Get only `fields` of a customer (plus id and version), as a dict."""
+        check_fields(fields, self.FIELDS)
+        columns = field_columns(CustomerModel, fields)
+        row = self.db.execute(self._fields_by_id_statement(customer_id, columns)).first()
+        return row_dicts([row], columns)[0] if row else None
+
+    def get_by_ids(self, customer_ids: List[int]) -> List[Customer]:
+        """Get multiple customers by their IDs."""
+        db_customers = self.db.query(CustomerModel).filter(CustomerModel.id.in_(customer_ids)).all()
+        return [self._to_entity(c) for c in db_customers]
+
     def get_by_email(self, email: str) -> Optional[Customer]:
         """Get customer by email."""
         db_customer = self.db.query(CustomerModel).filter(CustomerModel.email == email).first()
@@ -44,35 +62,93 @@ class CustomerRepository:
         limit: int = 100,
         search: Optional[str] = None,
         order_by: str = "created_at",
-        order_dir: str = "desc"
-    ) -> tuple[List[Customer], int]:
-        """Get all customers with pagination and filters."""
-        query = self.db.query(CustomerModel)
-
-        # Apply filters
-        if search:
-            query = query.filter(
-                or_(
-                    CustomerModel.name.ilike(f"%{search}%"),
-                    CustomerModel.email.ilike(f"%{search}%"),
-                    CustomerModel.document.ilike(f"%{search}%")
-                )
-            )
-
-        # Get total count
-        total = query.count()
-
-        # Apply ordering
-        order_column = getattr(CustomerModel, order_by, CustomerModel.created_at)
-        if order_dir.lower() == "desc":
-            query = query.order_by(order_column.desc())
-        else:
-            query = query.order_by(order_column.asc())
-
-        # Apply pagination
-        customers = query.offset(skip).limit(limit).all()
-
-        return [self._to_entity(c) for c in customers], total
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Customer], Optional[int]]:
+        """
+        Get all customers with pagination and filters.
+
+        With a cursor the page starts after the cursor's row (keyset
+        pagination) and skip is ignored. `count` is "exact", "estimated"
+        (planner statistics or RowCountCache) or "none" (total is None).
+        """
+        check_count_mode(count)
+        stmt = self._list_statement(search)
+
+        # Apply ordering and pagination (keyset when a cursor is given); an
+        # exact total is fetched with the page in the same query
+        ordered = self._order_statement(stmt, order_by, order_dir, cursor)
+        rows = self.db.execute(page_statement(ordered, stmt, skip, limit, cursor, count)).all()
+
+        total = page_total(self.db, stmt, rows, count, count_key("customers", search=search))
+        return [self._to_entity(row[0]) for row in rows], total
+
+    def get_all_fields(
+        self,
+        fields: List[str],
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[dict], Optional[int]]:
+        """
+        Get only `fields` of the customers get_all would return, as dicts.
+
+        The SELECT lists those columns (plus id, version and the sort column)
+        and the dicts are built from the row tuples, without entities.
+        """
+        check_count_mode(count)
+        check_fields(fields, self.FIELDS)
+        stmt = self._list_statement(search)
+        columns = field_columns(CustomerModel, fields, order_by)
+        ordered = self._order_statement(stmt, order_by, order_dir, cursor)
+        rows = self.db.execute(page_statement(ordered.with_only_columns(*columns), stmt, skip, limit, cursor, count)).all()
+
+        total = page_total(self.db, stmt, rows, count, count_key("customers", search=search))
+        return row_dicts(rows, columns), total
+
+    def get_version(self, customer_id: int) -> Optional[int]:
+        """Get the row version of a customer without loading it."""
+        return self.db.scalar(self._version_statement(customer_id))
+
+    def get_page_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Tuple[int, int]], Optional[int]]:
+        """
+        Get (id, version) of the rows get_all would return, and the total.
+
+        Only two columns per row are read and no entity is built, which is
+        enough to answer a conditional request.
+        """
+        check_count_mode(count)
+        stmt = self._list_statement(search)
+        ordered = self._order_statement(stmt, order_by, order_dir, cursor)
+        page = page_statement(ordered.with_only_columns(CustomerModel.id, CustomerModel.version), stmt, skip, limit, cursor, count)
+        rows = self.db.execute(page).all()
+
+        total = page_total(self.db, stmt, rows, count, count_key("customers", search=search))
+        return [(row.id, row.version) for row in rows], total
+
+    def stream(self, search: Optional[str] = None, batch_size: int = 1000) -> Iterator[Customer]:
+        """
+        Yield every matching customer in id order.
+
+        Rows are fetched `batch_size` at a time through a server-side cursor
+        (yield_per), so memory stays flat whatever the table size.
+        """
+        for db_customer in self.db.scalars(self._export_statement(search, batch_size)):
+            yield self._to_entity(db_customer)
 
     def update(self, customer: Customer) -> Customer:
         """Update an existing customer."""
@@ -98,6 +174,49 @@ class CustomerRepository:
         self.db.commit()
         return True
 
+    @staticmethod
+    def _version_statement(customer_id: int) -> Select:
+        """Build the SELECT of a customer's row version."""
+        return select(CustomerModel.version).where(CustomerModel.id == customer_id)
+
+    @staticmethod
+    def _fields_by_id_statement(customer_id: int, columns: list) -> Select:
+        """Build the SELECT of some columns of one customer."""
+        return select(*columns).where(CustomerModel.id == customer_id)
+
+    @staticmethod
+    def _export_statement(search: Optional[str] = None, batch_size: int = 1000) -> Select:
+        """Build the id-ordered SELECT read by stream(), batch_size rows per fetch."""
+        stmt = CustomerRepository._list_statement(search).order_by(CustomerModel.id)
+        return stmt.execution_options(yield_per=batch_size)
+
+    @staticmethod
+    def _list_statement(search: Optional[str] = None) -> Select:
+        """Build the filtered customer SELECT shared by the sync and async repositories."""
+        stmt = select(CustomerModel)
+
+        # Apply filters
+        if search:
+            stmt = stmt.where(
+                or_(
+                    CustomerModel.name.ilike(f"%{search}%"),
+                    CustomerModel.email.ilike(f"%{search}%"),
+                    CustomerModel.document.ilike(f"%{search}%")
+                )
+            )
+
+        return stmt
+
+    @staticmethod
+    def _order_statement(stmt: Select, order_by: str, order_dir: str, cursor: Optional[str] = None) -> Select:
+        """Apply the requested ordering (and keyset cursor), falling back to created_at."""
+        return apply_ordering(stmt, CustomerModel, order_by, order_dir, cursor)
+
+    @staticmethod
+    def next_cursor(items: List[Customer], order_by: str, limit: int) -> Optional[str]:
+        """Return the keyset cursor for the page following `items`."""
+        return build_next_cursor(CustomerModel, items, order_by, limit)
+
     @staticmethod
     def _to_entity(model: CustomerModel) -> Customer:
         """Convert database model to domain entity."""
@@ -107,4 +226,5 @@ class CustomerRepository:
             email=model.email,
             document=model.document,
             created_at=model.created_at,
+            version=model.version,
         )
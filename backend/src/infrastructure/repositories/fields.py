@@ -0,0 +1,34 @@
+"""
+Sparse fieldsets: SELECT only the columns a client asked for.
+
+Rows come back as dicts built from the result tuples, without ORM objects or
+entities. id and version are always selected (ETags), and so is the sort
+column (next cursor); the API leaves them out unless they were requested.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+from .pagination import resolve_order_column
+
+ALWAYS_SELECTED = ("id", "version")
+
+
+def check_fields(fields: Sequence[str], available: Sequence[str]) -> None:
+    """Reject field names the resource does not have."""
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(available)}")
+
+
+def field_columns(model, fields: Sequence[str], order_by: Optional[str] = None) -> List[Any]:
+    """Columns to select for `fields`: the requested columns, id, version and the sort column."""
+    names = list(ALWAYS_SELECTED)
+    if order_by is not None:
+        names.append(resolve_order_column(model, order_by)[0])
+    names.extend(fields)
+    columns = model.__table__.columns
+    return [getattr(model, name) for name in dict.fromkeys(names) if name in columns]
+
+
+def row_dicts(rows: Sequence[Any], columns: Sequence[Any]) -> List[Dict[str, Any]]:
+    """One dict per row, keyed by column name (without the windowed total)."""
+    names = [column.key for column in columns]
+    return [dict(zip(names, row)) for row in rows]
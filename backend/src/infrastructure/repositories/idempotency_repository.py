@@ -0,0 +1,77 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src.infrastructure.database.models import IdempotencyKeyModel
+
+PENDING = "PENDING"
+COMPLETED = "COMPLETED"
+
+
+class IdempotencyRepository:
+    """Repository for idempotency keys shared by every worker."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_order_id(self, key: str, now: datetime) -> Optional[tuple[int, datetime]]:
+        """Get the order ID and expiry of a completed, unexpired key."""
+        row = (
+            self.db.query(IdempotencyKeyModel.order_id, IdempotencyKeyModel.expires_at)
+            .filter(
+                IdempotencyKeyModel.key == key,
+                IdempotencyKeyModel.status == COMPLETED,
+                IdempotencyKeyModel.expires_at > now,
+            )
+            .first()
+        )
+        return (row.order_id, row.expires_at) if row else None
+
+    def claim(self, key: str, now: datetime, expires_at: datetime) -> bool:
+        """
+        Claim a key for the current request by inserting a PENDING row.
+
+        Commits immediately so other workers see the claim. An expired row
+        holding the key is taken over. Returns False if the key is held.
+        """
+        for _ in range(2):
+            try:
+                self.db.add(IdempotencyKeyModel(key=key, status=PENDING, expires_at=expires_at))
+                self.db.commit()
+                return True
+            except IntegrityError:
+                self.db.rollback()
+
+            expired = (
+                self.db.query(IdempotencyKeyModel)
+                .filter(IdempotencyKeyModel.key == key, IdempotencyKeyModel.expires_at <= now)
+                .delete(synchronize_session=False)
+            )
+            self.db.commit()
+            if not expired:
+                return False
+        return False
+
+    def complete(self, key: str, order_id: int, expires_at: datetime) -> None:
+        """Mark a claimed key as completed. Does not commit."""
+        self.db.query(IdempotencyKeyModel).filter(IdempotencyKeyModel.key == key).update(
+            {"status": COMPLETED, "order_id": order_id, "expires_at": expires_at},
+            synchronize_session=False,
+        )
+
+    def delete(self, key: str) -> None:
+        """Delete a key, e.g. after the request holding it failed."""
+        self.db.query(IdempotencyKeyModel).filter(IdempotencyKeyModel.key == key).delete(
+            synchronize_session=False
+        )
+        self.db.commit()
+
+    def purge_expired(self, now: datetime) -> int:
+        """Delete every expired key and return how many were removed."""
+        deleted = (
+            self.db.query(IdempotencyKeyModel)
+            .filter(IdempotencyKeyModel.expires_at <= now)
+            .delete(synchronize_session=False)
+        )
+        self.db.commit()
+        return deleted
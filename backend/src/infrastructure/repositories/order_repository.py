@@ -1,49 +1,107 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import Select, insert, select
+from sqlalchemy.orm import Session, selectinload
 from src.infrastructure.database.models import OrderModel, OrderItemModel
 from src.domain.entities import Order, OrderItem
+from .pagination import apply_ordering, build_next_cursor
+from .counting import check_count_mode, count_key, page_statement, page_total
+from .fields import check_fields, field_columns, row_dicts
 
 
 class OrderRepository:
     """Repository for Order entity."""
 
+    # Fields of the API representation, selectable with ?fields=
+    FIELDS = ("id", "customer_id", "total_amount", "status", "created_at", "items")
+
     def __init__(self, db: Session):
         self.db = db
 
-    def create(self, order: Order) -> Order:
-        """Create a new order with items."""
-        # Create order
+    def create(self, order: Order, commit: bool = True) -> Order:
+        """
+        Create a new order with items.
+
+        With commit=False the order is only flushed, leaving the surrounding
+        transaction to the caller.
+        """
         db_order = OrderModel(
             customer_id=order.customer_id,
             total_amount=order.total_amount,
             status=order.status,
+            items=[
+                OrderItemModel(
+                    product_id=item.product_id,
+                    unit_price=item.unit_price,
+                    quantity=item.quantity,
+                    line_total=item.line_total,
+                )
+                for item in order.items
+            ],
         )
         self.db.add(db_order)
-        self.db.flush()  # Flush to get the order ID
 
-        # Create order items
-        for item in order.items:
-            db_item = OrderItemModel(
-                order_id=db_order.id,
-                product_id=item.product_id,
-                unit_price=item.unit_price,
-                quantity=item.quantity,
-                line_total=item.line_total,
-            )
-            self.db.add(db_item)
-
-        self.db.commit()
-        self.db.refresh(db_order)
+        if commit:
+            self.db.commit()
+            self.db.refresh(db_order)
+        else:
+            # Flush order and items together; server defaults are loaded on access
+            self.db.flush()
         return self._to_entity(db_order)
 
-    def get_by_id(self, order_id: int) -> Optional[Order]:
-        """Get order by ID with items."""
-        db_order = (
-            self.db.query(OrderModel)
-            .options(joinedload(OrderModel.items))
-            .filter(OrderModel.id == order_id)
-            .first()
-        )
+    def create_many(self, orders: List[Order]) -> List[Order]:
+        """
+        Insert several orders and their items with multi-row INSERTs.
+
+        Issues one INSERT ... RETURNING for the orders and one for all items,
+        filling the generated ids and timestamps back into the given entities.
+        Does not commit; the caller owns the transaction.
+        """
+        if not orders:
+            return []
+
+        order_rows = self.db.execute(
+            insert(OrderModel).returning(
+                OrderModel.id, OrderModel.created_at, sort_by_parameter_order=True
+            ),
+            [
+                {
+                    "customer_id": order.customer_id,
+                    "total_amount": order.total_amount,
+                    "status": order.status,
+                }
+                for order in orders
+            ],
+        ).all()
+
+        items = []
+        for order, (order_id, created_at) in zip(orders, order_rows):
+            order.id = order_id
+            order.created_at = created_at
+            for item in order.items:
+                item.order_id = order_id
+                items.append(item)
+
+        item_rows = self.db.execute(
+            insert(OrderItemModel).returning(OrderItemModel.id, sort_by_parameter_order=True),
+            [
+                {
+                    "order_id": item.order_id,
+                    "product_id": item.product_id,
+                    "unit_price": item.unit_price,
+                    "quantity": item.quantity,
+                    "line_total": item.line_total,
+                }
+                for item in items
+            ],
+        ).all()
+        for item, (item_id,) in zip(items, item_rows):
+            item.id = item_id
+
+        return orders
+
+    def get_by_id(self, order_id: int, for_update: bool = False) -> Optional[Order]:
+        """Get order by ID with items, optionally locking the order row."""
+        db_order = self.db.scalars(self._by_id_statement(order_id, for_update)).first()
         return self._to_entity(db_order) if db_order else None
 
     def get_all(
@@ -53,32 +111,111 @@ class OrderRepository:
         customer_id: Optional[int] = None,
         status: Optional[str] = None,
         order_by: str = "created_at",
-        order_dir: str = "desc"
-    ) -> tuple[List[Order], int]:
-        """Get all orders with pagination and filters."""
-        query = self.db.query(OrderModel).options(joinedload(OrderModel.items))
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Order], Optional[int]]:
+        """
+        Get all orders with pagination and filters.
 
-        # Apply filters
-        if customer_id:
-            query = query.filter(OrderModel.customer_id == customer_id)
+        With a cursor the page starts after the cursor's row (keyset
+        pagination) and skip is ignored. `count` is "exact", "estimated"
+        (planner statistics or RowCountCache) or "none" (total is None).
+        """
+        check_count_mode(count)
+        stmt = self._list_statement(customer_id, status)
 
-        if status:
-            query = query.filter(OrderModel.status == status)
+        # Apply ordering and pagination (keyset when a cursor is given); an
+        # exact total is fetched with the page in the same query
+        ordered = self._order_statement(stmt, order_by, order_dir, cursor)
+        rows = self.db.execute(self._with_items(page_statement(ordered, stmt, skip, limit, cursor, count))).all()
 
-        # Get total count
-        total = query.count()
+        total = page_total(self.db, stmt, rows, count, count_key("orders", customer_id=customer_id, status=status))
+        return [self._to_entity(row[0]) for row in rows], total
 
-        # Apply ordering
-        order_column = getattr(OrderModel, order_by, OrderModel.created_at)
-        if order_dir.lower() == "desc":
-            query = query.order_by(order_column.desc())
-        else:
-            query = query.order_by(order_column.asc())
+    def get_fields_by_id(self, order_id: int, fields: List[str]) -> Optional[dict]:
+        """Get only `fields` of an order (plus id and version), as a dict; items only if requested."""
+        check_fields(fields, self.FIELDS)
+        columns = field_columns(OrderModel, fields)
+        row = self.db.execute(self._fields_by_id_statement(order_id, columns)).first()
+        if not row:
+            return None
+        orders = row_dicts([row], columns)
+        if "items" in fields:
+            self._attach_items(orders, self.db.execute(self._items_statement([order_id])).all())
+        return orders[0]
 
-        # Apply pagination
-        orders = query.offset(skip).limit(limit).all()
+    def get_all_fields(
+        self,
+        fields: List[str],
+        skip: int = 0,
+        limit: int = 100,
+        customer_id: Optional[int] = None,
+        status: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[dict], Optional[int]]:
+        """
+        Get only `fields` of the orders get_all would return, as dicts.
 
-        return [self._to_entity(o) for o in orders], total
+        The SELECT lists those columns (plus id, version and the sort column)
+        and the dicts are built from the row tuples, without entities. Items
+        are read, with one more query, only when "items" is requested.
+        """
+        check_count_mode(count)
+        check_fields(fields, self.FIELDS)
+        stmt = self._list_statement(customer_id, status)
+        columns = field_columns(OrderModel, fields, order_by)
+        ordered = self._order_statement(stmt, order_by, order_dir, cursor)
+        rows = self.db.execute(page_statement(ordered.with_only_columns(*columns), stmt, skip, limit, cursor, count)).all()
+
+        total = page_total(self.db, stmt, rows, count, count_key("orders", customer_id=customer_id, status=status))
+        orders = row_dicts(rows, columns)
+        if "items" in fields and orders:
+            self._attach_items(orders, self.db.execute(self._items_statement([o["id"] for o in orders])).all())
+        return orders, total
+
+    def get_version(self, order_id: int) -> Optional[int]:
+        """Get the row version of a order without loading it."""
+        return self.db.scalar(self._version_statement(order_id))
+
+    def get_page_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        customer_id: Optional[int] = None,
+        status: Optional[str] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Tuple[int, int]], Optional[int]]:
+        """
+        Get (id, version) of the rows get_all would return, and the total.
+
+        Only two columns per row are read and no entity is built, which is
+        enough to answer a conditional request.
+        """
+        check_count_mode(count)
+        stmt = self._list_statement(customer_id, status)
+        ordered = self._order_statement(stmt, order_by, order_dir, cursor)
+        page = page_statement(ordered.with_only_columns(OrderModel.id, OrderModel.version), stmt, skip, limit, cursor, count)
+        rows = self.db.execute(page).all()
+
+        total = page_total(self.db, stmt, rows, count, count_key("orders", customer_id=customer_id, status=status))
+        return [(row.id, row.version) for row in rows], total
+
+    def stream(self, customer_id: Optional[int] = None, status: Optional[str] = None, batch_size: int = 1000) -> Iterator[Order]:
+        """
+        Yield every matching order, with its items, in id order.
+
+        Rows are fetched `batch_size` at a time through a server-side cursor
+        (yield_per), so memory stays flat whatever the table size.
+        """
+        for db_order in self.db.scalars(self._export_statement(customer_id, status, batch_size)):
+            yield self._to_entity(db_order)
 
     def update(self, order: Order) -> Order:
         """Update an existing order."""
@@ -103,6 +240,95 @@ class OrderRepository:
         self.db.commit()
         return True
 
+    @staticmethod
+    def _with_items(stmt: Select) -> Select:
+        """
+        Load the items of the selected orders with one extra IN query.
+
+        The orders are paged on their own (no JOIN multiplying rows under
+        LIMIT/OFFSET) and all their items then come from a single
+        SELECT ... WHERE order_id IN (...).
+        """
+        return stmt.options(selectinload(OrderModel.items))
+
+    @staticmethod
+    def _by_id_statement(order_id: int, for_update: bool = False) -> Select:
+        """Build the SELECT loading one order with its items."""
+        stmt = OrderRepository._with_items(select(OrderModel).where(OrderModel.id == order_id))
+        if for_update:
+            stmt = stmt.with_for_update().execution_options(populate_existing=True)
+        return stmt
+
+    @staticmethod
+    def _version_statement(order_id: int) -> Select:
+        """Build the SELECT of a order's row version."""
+        return select(OrderModel.version).where(OrderModel.id == order_id)
+
+    @staticmethod
+    def _fields_by_id_statement(order_id: int, columns: list) -> Select:
+        """Build the SELECT of some columns of one order."""
+        return select(*columns).where(OrderModel.id == order_id)
+
+    @staticmethod
+    def _items_statement(order_ids: List[int]) -> Select:
+        """Build the SELECT of the item columns of some orders, for sparse fieldsets."""
+        return (
+            select(
+                OrderItemModel.order_id,
+                OrderItemModel.id,
+                OrderItemModel.product_id,
+                OrderItemModel.unit_price,
+                OrderItemModel.quantity,
+            )
+            .where(OrderItemModel.order_id.in_(order_ids))
+            .order_by(OrderItemModel.id)
+        )
+
+    @staticmethod
+    def _attach_items(orders: List[dict], item_rows) -> None:
+        """Add to each order dict its items, as in the full representation."""
+        items = {order["id"]: [] for order in orders}
+        for order_id, item_id, product_id, unit_price, quantity in item_rows:
+            items[order_id].append({
+                "id": item_id,
+                "product_id": product_id,
+                "unit_price": unit_price,
+                "quantity": quantity,
+                "line_total": round(unit_price * quantity, 2),
+            })
+        for order in orders:
+            order["items"] = items[order["id"]]
+
+    @staticmethod
+    def _export_statement(customer_id: Optional[int] = None, status: Optional[str] = None, batch_size: int = 1000) -> Select:
+        """Build the id-ordered SELECT read by stream(), batch_size rows per fetch."""
+        stmt = OrderRepository._with_items(OrderRepository._list_statement(customer_id, status).order_by(OrderModel.id))
+        return stmt.execution_options(yield_per=batch_size)
+
+    @staticmethod
+    def _list_statement(customer_id: Optional[int] = None, status: Optional[str] = None) -> Select:
+        """Build the filtered order SELECT shared by the sync and async repositories."""
+        stmt = select(OrderModel)
+
+        # Apply filters
+        if customer_id:
+            stmt = stmt.where(OrderModel.customer_id == customer_id)
+
+        if status:
+            stmt = stmt.where(OrderModel.status == status)
+
+        return stmt
+
+    @staticmethod
+    def _order_statement(stmt: Select, order_by: str, order_dir: str, cursor: Optional[str] = None) -> Select:
+        """Apply the requested ordering (and keyset cursor), falling back to created_at."""
+        return apply_ordering(stmt, OrderModel, order_by, order_dir, cursor)
+
+    @staticmethod
+    def next_cursor(items: List[Order], order_by: str, limit: int) -> Optional[str]:
+        """Return the keyset cursor for the page following `items`."""
+        return build_next_cursor(OrderModel, items, order_by, limit)
+
     @staticmethod
     def _to_entity(model: OrderModel) -> Order:
         """Convert database model to domain entity."""
@@ -123,4 +349,5 @@ class OrderRepository:
             items=items,
             status=model.status,
             created_at=model.created_at,
+            version=model.version,
         )
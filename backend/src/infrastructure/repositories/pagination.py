@@ -0,0 +1,110 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, List, Mapping, Optional, Tuple
+from sqlalchemy import DateTime, Select, literal, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import ColumnProperty
+from sqlalchemy.sql.expression import FunctionElement
+
+
+class datetime_key(FunctionElement):
+    """
+    A datetime column or cursor value as keyset pagination compares it.
+
+    SQLite stores datetimes as text, in the format of whoever wrote them:
+    CURRENT_TIMESTAMP (server defaults) has no fraction of a second,
+    SQLAlchemy always writes six digits. Compared as text the two disagree on
+    equal instants, so SQLite compares julianday() numbers instead. Other
+    databases compare the values themselves.
+    """
+
+    type = DateTime()
+    name = "datetime_key"
+    inherit_cache = True
+
+
+@compiles(datetime_key)
+def _datetime_key_default(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(datetime_key, "sqlite")
+def _datetime_key_sqlite(element, compiler, **kw):
+    return "julianday(%s)" % compiler.process(element.clauses, **kw)
+
+
+def resolve_order_column(model, order_by: str) -> Tuple[str, Any]:
+    """Return the name and column to sort by, falling back to created_at."""
+    column = getattr(model, order_by, None)
+    if not isinstance(getattr(column, "property", None), ColumnProperty):
+        return "created_at", model.created_at
+    return order_by, column
+
+
+def encode_cursor(order_by: str, value: Any, last_id: int) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, Enum):
+        value = value.value
+    payload = json.dumps([order_by, value, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Any, int]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        order_by, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+    return order_by, value, int(last_id)
+
+
+def apply_ordering(
+    stmt: Select,
+    model,
+    order_by: str,
+    order_dir: str,
+    cursor: Optional[str] = None,
+) -> Select:
+    """
+    Order a statement by the requested column with id as tie-breaker.
+
+    With a cursor, only rows after the cursor's (sort value, id) are
+    selected, so the page is found through the index instead of skipping
+    rows with OFFSET.
+    """
+    order_name, order_column = resolve_order_column(model, order_by)
+    descending = order_dir.lower() == "desc"
+    is_datetime = isinstance(order_column.type, DateTime)
+    sort_column = datetime_key(order_column) if is_datetime else order_column
+
+    if cursor:
+        cursor_order_by, value, last_id = decode_cursor(cursor)
+        if cursor_order_by != order_name:
+            raise ValueError("Pagination cursor does not match order_by")
+        if is_datetime and value is not None:
+            value = datetime.fromisoformat(value)
+        # Bound with the column's type, so it is written as the column's values are
+        bound = literal(value, order_column.type)
+        key, after = tuple_(sort_column, model.id), tuple_(datetime_key(bound) if is_datetime else bound, last_id)
+        stmt = stmt.where(key < after if descending else key > after)
+
+    if descending:
+        return stmt.order_by(sort_column.desc(), model.id.desc())
+    return stmt.order_by(sort_column.asc(), model.id.asc())
+
+
+def build_next_cursor(model, items: List[Any], order_by: str, limit: int) -> Optional[str]:
+    """Return the cursor for the page after `items` (entities or row dicts), or None on the last page."""
+    if not items or len(items) < limit:
+        return None
+    order_name, _ = resolve_order_column(model, order_by)
+    last = items[-1]
+    if isinstance(last, Mapping):
+        return encode_cursor(order_name, last[order_name], last["id"])
+    return encode_cursor(order_name, getattr(last, order_name), last.id)
@@ -0,0 +1,323 @@
+import json
+import os
+import select as select_module
+import threading
+import time
+from collections import OrderedDict
+from copy import copy
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import Select, func, select
+from src.domain.entities import Product
+import structlog
+
+logger = structlog.get_logger()
+
+PRODUCT_CACHE_ENABLED = os.getenv("PRODUCT_CACHE_ENABLED", "true").lower() == "true"
+PRODUCT_CACHE_SIZE = int(os.getenv("PRODUCT_CACHE_SIZE", "10000"))
+PRODUCT_CACHE_SEARCH_SIZE = int(os.getenv("PRODUCT_CACHE_SEARCH_SIZE", "1000"))
+PRODUCT_CACHE_TTL_SECONDS = float(os.getenv("PRODUCT_CACHE_TTL_SECONDS", "300"))
+PRODUCT_CACHE_WARMUP_SIZE = int(os.getenv("PRODUCT_CACHE_WARMUP_SIZE", "1000"))
+
+# PostgreSQL LISTEN/NOTIFY channel carrying invalidations between workers
+NOTIFY_CHANNEL = "product_cache"
+
+
+class ProductCache:
+    """
+    Process-wide read-through cache of Product entities.
+
+    Products are cached by id; autocomplete results are cached as the list
+    of matching ids and hydrated from the product entries. Entries expire
+    after the TTL and both maps are bounded LRUs.
+
+    Writers invalidate after committing: product ids whose row changed
+    (stock included) and, with catalog=True, every cached search result.
+    Readers take a token() before reading the database and hand it back to
+    put(); an entry invalidated after the token was taken is not stored, so
+    a read racing a write cannot bring the old row back into the cache.
+
+    The cache never answers locking reads: checkout locks and re-reads the
+    rows it decrements, so stock checks stay authoritative.
+    """
+
+    enabled = PRODUCT_CACHE_ENABLED
+    size = PRODUCT_CACHE_SIZE
+    search_size = PRODUCT_CACHE_SEARCH_SIZE
+    ttl = PRODUCT_CACHE_TTL_SECONDS
+    warmup_size = PRODUCT_CACHE_WARMUP_SIZE
+
+    _products: "OrderedDict[int, Tuple[Product, float]]" = OrderedDict()
+    _searches: "OrderedDict[Tuple, Tuple[List[int], float]]" = OrderedDict()
+    _lock = threading.Lock()
+
+    # Invalidation clock: _invalidated maps product id -> clock value of its
+    # last invalidation; tokens older than _floor are always rejected
+    _clock = 0
+    _floor = 0
+    _catalog_invalidated = 0
+    _invalidated: Dict[int, int] = {}
+
+    _hits = 0
+    _misses = 0
+    _search_hits = 0
+    _search_misses = 0
+    _evictions = 0
+    _invalidations = 0
+    _notifications = 0
+
+    @classmethod
+    def token(cls) -> int:
+        """Return the token to pass to put() for a read starting now."""
+        with cls._lock:
+            return cls._clock
+
+    @classmethod
+    def get(cls, product_id: int) -> Optional[Product]:
+        """Return a copy of a cached product, or None on a miss."""
+        found, _ = cls.get_many([product_id])
+        return found.get(product_id)
+
+    @classmethod
+    def get_many(cls, product_ids: Iterable[int]) -> Tuple[Dict[int, Product], List[int]]:
+        """Return the cached products by id and the ids that missed."""
+        found: Dict[int, Product] = {}
+        missing: List[int] = []
+        if not cls.enabled:
+            return found, list(product_ids)
+
+        now = time.monotonic()
+        with cls._lock:
+            for product_id in product_ids:
+                cached = cls._products.get(product_id)
+                if cached and cached[1] > now:
+                    cls._products.move_to_end(product_id)
+                    found[product_id] = copy(cached[0])
+                else:
+                    if cached:
+                        del cls._products[product_id]
+                    missing.append(product_id)
+            cls._hits += len(found)
+            cls._misses += len(missing)
+        return found, missing
+
+    @classmethod
+    def put(cls, products: Iterable[Product], token: int) -> None:
+        """Cache products read from the database after `token` was taken."""
+        if not cls.enabled:
+            return
+
+        expires_at = time.monotonic() + cls.ttl
+        with cls._lock:
+            if token < cls._floor:
+                return
+            for product in products:
+                if cls._invalidated.get(product.id, 0) > token:
+                    continue
+                cls._products[product.id] = (copy(product), expires_at)
+                cls._products.move_to_end(product.id)
+            while len(cls._products) > cls.size:
+                cls._products.popitem(last=False)
+                cls._evictions += 1
+
+    @classmethod
+    def get_search(cls, key: Tuple) -> Optional[List[int]]:
+        """Return the cached product ids of a search, or None on a miss."""
+        if not cls.enabled:
+            return None
+
+        with cls._lock:
+            cached = cls._searches.get(key)
+            if cached and cached[1] > time.monotonic():
+                cls._searches.move_to_end(key)
+                cls._search_hits += 1
+                return list(cached[0])
+            cls._searches.pop(key, None)
+            cls._search_misses += 1
+        return None
+
+    @classmethod
+    def put_search(cls, key: Tuple, product_ids: List[int], token: int) -> None:
+        """Cache the product ids of a search read after `token` was taken."""
+        if not cls.enabled:
+            return
+
+        with cls._lock:
+            if token < cls._floor or cls._catalog_invalidated > token:
+                return
+            cls._searches[key] = (list(product_ids), time.monotonic() + cls.ttl)
+            cls._searches.move_to_end(key)
+            while len(cls._searches) > cls.search_size:
+                cls._searches.popitem(last=False)
+                cls._evictions += 1
+
+    @classmethod
+    def invalidate(cls, product_ids: Iterable[int] = (), catalog: bool = False) -> None:
+        """
+        Drop products whose rows changed; catalog=True also drops searches.
+
+        Call after the change is committed. Use catalog=True when the set of
+        products matching a search may have changed (create, delete, name,
+        SKU or status updates); stock changes only need the product ids.
+        """
+        with cls._lock:
+            cls._clock += 1
+            cls._invalidations += 1
+            for product_id in product_ids:
+                cls._invalidated[product_id] = cls._clock
+                cls._products.pop(product_id, None)
+            if catalog:
+                cls._catalog_invalidated = cls._clock
+                cls._searches.clear()
+            if len(cls._invalidated) > cls.size:
+                # Forget per-id history; reads started before now are rejected
+                cls._invalidated.clear()
+                cls._floor = cls._clock
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop every entry, e.g. after invalidations may have been missed."""
+        with cls._lock:
+            cls._clock += 1
+            cls._floor = cls._clock
+            cls._catalog_invalidated = cls._clock
+            cls._invalidated.clear()
+            cls._products.clear()
+            cls._searches.clear()
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop every entry and zero the metrics."""
+        cls.clear()
+        with cls._lock:
+            cls._hits = cls._misses = cls._search_hits = cls._search_misses = 0
+            cls._evictions = cls._invalidations = cls._notifications = 0
+
+    @classmethod
+    def snapshot(cls) -> dict:
+        """Return the cache metrics, including hit rates."""
+        with cls._lock:
+            lookups = cls._hits + cls._misses
+            searches = cls._search_hits + cls._search_misses
+            return {
+                "enabled": cls.enabled,
+                "products": len(cls._products),
+                "searches": len(cls._searches),
+                "hits": cls._hits,
+                "misses": cls._misses,
+                "hit_rate": cls._hits / lookups if lookups else 0.0,
+                "search_hits": cls._search_hits,
+                "search_misses": cls._search_misses,
+                "search_hit_rate": cls._search_hits / searches if searches else 0.0,
+                "evictions": cls._evictions,
+                "invalidations": cls._invalidations,
+                "notifications": cls._notifications,
+            }
+
+    @staticmethod
+    def notify_statement(product_ids: Iterable[int] = (), catalog: bool = False) -> Select:
+        """
+        Build the pg_notify() announcing an invalidation to every worker.
+
+        Executed inside the writing transaction, so PostgreSQL only delivers
+        it once the change is committed (and drops it on rollback).
+        """
+        payload = json.dumps({"ids": sorted(set(product_ids)), "catalog": catalog}, separators=(",", ":"))
+        return select(func.pg_notify(NOTIFY_CHANNEL, payload))
+
+    @classmethod
+    def apply_notification(cls, payload: str) -> None:
+        """Apply an invalidation received from another worker (or this one)."""
+        with cls._lock:
+            cls._notifications += 1
+        try:
+            message = json.loads(payload)
+            cls.invalidate(message.get("ids", ()), catalog=bool(message.get("catalog")))
+        except (ValueError, TypeError, AttributeError):
+            logger.warning("Invalid product cache notification", payload=payload)
+            cls.clear()
+
+
+class ProductCacheListener:
+    """
+    Background thread applying invalidations announced by other workers.
+
+    Holds one autocommit psycopg2 connection that LISTENs on the product
+    cache channel. When the connection drops, notifications may have been
+    missed, so the cache is cleared before listening again.
+    """
+
+    def __init__(self, engine, poll_seconds: float = 1.0, retry_seconds: float = 5.0):
+        self.engine = engine
+        self.poll_seconds = poll_seconds
+        self.retry_seconds = retry_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start listening in a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="product-cache-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the listener thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_seconds + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Listen until stopped, reconnecting after errors."""
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                logger.warning("Product cache listener disconnected", error=str(e))
+                ProductCache.clear()
+                self._stop.wait(self.retry_seconds)
+
+    def _listen(self) -> None:
+        """LISTEN on one connection and apply notifications as they arrive."""
+        raw = self.engine.raw_connection()
+        try:
+            connection = raw.driver_connection
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            logger.info("Product cache listener started", channel=NOTIFY_CHANNEL)
+
+            while not self._stop.is_set():
+                if select_module.select([connection], [], [], self.poll_seconds) == ([], [], []):
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    ProductCache.apply_notification(connection.notifies.pop(0).payload)
+        finally:
+            raw.invalidate()
+
+
+_listener: Optional[ProductCacheListener] = None
+_listener_lock = threading.Lock()
+
+
+def start_product_cache_listener(engine) -> Optional[ProductCacheListener]:
+    """Start the shared listener; only PostgreSQL carries invalidations between workers."""
+    global _listener
+    if not ProductCache.enabled or engine.dialect.name != "postgresql":
+        return None
+    with _listener_lock:
+        if _listener is None:
+            _listener = ProductCacheListener(engine)
+            _listener.start()
+        return _listener
+
+
+def stop_product_cache_listener() -> None:
+    """Stop the shared listener, if it was started."""
+    global _listener
+    with _listener_lock:
+        listener, _listener = _listener, None
+    if listener:
+        listener.stop()
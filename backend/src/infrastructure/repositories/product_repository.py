@@ -1,13 +1,22 @@
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import Insert, Select, Update, and_, case, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from src.infrastructure.database.models import ProductModel
 from src.domain.entities import Product
+from .pagination import apply_ordering, build_next_cursor
+from .search import matches, relevance
+from .counting import check_count_mode, count_key, page_statement, page_total
+from .fields import check_fields, field_columns, row_dicts
+from .product_cache import ProductCache
 
 
 class ProductRepository:
     """Repository for Product entity."""
 
+    # Fields of the API representation, selectable with ?fields=
+    FIELDS = ("id", "name", "sku", "price", "stock_qty", "is_active", "created_at")
+
     def __init__(self, db: Session):
         self.db = db
 
@@ -30,6 +39,13 @@ class ProductRepository:
         db_product = self.db.query(ProductModel).filter(ProductModel.id == product_id).first()
         return self._to_entity(db_product) if db_product else None
 
+    def get_fields_by_id(self, product_id: int, fields: List[str]) -> Optional[dict]:
+        """Get only `fields` of a product (plus id and version), as a dict."""
+        check_fields(fields, self.FIELDS)
+        columns = field_columns(ProductModel, fields)
+        row = self.db.execute(self._fields_by_id_statement(product_id, columns)).first()
+        return row_dicts([row], columns)[0] if row else None
+
     def get_by_sku(self, sku: str) -> Optional[Product]:
         """Get product by SKU."""
         db_product = self.db.query(ProductModel).filter(ProductModel.sku == sku).first()
@@ -42,37 +58,95 @@ class ProductRepository:
         search: Optional[str] = None,
         is_active: Optional[bool] = None,
         order_by: str = "created_at",
-        order_dir: str = "desc"
-    ) -> tuple[List[Product], int]:
-        """Get all products with pagination and filters."""
-        query = self.db.query(ProductModel)
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Product], Optional[int]]:
+        """
+        Get all products with pagination and filters.
 
-        # Apply filters
-        if search:
-            query = query.filter(
-                or_(
-                    ProductModel.name.ilike(f"%{search}%"),
-                    ProductModel.sku.ilike(f"%{search}%")
-                )
-            )
+        With a cursor the page starts after the cursor's row (keyset
+        pagination) and skip is ignored. `count` is "exact", "estimated"
+        (planner statistics or RowCountCache) or "none" (total is None).
+        """
+        check_count_mode(count)
+        stmt = self._list_statement(search, is_active)
 
-        if is_active is not None:
-            query = query.filter(ProductModel.is_active == is_active)
+        # Apply ordering and pagination (keyset when a cursor is given); an
+        # exact total is fetched with the page in the same query
+        ordered = self._order_statement(stmt, order_by, order_dir, cursor, search)
+        rows = self.db.execute(page_statement(ordered, stmt, skip, limit, cursor, count)).all()
 
-        # Get total count
-        total = query.count()
+        total = page_total(self.db, stmt, rows, count, count_key("products", search=search, is_active=is_active))
+        return [self._to_entity(row[0]) for row in rows], total
 
-        # Apply ordering
-        order_column = getattr(ProductModel, order_by, ProductModel.created_at)
-        if order_dir.lower() == "desc":
-            query = query.order_by(order_column.desc())
-        else:
-            query = query.order_by(order_column.asc())
+    def get_all_fields(
+        self,
+        fields: List[str],
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[dict], Optional[int]]:
+        """
+        Get only `fields` of the products get_all would return, as dicts.
+
+        The SELECT lists those columns (plus id, version and the sort column)
+        and the dicts are built from the row tuples, without entities.
+        """
+        check_count_mode(count)
+        check_fields(fields, self.FIELDS)
+        stmt = self._list_statement(search, is_active)
+        columns = field_columns(ProductModel, fields, order_by)
+        ordered = self._order_statement(stmt, order_by, order_dir, cursor, search)
+        rows = self.db.execute(page_statement(ordered.with_only_columns(*columns), stmt, skip, limit, cursor, count)).all()
 
-        # Apply pagination
-        products = query.offset(skip).limit(limit).all()
+        total = page_total(self.db, stmt, rows, count, count_key("products", search=search, is_active=is_active))
+        return row_dicts(rows, columns), total
 
-        return [self._to_entity(p) for p in products], total
+    def get_version(self, product_id: int) -> Optional[int]:
+        """Get the row version of a product without loading it."""
+        return self.db.scalar(self._version_statement(product_id))
+
+    def get_page_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        order_by: str = "created_at",
+        order_dir: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
+    ) -> tuple[List[Tuple[int, int]], Optional[int]]:
+        """
+        Get (id, version) of the rows get_all would return, and the total.
+
+        Only two columns per row are read and no entity is built, which is
+        enough to answer a conditional request.
+        """
+        check_count_mode(count)
+        stmt = self._list_statement(search, is_active)
+        ordered = self._order_statement(stmt, order_by, order_dir, cursor, search)
+        page = page_statement(ordered.with_only_columns(ProductModel.id, ProductModel.version), stmt, skip, limit, cursor, count)
+        rows = self.db.execute(page).all()
+
+        total = page_total(self.db, stmt, rows, count, count_key("products", search=search, is_active=is_active))
+        return [(row.id, row.version) for row in rows], total
+
+    def stream(self, search: Optional[str] = None, is_active: Optional[bool] = None, batch_size: int = 1000) -> Iterator[Product]:
+        """
+        Yield every matching product in id order.
+
+        Rows are fetched `batch_size` at a time through a server-side cursor
+        (yield_per), so memory stays flat whatever the table size.
+        """
+        for db_product in self.db.scalars(self._export_statement(search, is_active, batch_size)):
+            yield self._to_entity(db_product)
 
     def update(self, product: Product) -> Product:
         """Update an existing product."""
@@ -100,11 +174,227 @@ class ProductRepository:
         self.db.commit()
         return True
 
-    def get_by_ids(self, product_ids: List[int]) -> List[Product]:
-        """Get multiple products by their IDs."""
-        db_products = self.db.query(ProductModel).filter(ProductModel.id.in_(product_ids)).all()
+    def get_by_ids(self, product_ids: List[int], for_update: bool = False) -> List[Product]:
+        """
+        Get multiple products by their IDs.
+
+        With for_update=True the rows are locked (SELECT ... FOR UPDATE) in
+        ascending id order, so concurrent checkouts touching overlapping
+        products always acquire their locks in the same order, and rows
+        already in the session are refreshed with the locked values.
+        """
+        db_products = self.db.scalars(self._by_ids_statement(product_ids, for_update)).all()
         return [self._to_entity(p) for p in db_products]
 
+    def reserve_stock(self, quantities: Dict[int, int]) -> bool:
+        """
+        Decrement stock for several products in a single conditional UPDATE.
+
+        Every row is only touched if it is active and still has enough stock,
+        so the statement either updates all requested products or the caller
+        must roll back. Does not commit; the caller owns the transaction.
+
+        Returns True when every product was decremented.
+        """
+        if not quantities:
+            return True
+
+        result = self.db.execute(self._reserve_stock_statement(quantities))
+        return result.rowcount == len(quantities)
+
+    def resolve(self, product_ids: List[int], skus: List[str]) -> Dict[int, str]:
+        """Map the given product ids and SKUs that exist to id -> sku."""
+        return dict(self.db.execute(self._resolve_statement(product_ids, skus)).all())
+
+    def adjust_stock(self, deltas: Dict[int, int], levels: Dict[int, int]) -> Dict[int, int]:
+        """
+        Apply stock deltas and absolute levels in a single UPDATE ... RETURNING.
+
+        Rows whose stock would become negative are left untouched and are
+        missing from the result, in which case the caller must roll back.
+        Does not commit. Returns id -> new stock of the updated products.
+        """
+        if not deltas and not levels:
+            return {}
+        return dict(self.db.execute(self._adjust_stock_statement(deltas, levels)).all())
+
+    def upsert_by_sku(self, products: List[Product], update_active: bool = True) -> Tuple[Dict[str, int], List[int]]:
+        """
+        Insert or update products by SKU with INSERT ... ON CONFLICT.
+
+        The rows are sent as one executemany, which SQLAlchemy batches into
+        multi-row INSERTs. Rows whose values already match are not rewritten,
+        so their version stays. Returns the sku -> id of the SKUs that already
+        existed and the ids actually written (inserted or changed). Does not
+        commit.
+        """
+        existing = dict(self.db.execute(self._skus_statement([p.sku for p in products])).all())
+        stmt = self._upsert_statement(self.db.get_bind().dialect.name, update_active)
+        return existing, list(self.db.scalars(stmt, self._upsert_rows(products)))
+
+    def announce_changes(self, product_ids: Iterable[int] = (), catalog: bool = False) -> None:
+        """
+        Announce a product cache invalidation to the other workers.
+
+        The NOTIFY is part of the current transaction, so it is delivered
+        on commit and dropped on rollback. A no-op outside PostgreSQL.
+        Does not commit.
+        """
+        if ProductCache.enabled and self.db.get_bind().dialect.name == "postgresql":
+            self.db.execute(ProductCache.notify_statement(product_ids, catalog))
+
+    @staticmethod
+    def _fields_by_id_statement(product_id: int, columns: list) -> Select:
+        """Build the SELECT of some columns of one product."""
+        return select(*columns).where(ProductModel.id == product_id)
+
+    @staticmethod
+    def _version_statement(product_id: int) -> Select:
+        """Build the SELECT of a product's row version."""
+        return select(ProductModel.version).where(ProductModel.id == product_id)
+
+    @staticmethod
+    def _export_statement(search: Optional[str] = None, is_active: Optional[bool] = None, batch_size: int = 1000) -> Select:
+        """Build the id-ordered SELECT read by stream(), batch_size rows per fetch."""
+        stmt = ProductRepository._list_statement(search, is_active).order_by(ProductModel.id)
+        return stmt.execution_options(yield_per=batch_size)
+
+    @staticmethod
+    def _skus_statement(skus: List[str]) -> Select:
+        """Build the SELECT of (sku, id) of the given SKUs."""
+        return select(ProductModel.sku, ProductModel.id).where(ProductModel.sku.in_(skus))
+
+    @staticmethod
+    def _upsert_statement(dialect_name: str, update_active: bool = True) -> Insert:
+        """Build INSERT ... ON CONFLICT (sku) DO UPDATE of changed rows, returning the written ids."""
+        dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(ProductModel.__table__)
+        columns = ["name", "price", "stock_qty"] + (["is_active"] if update_active else [])
+        changes = {c: stmt.excluded[c] for c in columns}
+        return stmt.on_conflict_do_update(
+            index_elements=[ProductModel.sku],
+            # ON CONFLICT skips the column's onupdate, so the version is bumped here
+            set_={**changes, "version": ProductModel.version + 1},
+            where=or_(*(getattr(ProductModel, c) != value for c, value in changes.items())),
+        ).returning(ProductModel.id)
+
+    @staticmethod
+    def _upsert_rows(products: List[Product]) -> List[dict]:
+        """Build the executemany parameters of _upsert_statement."""
+        return [
+            {"name": p.name, "sku": p.sku, "price": p.price, "stock_qty": p.stock_qty, "is_active": p.is_active}
+            for p in products
+        ]
+
+    @staticmethod
+    def _list_statement(search: Optional[str] = None, is_active: Optional[bool] = None) -> Select:
+        """Build the filtered product SELECT shared by the sync and async repositories."""
+        stmt = select(ProductModel)
+
+        # Apply filters (accent-insensitive and trigram-indexed on PostgreSQL)
+        if search:
+            stmt = stmt.where(
+                or_(
+                    matches(ProductModel.name, search),
+                    matches(ProductModel.sku, search)
+                )
+            )
+
+        if is_active is not None:
+            stmt = stmt.where(ProductModel.is_active == is_active)
+
+        return stmt
+
+    @staticmethod
+    def _by_ids_statement(product_ids: List[int], for_update: bool = False) -> Select:
+        """Build the SELECT used by get_by_ids, optionally locking the rows."""
+        stmt = select(ProductModel).where(ProductModel.id.in_(product_ids))
+        if for_update:
+            stmt = (
+                stmt.order_by(ProductModel.id)
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            )
+        return stmt
+
+    @staticmethod
+    def _order_statement(
+        stmt: Select,
+        order_by: str,
+        order_dir: str,
+        cursor: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> Select:
+        """
+        Apply the requested ordering (and keyset cursor), falling back to created_at.
+
+        order_by="relevance" with a search term sorts by trigram similarity
+        to name or SKU (PostgreSQL), then by name; it pages with skip only.
+        """
+        if order_by == "relevance" and search:
+            if cursor:
+                raise ValueError("Cursor pagination is not available with order_by=relevance")
+            return stmt.order_by(
+                relevance([ProductModel.name, ProductModel.sku], search).desc(),
+                ProductModel.name.asc(),
+                ProductModel.id.asc(),
+            )
+        return apply_ordering(stmt, ProductModel, order_by, order_dir, cursor)
+
+    @staticmethod
+    def next_cursor(items: List[Product], order_by: str, limit: int) -> Optional[str]:
+        """Return the keyset cursor for the page following `items`."""
+        if order_by == "relevance":
+            return None
+        return build_next_cursor(ProductModel, items, order_by, limit)
+
+    @staticmethod
+    def _reserve_stock_statement(quantities: Dict[int, int]) -> Update:
+        """Build the conditional stock decrement used by reserve_stock."""
+        product_ids = sorted(quantities)
+        requested = case(
+            {product_id: quantities[product_id] for product_id in product_ids},
+            value=ProductModel.id,
+        )
+        return (
+            update(ProductModel)
+            .where(
+                and_(
+                    ProductModel.id.in_(product_ids),
+                    ProductModel.is_active.is_(True),
+                    ProductModel.stock_qty >= requested,
+                )
+            )
+            .values(stock_qty=ProductModel.stock_qty - requested)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def _resolve_statement(product_ids: List[int], skus: List[str]) -> Select:
+        """Build the SELECT of (id, sku) of the products matching the ids or SKUs."""
+        return select(ProductModel.id, ProductModel.sku).where(
+            or_(ProductModel.id.in_(product_ids), ProductModel.sku.in_(skus))
+        )
+
+    @staticmethod
+    def _adjust_stock_statement(deltas: Dict[int, int], levels: Dict[int, int]) -> Update:
+        """Build the stock UPDATE used by adjust_stock, guarded against negative stock."""
+        product_ids = sorted({*deltas, *levels})
+        new_stock = case(
+            {
+                **{product_id: ProductModel.stock_qty + delta for product_id, delta in sorted(deltas.items())},
+                **{product_id: level for product_id, level in sorted(levels.items())},
+            },
+            value=ProductModel.id,
+        )
+        return (
+            update(ProductModel)
+            .where(and_(ProductModel.id.in_(product_ids), new_stock >= 0))
+            .values(stock_qty=new_stock)
+            .returning(ProductModel.id, ProductModel.stock_qty)
+            .execution_options(synchronize_session=False)
+        )
+
     @staticmethod
     def _to_entity(model: ProductModel) -> Product:
         """Convert database model to domain entity."""
@@ -116,4 +406,5 @@ class ProductRepository:
             stock_qty=model.stock_qty,
             is_active=model.is_active,
             created_at=model.created_at,
+            version=model.version,
         )
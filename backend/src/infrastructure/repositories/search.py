@@ -0,0 +1,73 @@
+from sqlalchemy import Float, String, literal
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement, FunctionElement
+
+# IMMUTABLE wrapper around unaccent() created by migration 005, so it can be
+# used in the trigram expression indexes
+UNACCENT_FUNCTION = "immutable_unaccent"
+
+
+class search_key(FunctionElement):
+    """
+    Normalized text used for search: lowercased and, on PostgreSQL, unaccented.
+
+    Matches the expression of the trigram indexes on PostgreSQL; other
+    databases get plain lower(), i.e. the previous ILIKE behavior.
+    """
+
+    type = String()
+    name = "search_key"
+    inherit_cache = True
+
+
+@compiles(search_key)
+def _search_key_default(element, compiler, **kw):
+    return "lower(%s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(search_key, "postgresql")
+def _search_key_postgresql(element, compiler, **kw):
+    return "%s(lower(%s))" % (UNACCENT_FUNCTION, compiler.process(element.clauses, **kw))
+
+
+class search_relevance(FunctionElement):
+    """
+    Best trigram similarity of a search term (first argument) to any of the
+    other arguments; constant 0 where pg_trgm is not available.
+    """
+
+    type = Float()
+    name = "search_relevance"
+    inherit_cache = True
+
+
+@compiles(search_relevance)
+def _search_relevance_default(element, compiler, **kw):
+    # Not "0": an integer constant in ORDER BY is read as a column position
+    return "0.0"
+
+
+@compiles(search_relevance, "postgresql")
+def _search_relevance_postgresql(element, compiler, **kw):
+    term, *columns = [search_key(clause) for clause in element.clauses]
+    scores = [
+        "similarity(%s, %s)" % (compiler.process(column, **kw), compiler.process(term, **kw))
+        for column in columns
+    ]
+    return scores[0] if len(scores) == 1 else "greatest(%s)" % ", ".join(scores)
+
+
+def _like_pattern(term: str) -> str:
+    """Wrap a search term in % wildcards, escaping LIKE metacharacters."""
+    escaped = term.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    return f"%{escaped}%"
+
+
+def matches(column, term: str) -> ColumnElement:
+    """Substring match of `term` in `column`, served by the trigram index on PostgreSQL."""
+    return search_key(column).like(search_key(literal(_like_pattern(term))), escape="/")
+
+
+def relevance(columns, term: str) -> ColumnElement:
+    """Relevance of `term` for rows, as the best similarity against `columns`."""
+    return search_relevance(literal(term), *columns)
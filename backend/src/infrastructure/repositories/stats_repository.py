@@ -0,0 +1,148 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import Date, Insert, Select, cast, delete, func, insert, literal, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from src.infrastructure.database.models import (
+    CustomerModel,
+    OrderDailyStatsModel,
+    OrderModel,
+    ProductModel,
+)
+from src.domain.entities import Order, OrderStatus, Product
+from .product_repository import ProductRepository
+
+
+class StatsRepository:
+    """Repository for dashboard aggregates and the daily order rollup."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add_orders(self, orders: List[Order], sign: int = 1) -> None:
+        """
+        Count orders (sign=1) or discount deleted ones (sign=-1) in the rollup.
+
+        The orders must be in the database (flushed, not yet deleted): they
+        are counted under the day of their stored created_at. Does not
+        commit; the caller records the change in the same transaction as the
+        orders themselves.
+        """
+        if orders:
+            dialect_name = self.db.get_bind().dialect.name
+            self.db.execute(self._add_orders_statement(dialect_name, [order.id for order in orders], sign))
+
+    def move_order(self, order: Order, previous_status: OrderStatus) -> None:
+        """Move an order from its previous status to its current one. Does not commit."""
+        if OrderStatus(previous_status) != OrderStatus(order.status):
+            dialect_name = self.db.get_bind().dialect.name
+            self.db.execute(self._move_order_statement(dialect_name, order.id, previous_status, order.status))
+
+    def rebuild(self) -> None:
+        """
+        Recompute the rollup from the orders table.
+
+        For maintenance scripts that write orders without OrderService.
+        Does not commit.
+        """
+        self.db.execute(delete(OrderDailyStatsModel))
+        self.db.execute(self._rebuild_statement(self.db.get_bind().dialect.name))
+
+    def order_totals(self) -> List[Tuple[OrderStatus, int, float]]:
+        """Return (status, order count, revenue) summed over the rollup."""
+        return [tuple(row) for row in self.db.execute(self._order_totals_statement()).all()]
+
+    def catalog_totals(self, low_stock_threshold: int) -> Tuple[int, int, int, int]:
+        """Return (products, active products, low-stock products, customers)."""
+        return tuple(self.db.execute(self._catalog_totals_statement(low_stock_threshold)).one())
+
+    def low_stock_products(self, low_stock_threshold: int, limit: int) -> List[Product]:
+        """Return the products with the least stock below the threshold."""
+        db_products = self.db.scalars(self._low_stock_statement(low_stock_threshold, limit)).all()
+        return [ProductRepository._to_entity(p) for p in db_products]
+
+    @staticmethod
+    def _order_day(dialect_name: str):
+        """The day an order is counted under: its created_at, as stored."""
+        # SQLite has no DATE type to cast to; date() yields the ISO day
+        return func.date(OrderModel.created_at) if dialect_name == "sqlite" else cast(OrderModel.created_at, Date)
+
+    @staticmethod
+    def _add_orders_statement(dialect_name: str, order_ids: List[int], sign: int) -> Insert:
+        """Build the UPSERT adding (sign=1) or discounting (sign=-1) orders, grouped by day and status."""
+        day = StatsRepository._order_day(dialect_name)
+        rows = (
+            select(day, OrderModel.status, func.count() * sign, func.sum(OrderModel.total_amount) * sign)
+            .where(OrderModel.id.in_(order_ids))
+            .group_by(day, OrderModel.status)
+            # Rollup rows are locked in one order by every writer
+            .order_by(day, OrderModel.status)
+        )
+        return StatsRepository._upsert_statement(dialect_name, rows)
+
+    @staticmethod
+    def _move_order_statement(dialect_name: str, order_id: int, previous_status: OrderStatus, status: OrderStatus) -> Insert:
+        """Build the UPSERT moving one order from its previous status to its current one."""
+        day = StatsRepository._order_day(dialect_name)
+        moves = sorted([(OrderStatus(previous_status), -1), (OrderStatus(status), 1)])
+        rows = union_all(*(
+            select(day, cast(literal(moved, OrderModel.status.type), OrderModel.status.type), literal(sign), OrderModel.total_amount * sign)
+            .where(OrderModel.id == order_id)
+            for moved, sign in moves
+        ))
+        return StatsRepository._upsert_statement(dialect_name, rows)
+
+    @staticmethod
+    def _upsert_statement(dialect_name: str, rows: Select) -> Insert:
+        """Build INSERT ... SELECT ... ON CONFLICT DO UPDATE adding rows of deltas to the rollup."""
+        dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(OrderDailyStatsModel).from_select(["day", "status", "order_count", "revenue"], rows)
+        return stmt.on_conflict_do_update(
+            index_elements=[OrderDailyStatsModel.day, OrderDailyStatsModel.status],
+            set_={
+                "order_count": OrderDailyStatsModel.order_count + stmt.excluded.order_count,
+                "revenue": OrderDailyStatsModel.revenue + stmt.excluded.revenue,
+            },
+        )
+
+    @staticmethod
+    def _rebuild_statement(dialect_name: str) -> Insert:
+        """Build INSERT ... SELECT aggregating every order into the rollup."""
+        day = StatsRepository._order_day(dialect_name)
+        return insert(OrderDailyStatsModel).from_select(
+            ["day", "status", "order_count", "revenue"],
+            select(day, OrderModel.status, func.count(), func.sum(OrderModel.total_amount))
+            .group_by(day, OrderModel.status),
+        )
+
+    @staticmethod
+    def _order_totals_statement() -> Select:
+        """Build the per-status totals over the rollup."""
+        return (
+            select(
+                OrderDailyStatsModel.status,
+                func.coalesce(func.sum(OrderDailyStatsModel.order_count), 0),
+                func.coalesce(func.sum(OrderDailyStatsModel.revenue), 0.0),
+            )
+            .group_by(OrderDailyStatsModel.status)
+            .order_by(OrderDailyStatsModel.status)
+        )
+
+    @staticmethod
+    def _catalog_totals_statement(low_stock_threshold: int) -> Select:
+        """Build one SELECT returning the product and customer counters."""
+        return select(
+            select(func.count()).select_from(ProductModel).scalar_subquery(),
+            select(func.count()).where(ProductModel.is_active.is_(True)).scalar_subquery(),
+            select(func.count()).where(ProductModel.stock_qty < low_stock_threshold).scalar_subquery(),
+            select(func.count()).select_from(CustomerModel).scalar_subquery(),
+        )
+
+    @staticmethod
+    def _low_stock_statement(low_stock_threshold: int, limit: Optional[int]) -> Select:
+        """Build the SELECT of products below the stock threshold, lowest first."""
+        return (
+            select(ProductModel)
+            .where(ProductModel.stock_qty < low_stock_threshold)
+            .order_by(ProductModel.stock_qty.asc(), ProductModel.id.asc())
+            .limit(limit)
+        )
@@ -1,7 +1,13 @@
 import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from src.api.routes import api_router
+from src.infrastructure.database import get_db, get_read_db
 from src.infrastructure.database.config import Base
+from src.infrastructure.database.models import CustomerModel, ProductModel
+from src.infrastructure.repositories import ProductCache
 
 # Use in-memory SQLite database for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -22,3 +28,64 @@ def db_session():
     finally:
         session.close()
         Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def reset_product_cache():
+    """Every test starts with an empty product cache (ids repeat across databases)."""
+    ProductCache.reset()
+    yield
+    ProductCache.reset()
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Session factory of a file SQLite database that the route threadpool can share."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'api.db'}", connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def seed():
+    """Seed a session with one customer and `products` products, returning their ids."""
+
+    def seed(session, products=2, stock_qty=10, price=10.0):
+        customer = CustomerModel(name="Hospital", email="compras@hospital.com", document="12345678000190")
+        models = [
+            ProductModel(name=f"Produto {i}", sku=f"PROD-{i:03d}", price=price, stock_qty=stock_qty)
+            for i in range(products)
+        ]
+        session.add(customer)
+        session.add_all(models)
+        session.commit()
+        return customer.id, [p.id for p in models]
+
+    return seed
+
+
+@pytest.fixture
+def api_app(session_factory):
+    """The sync routes under /api/v1, reading and writing through session_factory."""
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api/v1")
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    return app
+
+
+@pytest.fixture
+def client(api_app):
+    """A test client of api_app (middleware can still be added before the first request)."""
+    return TestClient(api_app)
@@ -0,0 +1,137 @@
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.api.routes import async_api_router
+from src.application.services import AsyncOrderService
+from src.application.services.order_service import IdempotencyStore
+from src.infrastructure.database import get_async_db, get_async_read_db
+from src.infrastructure.database.config import Base
+from src.infrastructure.database.models import CustomerModel, OrderModel, ProductModel
+
+
+@pytest_asyncio.fixture
+async def async_session_factory(tmp_path):
+    """Create an aiosqlite database and return its session factory."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    IdempotencyStore.reset()
+    yield async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    IdempotencyStore.reset()
+    await engine.dispose()
+
+
+async def _seed(session, stock_qty=10):
+    """Create one customer and one product, returning their ids."""
+    customer = CustomerModel(name="Hospital", email="compras@hospital.com", document="12345678000190")
+    product = ProductModel(name="Termômetro", sku="TERM-001", price=29.9, stock_qty=stock_qty)
+    session.add_all([customer, product])
+    await session.commit()
+    return customer.id, product.id
+
+
+class TestAsyncOrderService:
+    """Test the async order service."""
+
+    @pytest.mark.asyncio
+    async def test_create_order_reserves_stock(self, async_session_factory):
+        """Test that an async order decrements stock and stores items."""
+        async with async_session_factory() as session:
+            customer_id, product_id = await _seed(session, stock_qty=5)
+            order = await AsyncOrderService(session).create_order(
+                customer_id, [{"product_id": product_id, "quantity": 2}]
+            )
+
+        async with async_session_factory() as session:
+            product = await session.get(ProductModel, product_id)
+            assert product.stock_qty == 3
+        assert order.id is not None
+        assert order.items[0].id is not None
+        assert order.total_amount == 59.8
+
+    @pytest.mark.asyncio
+    async def test_insufficient_stock_rolls_back(self, async_session_factory):
+        """Test that a rejected async order leaves stock untouched."""
+        async with async_session_factory() as session:
+            customer_id, product_id = await _seed(session, stock_qty=1)
+            with pytest.raises(ValueError, match="Insufficient stock"):
+                await AsyncOrderService(session).create_order(
+                    customer_id, [{"product_id": product_id, "quantity": 2}]
+                )
+
+        async with async_session_factory() as session:
+            assert (await session.get(ProductModel, product_id)).stock_qty == 1
+
+    @pytest.mark.asyncio
+    async def test_idempotency_key_is_shared_with_sync_store(self, async_session_factory):
+        """Test that async retries with the same key return the same order."""
+        async with async_session_factory() as session:
+            customer_id, product_id = await _seed(session)
+            items = [{"product_id": product_id, "quantity": 1}]
+            first = await AsyncOrderService(session).create_order(customer_id, items, "async-key")
+            IdempotencyStore.reset()
+            second = await AsyncOrderService(session).create_order(customer_id, items, "async-key")
+
+        assert first.id == second.id
+
+
+class TestAsyncRoutes:
+    """Test the async def routes end to end."""
+
+    @pytest.mark.asyncio
+    async def test_order_flow(self, async_session_factory):
+        """Test creating and listing through the async router."""
+        app = FastAPI()
+        app.include_router(async_api_router, prefix="/api/v1")
+
+        async def override_get_async_db():
+            async with async_session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        app.dependency_overrides[get_async_read_db] = override_get_async_db
+
+        async with async_session_factory() as session:
+            customer_id, product_id = await _seed(session)
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            created = await client.post(
+                "/api/v1/orders",
+                json={"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 3}]},
+            )
+            batch = await client.post(
+                "/api/v1/orders/batch",
+                json={"orders": [
+                    {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 1}]},
+                    {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 99}]},
+                ]},
+            )
+            listed = await client.get("/api/v1/orders")
+            revalidated = await client.get("/api/v1/orders", headers={"If-None-Match": listed.headers["ETag"]})
+            product = await client.get(f"/api/v1/products/{product_id}")
+            exported = await client.get("/api/v1/orders/export", params={"format": "csv"})
+            stats = await client.get("/api/v1/stats/dashboard")
+            sparse_orders = await client.get("/api/v1/orders", params={"fields": "total_amount,items"})
+            sparse_order = await client.get(f"/api/v1/orders/{created.json()['data']['id']}", params={"fields": "status"})
+            sparse_products = await client.get("/api/v1/products", params={"fields": "name,stock_qty"})
+            sparse_customer = await client.get(f"/api/v1/customers/{customer_id}", params={"fields": "email"})
+
+        assert created.json()["cod_retorno"] == 0
+        assert batch.json()["data"]["created"] == 1
+        assert batch.json()["data"]["failed"] == 1
+        assert listed.json()["data"]["total"] == 2
+        assert revalidated.status_code == 304
+        assert product.json()["data"]["stock_qty"] == 6
+        assert exported.headers["content-type"].startswith("text/csv")
+        assert len(exported.text.splitlines()) == 3  # header and one row per order item
+        assert stats.json()["data"]["total_orders"] == 2
+        assert [len(o["items"]) for o in sparse_orders.json()["data"]["items"]] == [1, 1]
+        assert sparse_order.json()["data"] == {"status": "CREATED"}
+        assert sparse_products.json()["data"]["items"] == [{"name": "Termômetro", "stock_qty": 6}]
+        assert sparse_customer.json()["data"] == {"email": "compras@hospital.com"}
+
+        async with async_session_factory() as session:
+            assert (await session.get(OrderModel, created.json()["data"]["id"])) is not None
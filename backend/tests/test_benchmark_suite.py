@@ -0,0 +1,51 @@
+import structlog
+
+from benchmarks.suite import compare, load_baseline, main, run_suite, save_baseline
+
+
+class TestBenchmarkSuite:
+    """Test the micro-benchmark baselines and regression check."""
+
+    def test_compare_flags_regressions_above_threshold(self):
+        """Test threshold, noise floor and operations without a baseline."""
+        baseline = {"1000": {"create_order": 10.0, "to_entity": 0.02}}
+        results = {"1000": {"create_order": 12.6, "to_entity": 0.04, "search": 3.0}, "10000": {"create_order": 9.0}}
+
+        rows = {(r["size"], r["operation"]): r for r in compare(results, baseline, threshold=0.25, min_delta_ms=0.05)}
+
+        assert rows[("1000", "create_order")]["status"] == "regression"
+        assert round(rows[("1000", "create_order")]["change"], 2) == 0.26
+        assert rows[("1000", "to_entity")]["status"] == "ok"  # doubled, but within timer noise
+        assert rows[("1000", "search")]["status"] == "new"
+        assert rows[("10000", "create_order")]["status"] == "new"
+        assert compare({"1000": {"create_order": 12.4}}, baseline, threshold=0.25)[0]["status"] == "ok"
+
+    def test_run_and_store_baseline(self, tmp_path):
+        """Test that every tracked operation runs and round-trips through the baseline file."""
+        results = run_suite(f"sqlite:///{tmp_path / 'bench.db'}", [20], repeat=1)
+
+        assert set(results["20"]) == {
+            "order_service.create_order",
+            "product_repository.search",
+            "order_repository.to_entity",
+            "serialization.order_pydantic",
+            "serialization.order_lean",
+            "logging.sync_json",
+            "logging.queued_sampled",
+        }
+        path = str(tmp_path / "baselines" / "sqlite.json")
+        save_baseline(path, results, repeat=1)
+        save_baseline(path, {"50": results["20"]}, repeat=1)
+        assert load_baseline(path) == {"20": results["20"], "50": results["20"]}
+
+    def test_missing_baseline_fails_until_recorded(self, tmp_path):
+        """Test that a run without a baseline fails, and passes once --update recorded one."""
+        args = ["--database-url", f"sqlite:///{tmp_path / 'bench.db'}", "--sizes", "20", "--repeat", "1",
+                "--threshold", "100", "--baseline", str(tmp_path / "postgresql.json")]
+        config = structlog.get_config()
+        try:
+            assert main(args) == 1
+            assert main(args + ["--update"]) == 0
+            assert main(args) == 0
+        finally:
+            structlog.configure(**config)
@@ -0,0 +1,104 @@
+from fastapi import Response
+
+from src.api.conditional import etag_matches
+from src.api.routes.orders import get_order, list_orders
+from src.api.routes.products import get_product, list_products
+from src.application.services import OrderService, ProductService
+from src.infrastructure.database.query_stats import track_queries
+
+
+def _list(db, response, if_none_match=None):
+    return list_products(
+        response, skip=0, limit=100, search=None, is_active=None, order_by="created_at",
+        order_dir="desc", cursor=None, count="exact", if_none_match=if_none_match, accept=None, db=db
+    )
+
+
+class TestRowVersions:
+    """Test that every kind of UPDATE bumps the row version."""
+
+    def test_orm_and_core_updates_bump_version(self, db_session, seed):
+        """Test product updates and the conditional stock UPDATE of checkout."""
+        customer_id, (product_id, _) = seed(db_session)
+        products = ProductService(db_session)
+        assert products.get_product(product_id).version == 1
+
+        assert products.update_product(product_id, price=31.0).version == 2
+
+        order = OrderService(db_session).create_order(customer_id, [{"product_id": product_id, "quantity": 1}])
+        assert products.get_product_version(product_id) == 3
+        assert order.version == 1
+
+        paid = OrderService(db_session).update_order_status(order.id, "PAID")
+        assert paid.version == 2
+
+
+class TestConditionalGet:
+    """Test ETag and If-None-Match handling on the sync routes."""
+
+    def test_resource_not_modified(self, db_session, seed):
+        """Test that a matching If-None-Match gets a bodyless 304."""
+        _, (product_id, _) = seed(db_session)
+        response = Response()
+        get_product(product_id, response, None, db_session, None, db_session)
+        etag = response.headers["ETag"]
+
+        not_modified = get_product(product_id, Response(), etag, db_session, None, db_session)
+        assert not_modified.status_code == 304
+        assert not_modified.body == b""
+        assert not_modified.headers["ETag"] == etag
+
+        ProductService(db_session).update_product(product_id, stock_qty=5)
+        changed = Response()
+        result = get_product(product_id, changed, etag, db_session, None, db_session)
+        assert result.data.stock_qty == 5
+        assert changed.headers["ETag"] != etag
+
+    def test_order_etag_skips_loading_items(self, db_session, seed):
+        """Test that the order ETag is answered from the version column."""
+        customer_id, (product_id, _) = seed(db_session)
+        order = OrderService(db_session).create_order(customer_id, [{"product_id": product_id, "quantity": 1}])
+        response = Response()
+        get_order(order.id, response, None, db_session)
+
+        assert get_order(order.id, Response(), response.headers["ETag"], db_session).status_code == 304
+
+    def test_list_not_modified_until_a_row_changes(self, db_session, seed):
+        """Test list ETags computed from the page versions and the total."""
+        customer_id, (product_id, _) = seed(db_session)
+        response = Response()
+        _list(db_session, response)
+        etag = response.headers["ETag"]
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+        assert _list(db_session, Response(), f'W/{etag}, "other"').status_code == 304
+
+        OrderService(db_session).create_order(customer_id, [{"product_id": product_id, "quantity": 1}])
+        assert _list(db_session, Response(), etag).status_code == 200
+
+    def test_list_not_modified_loads_no_rows(self, db_session, seed):
+        """Test that a list 304 reads only (id, version) and the total: no entity or item SELECT."""
+        customer_id, (product_id, _) = seed(db_session)
+        OrderService(db_session).create_order(customer_id, [{"product_id": product_id, "quantity": 1}])
+        products, orders = Response(), Response()
+        _list(db_session, products)
+        list_orders(orders, 0, 100, None, None, "created_at", "desc", None, "exact", None, None, db_session)
+
+        with track_queries() as stats:
+            assert _list(db_session, Response(), products.headers["ETag"]).status_code == 304
+            assert list_orders(
+                Response(), 0, 100, None, None, "created_at", "desc", None, "exact", orders.headers["ETag"], None, db_session
+            ).status_code == 304
+
+        assert stats.count == 2
+        for statement in stats.statements:
+            assert "products.name" not in statement
+            assert "orders.total_amount" not in statement
+            assert "order_items" not in statement
+
+    def test_if_none_match_parsing(self):
+        """Test wildcard, lists and weak validators."""
+        assert etag_matches("*", '"a"')
+        assert etag_matches('"b", W/"a"', '"a"')
+        assert not etag_matches('"b"', '"a"')
+        assert not etag_matches(None, '"a"')
@@ -0,0 +1,118 @@
+import gzip
+
+import brotli
+import msgpack
+import pytest
+
+from src.api.compression import CompressionMiddleware, choose_encoding
+from src.api.serialization import list_format
+
+
+@pytest.fixture
+def client(client, api_app, session_factory, seed):
+    """The API client behind the compression middleware, with 30 products."""
+    api_app.add_middleware(CompressionMiddleware)
+    with session_factory() as session:
+        seed(session, products=30)
+    return client
+
+
+def _raw(response):
+    """The body as sent, before the client decoded it."""
+    return b"".join(response.iter_raw())
+
+
+class TestNegotiationHeaders:
+    """Test the parsing of Accept and Accept-Encoding."""
+
+    def test_choose_encoding(self):
+        """Test q-values, wildcards and the brotli preference."""
+        assert choose_encoding("gzip, deflate, br") == "br"
+        assert choose_encoding("gzip, br;q=0.5") == "gzip"
+        assert choose_encoding("br;q=0, gzip;q=0") is None
+        assert choose_encoding("*") == "br"
+        assert choose_encoding("identity") is None
+        assert choose_encoding(None) is None
+
+    def test_list_format(self):
+        """Test that MessagePack is picked only when preferred at least as much as JSON."""
+        assert list_format("application/msgpack") == "msgpack"
+        assert list_format("application/json;q=0.9, application/x-msgpack") == "msgpack"
+        assert list_format("application/json, application/msgpack;q=0.5") == "json"
+        assert list_format("*/*") == "json"
+        assert list_format(None) == "json"
+
+
+class TestContentNegotiation:
+    """Test compressed and MessagePack list pages and exports."""
+
+    def test_compressed_list_pages(self, client):
+        """Test brotli and gzip pages against the identity page, their weak ETag and the size threshold."""
+        plain = client.get("/api/v1/products", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.headers["Vary"] == "Accept, Accept-Encoding"
+
+        with client.stream("GET", "/api/v1/products", headers={"Accept-Encoding": "br"}) as br:
+            assert br.headers["Content-Encoding"] == "br"
+            assert brotli.decompress(_raw(br)) == plain.content
+            assert br.headers["ETag"] == f"W/{plain.headers['ETag']}"
+        with client.stream("GET", "/api/v1/products", headers={"Accept-Encoding": "gzip"}) as gz:
+            assert gz.headers["Content-Encoding"] == "gzip"
+            raw = _raw(gz)
+            assert int(gz.headers["Content-Length"]) == len(raw) < len(plain.content) / 3
+            assert gzip.decompress(raw) == plain.content
+            assert gz.headers["ETag"] == f"W/{plain.headers['ETag']}"
+
+        small = client.get("/api/v1/products?limit=1", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in small.headers
+        assert small.headers["Vary"] == "Accept, Accept-Encoding"
+        assert not small.headers["ETag"].startswith("W/")
+
+    def test_revalidation_keeps_the_encoding_validator(self, client):
+        """Test that a 304 varies on Accept-Encoding and echoes the weak or strong ETag revalidated."""
+        plain = client.get("/api/v1/products", headers={"Accept-Encoding": "identity"})
+        weak = f"W/{plain.headers['ETag']}"
+
+        for if_none_match, encoding in ((weak, "gzip"), (plain.headers["ETag"], "identity")):
+            revalidated = client.get(
+                "/api/v1/products", headers={"If-None-Match": if_none_match, "Accept-Encoding": encoding}
+            )
+            assert revalidated.status_code == 304
+            assert revalidated.headers["ETag"] == if_none_match
+            assert "Accept-Encoding" in revalidated.headers["Vary"]
+
+    def test_msgpack_list_page(self, client):
+        """Test that the MessagePack page decodes to the JSON page and has its own ETag."""
+        plain = client.get("/api/v1/products")
+        packed = client.get("/api/v1/products", headers={"Accept": "application/msgpack"})
+
+        assert packed.headers["Content-Type"] == "application/msgpack"
+        assert msgpack.unpackb(packed.content) == plain.json()
+        assert packed.headers["ETag"] != plain.headers["ETag"]
+
+        revalidated = client.get(
+            "/api/v1/products",
+            headers={"Accept": "application/msgpack", "If-None-Match": packed.headers["ETag"]},
+        )
+        assert revalidated.status_code == 304
+        assert client.get("/api/v1/products", headers={"If-None-Match": packed.headers["ETag"]}).status_code == 200
+
+    def test_streamed_export_is_compressed_as_one_stream(self, client):
+        """Test a gzip CSV export against the identity export."""
+        plain = client.get("/api/v1/products/export?format=csv", headers={"Accept-Encoding": "identity"})
+        with client.stream("GET", "/api/v1/products/export?format=csv", headers={"Accept-Encoding": "gzip"}) as gz:
+            assert gz.headers["Content-Encoding"] == "gzip"
+            assert "content-length" not in gz.headers
+            assert gzip.decompress(_raw(gz)) == plain.content
+        assert plain.content.count(b"\n") == 31
+
+    def test_unmarked_routes_are_not_compressed(self, client, api_app):
+        """Test that only list and export routes are compressed, whatever the body size."""
+
+        @api_app.get("/api/v1/large")
+        def large():
+            return {"data": "x" * 5000}
+
+        response = client.get("/api/v1/large", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert "vary" not in response.headers
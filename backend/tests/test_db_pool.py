@@ -0,0 +1,78 @@
+import time
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from src.api.routes.stats import get_db_pool_stats
+from src.infrastructure.database import pool
+from src.infrastructure.database.pool import PoolTelemetry, TimedNullPool, TimedQueuePool
+
+
+def pooled_engine(tmp_path, telemetry: PoolTelemetry, **options):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool, **options)
+    engine.pool.telemetry = telemetry
+    telemetry.attach(engine)
+    return engine
+
+
+class TestPoolTelemetry:
+    """Test the pool telemetry and the idle liveness check."""
+
+    def test_checkouts_waits_and_timeouts(self, tmp_path):
+        """Test connection counts, ages and a checkout that times out."""
+        telemetry = PoolTelemetry("test", pool_size=1)
+        engine = pooled_engine(tmp_path, telemetry, pool_size=1, max_overflow=0, pool_timeout=0.05)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            busy = telemetry.snapshot()
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+        stats = telemetry.snapshot()
+        assert (busy["checked_out"], busy["idle"], busy["connections"]) == (1, 0, 1)
+        assert (stats["checked_out"], stats["idle"], stats["checkouts"]) == (0, 1, 1)
+        assert stats["timeouts"] == 1 and stats["wait_max_ms"] >= 50
+        assert stats["oldest_connection_age_s"] is not None
+        engine.dispose()
+        assert telemetry.snapshot()["connections"] == 0
+
+    def test_idle_connections_are_pinged(self, tmp_path, monkeypatch):
+        """Test that only idle connections are pinged and a failed ping swaps the connection."""
+        telemetry = PoolTelemetry("test", pool_size=1, pre_ping="idle", ping_idle_seconds=0.05)
+        engine = pooled_engine(tmp_path, telemetry, pool_size=1, max_overflow=0)
+
+        for _ in range(2):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        assert telemetry.snapshot()["pings"] == 0
+
+        def dropped(dbapi_connection):
+            raise ConnectionError("server closed the connection")
+
+        time.sleep(0.06)
+        monkeypatch.setattr(engine.dialect, "do_ping", dropped)
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+
+        stats = telemetry.snapshot()
+        assert (stats["pings"], stats["ping_failures"], stats["connections"]) == (1, 1, 1)
+        engine.dispose()
+
+    def test_pgbouncer_mode_options(self, monkeypatch):
+        """Test NullPool and no asyncpg prepared statement caching behind pgbouncer."""
+        monkeypatch.setattr(pool, "DB_PGBOUNCER", True)
+        assert pool.pool_options() == {"poolclass": TimedNullPool}
+        connect_args = pool.pool_options(is_async=True)["connect_args"]
+        assert connect_args["statement_cache_size"] == 0 and connect_args["prepared_statement_cache_size"] == 0
+        assert connect_args["prepared_statement_name_func"]() != connect_args["prepared_statement_name_func"]()
+
+        monkeypatch.setattr(pool, "DB_PGBOUNCER", False)
+        options = pool.pool_options()
+        assert options["poolclass"] is TimedQueuePool and options["pool_size"] == pool.DB_POOL_SIZE
+
+    def test_endpoint_reports_configured_engines(self):
+        """Test the admin endpoint payload."""
+        data = get_db_pool_stats().data
+        assert "primary" in [p.name for p in data.pools]
+        assert data.pre_ping in pool.PRE_PING_STRATEGIES
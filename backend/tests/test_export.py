@@ -0,0 +1,72 @@
+import csv
+import io
+
+import orjson
+
+from src.api import export
+from src.api.export import ExportEncoder, export_chunks
+from src.application.services import CustomerService, OrderService, ProductService
+
+
+def _body(entities, resource, fmt, session):
+    return b"".join(export_chunks(entities, ExportEncoder(resource, fmt), session.close))
+
+
+class TestExport:
+    """Test the streamed NDJSON and CSV exports."""
+
+    def test_orders_ndjson_inlines_items(self, db_session, seed):
+        """Test one JSON document per order, items included, in id order."""
+        customer_id, product_ids = seed(db_session)
+        service = OrderService(db_session)
+        first = service.create_order(customer_id, [{"product_id": pid, "quantity": 1} for pid in product_ids])
+        second = service.create_order(customer_id, [{"product_id": product_ids[0], "quantity": 2}])
+
+        body = _body(service.export_orders(customer_id, None, batch_size=1), "orders", "ndjson", db_session)
+        lines = [orjson.loads(line) for line in body.splitlines()]
+
+        assert [line["id"] for line in lines] == [first.id, second.id]
+        assert len(lines[0]["items"]) == 2
+        assert lines[1]["items"][0]["line_total"] == 20.0
+
+    def test_orders_csv_has_one_row_per_item(self, db_session, seed):
+        """Test that order columns repeat on every item row."""
+        customer_id, product_ids = seed(db_session)
+        order = OrderService(db_session).create_order(
+            customer_id, [{"product_id": pid, "quantity": 3} for pid in product_ids]
+        )
+
+        body = _body(OrderService(db_session).export_orders(), "orders", "csv", db_session)
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+
+        assert [row["product_id"] for row in rows] == [str(pid) for pid in product_ids]
+        assert {row["order_id"] for row in rows} == {str(order.id)}
+        assert rows[0]["status"] == "CREATED"
+
+    def test_filters_match_list_routes(self, db_session, seed):
+        """Test that exports apply the same filters as the list routes."""
+        _, product_ids = seed(db_session, products=4)
+        for product_id in product_ids[1::2]:
+            ProductService(db_session).update_product(product_id, is_active=False)
+
+        body = _body(ProductService(db_session).export_products(None, True), "products", "csv", db_session)
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        assert [row["sku"] for row in rows] == ["PROD-000", "PROD-002"]
+
+        body = _body(CustomerService(db_session).export_customers("hospital"), "customers", "ndjson", db_session)
+        assert orjson.loads(body)["email"] == "compras@hospital.com"
+
+    def test_large_exports_are_chunked(self, db_session, monkeypatch, seed):
+        """Test that rows are sent in bounded chunks rather than one body."""
+        monkeypatch.setattr(export, "EXPORT_CHUNK_BYTES", 512)
+        seed(db_session, products=50)
+
+        chunks = list(export_chunks(
+            ProductService(db_session).export_products(batch_size=10),
+            ExportEncoder("products", "ndjson"),
+            db_session.close,
+        ))
+
+        assert len(chunks) > 5
+        assert all(len(chunk) < 1024 for chunk in chunks)
+        assert sum(chunk.count(b"\n") for chunk in chunks) == 50
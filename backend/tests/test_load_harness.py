@@ -0,0 +1,44 @@
+import random
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from benchmarks.load import API, LoadOptions, check_invariants, checkout, create_fixtures, run_load
+
+
+@pytest_asyncio.fixture
+async def client(api_app):
+    """The sync API in-process, driven through an async HTTP client like the harness."""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api_app), base_url="http://load") as client:
+        yield client
+
+
+class TestLoadHarness:
+    """Test the load harness and its invariant checks."""
+
+    @pytest.mark.asyncio
+    async def test_contended_run_keeps_invariants(self, client):
+        """Test a short run that exhausts the hot SKUs."""
+        options = LoadOptions(concurrency=4, duration=30, max_requests=250, catalog=20, hot_skus=2, hot_stock=10,
+                              customers=3, idempotent_ratio=0.3, seed=7)
+        summary = await run_load(client, options)
+
+        assert summary["orders"] > 0
+        assert summary["endpoints"]["POST /orders"]["rejected"] > 0
+        assert {"p50_ms", "p95_ms", "p99_ms"} <= set(summary["endpoints"]["GET /products"])
+        assert [c["name"] for c in summary["invariants"] if not c["passed"]] == []
+
+    @pytest.mark.asyncio
+    async def test_detects_stock_drift(self, client):
+        """Test that stock changed outside the orders breaks the invariant."""
+        options = LoadOptions(catalog=5, hot_skus=1, hot_stock=50, customers=1, hot_ratio=1.0, idempotent_ratio=0.0)
+        run = await create_fixtures(client, options)
+        await checkout(client, run, random.Random(1), options)
+        await client.patch(f"{API}/products/stock", json={"adjustments": [{"product_id": run.hot_ids[0], "delta": -1}]})
+
+        checks = {c["name"]: c for c in await check_invariants(client, run)}
+
+        assert len(run.acknowledged) == 1
+        assert not checks["stock drop equals units sold"]["passed"]
+        assert checks["no negative stock"]["passed"]
@@ -0,0 +1,99 @@
+import json
+import logging
+import queue
+import threading
+
+import pytest
+import structlog
+from prometheus_client import REGISTRY
+
+from src.infrastructure.logging_config import (
+    LOG_SAMPLE_RATES,
+    EventSampler,
+    NonBlockingQueueHandler,
+    json_formatter,
+    lazy,
+    parse_sample_rates,
+    request_processors,
+    start_writer,
+)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(json.loads(self.format(record)))
+
+
+def queued_logger(name: str, handler: logging.Handler, sampler: EventSampler, level=logging.INFO):
+    log = logging.getLogger(name)
+    log.handlers, log.propagate = [handler], False
+    log.setLevel(level)
+    return structlog.wrap_logger(log, processors=request_processors(sampler), wrapper_class=structlog.stdlib.BoundLogger)
+
+
+class TestLoggingConfig:
+    """Test sampling, lazy fields and the background writer."""
+
+    def test_parse_sample_rates(self):
+        """Test the LOG_SAMPLE_RATES format and its validation."""
+        assert parse_sample_rates(LOG_SAMPLE_RATES) == {}
+        assert parse_sample_rates("Creating order=0.1, Listing orders=0.01,") == {
+            "Creating order": 0.1,
+            "Listing orders": 0.01,
+        }
+        assert parse_sample_rates("") == {}
+        for value in ("Creating order", "=0.5", "Creating order=2", "Creating order=often"):
+            with pytest.raises(ValueError):
+                parse_sample_rates(value)
+
+    def test_sampled_lazy_events_are_rendered_by_the_writer_thread(self):
+        """Test that sampled-out events and filtered levels never compute lazy fields."""
+        writer = ListHandler()
+        writer.setFormatter(json_formatter())
+        rendered_on = []
+        writer.emit = lambda record, emit=writer.emit: (rendered_on.append(threading.current_thread()), emit(record))
+        handler, listener = start_writer(writer)
+        draws = iter([0.05, 0.5, 0.05])
+        log = queued_logger("test.queued", handler, EventSampler({"Creating order": 0.1}, lambda: next(draws)))
+        calls = []
+
+        def expensive():
+            calls.append(1)
+            return "computed"
+
+        try:
+            for n in range(3):
+                log.info("Creating order", n=n, detail=lazy(expensive))
+            log.debug("Debug detail", detail=lazy(expensive))
+            log.warning("Stock low", detail=lazy(expensive))
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                log.exception("Order failed")
+        finally:
+            listener.stop()
+
+        lines = writer.lines
+        assert [line["event"] for line in lines] == ["Creating order", "Creating order", "Stock low", "Order failed"]
+        assert [line["n"] for line in lines[:2]] == [0, 2]
+        assert lines[0]["sample_rate"] == 0.1 and "sample_rate" not in lines[2]
+        assert lines[0]["detail"] == "computed" and len(calls) == 3
+        assert "ValueError: boom" in lines[3]["exception"]
+        assert threading.current_thread() not in rendered_on
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test that events beyond the queue size are counted as dropped."""
+        handler = NonBlockingQueueHandler(queue.Queue(2))
+        exported = REGISTRY.get_sample_value("log_events_dropped_total") or 0.0
+        log = queued_logger("test.full", handler, EventSampler({}))
+
+        for n in range(5):
+            log.info("Request completed", n=n)
+
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+        assert REGISTRY.get_sample_value("log_events_dropped_total") == exported + 3
@@ -0,0 +1,88 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from src.api.metrics import MetricsMiddleware
+from src.application.services import OrderService
+from src.infrastructure.database.models import CustomerModel, ProductModel
+from src.infrastructure.database.pool import TimedQueuePool
+from src.infrastructure.metrics import instrument_pool
+
+
+def _sample(name, labels=None):
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+class TestHttpMetrics:
+    """Test the request latency and in-flight metrics."""
+
+    def test_latency_is_labelled_by_route_template(self):
+        """Test that path parameters collapse into the route template."""
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/things/{thing_id}")
+        def get_thing(thing_id: int):
+            return {"id": thing_id}
+
+        labels = {"method": "GET", "route": "/things/{thing_id}", "status": "200"}
+        before = _sample("http_request_duration_seconds_count", labels)
+        unmatched = _sample("http_request_duration_seconds_count", {"method": "GET", "route": "unmatched", "status": "404"})
+
+        client = TestClient(app)
+        client.get("/things/1")
+        client.get("/things/2")
+        client.get("/nowhere")
+
+        assert _sample("http_request_duration_seconds_count", labels) == before + 2
+        assert _sample(
+            "http_request_duration_seconds_count", {"method": "GET", "route": "unmatched", "status": "404"}
+        ) == unmatched + 1
+        assert _sample("http_requests_in_progress", {"method": "GET"}) == 0
+
+
+class TestPoolMetrics:
+    """Test the connection pool instrumentation."""
+
+    def test_checkouts_are_timed_and_counted(self, tmp_path):
+        """Test checkout wait time and connections in use."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool)
+        instrument_pool(engine)
+        checkouts = _sample("db_pool_checkout_seconds_count")
+        in_use = _sample("db_pool_connections_in_use")
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            assert _sample("db_pool_connections_in_use") == in_use + 1
+
+        assert _sample("db_pool_connections_in_use") == in_use
+        assert _sample("db_pool_checkout_seconds_count") == checkouts + 1
+        engine.dispose()
+
+
+class TestBusinessMetrics:
+    """Test the order counters."""
+
+    def test_orders_rejections_and_idempotency_hits(self, db_session):
+        """Test orders created, stock rejections and idempotent replays."""
+        customer = CustomerModel(name="Hospital", email="compras@hospital.com", document="12345678000190")
+        product = ProductModel(name="Termômetro", sku="TERM-001", price=29.9, stock_qty=1)
+        db_session.add_all([customer, product])
+        db_session.commit()
+        created = _sample("orders_created_total")
+        rejected = _sample("order_stock_rejections_total", {"stage": "check"})
+        hits = _sample("idempotency_hits_total")
+
+        service = OrderService(db_session)
+        items = [{"product_id": product.id, "quantity": 1}]
+        service.create_order(customer.id, items, "metrics-key")
+        service.create_order(customer.id, items, "metrics-key")
+        try:
+            service.create_order(customer.id, items)
+        except ValueError:
+            pass
+
+        assert _sample("orders_created_total") == created + 1
+        assert _sample("idempotency_hits_total") == hits + 1
+        assert _sample("order_stock_rejections_total", {"stage": "check"}) == rejected + 1
@@ -0,0 +1,367 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import event
+
+from src.application.services import OrderService, OrderGroupCommitter
+from src.application.services.order_service import IdempotencyStore
+from src.infrastructure.database.models import (
+    IdempotencyKeyModel,
+    OrderModel,
+    OrderItemModel,
+    ProductModel,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_idempotency_store():
+    """Keep the process-wide idempotency cache from leaking between tests."""
+    IdempotencyStore.reset()
+    yield
+    IdempotencyStore.reset()
+
+
+class TestCreateOrder:
+    """Test order placement and stock reservation."""
+
+    def test_create_order_reserves_stock(self, db_session, seed):
+        """Test that a successful order decrements stock for every line."""
+        customer_id, (p1, p2) = seed(db_session, stock_qty=10, products=2)
+
+        order = OrderService(db_session).create_order(
+            customer_id=customer_id,
+            items=[
+                {"product_id": p1, "quantity": 3},
+                {"product_id": p2, "quantity": 1},
+                {"product_id": p1, "quantity": 2},
+            ],
+        )
+
+        assert order.id is not None
+        assert len(order.items) == 3
+        assert order.total_amount == 60.0
+        db_session.expire_all()
+        assert db_session.get(ProductModel, p1).stock_qty == 5
+        assert db_session.get(ProductModel, p2).stock_qty == 9
+
+    def test_insufficient_stock_leaves_nothing_behind(self, db_session, seed):
+        """Test that a rejected order does not touch stock of other lines."""
+        customer_id, (p1, p2) = seed(db_session, stock_qty=5, products=2)
+
+        with pytest.raises(ValueError, match="Insufficient stock"):
+            OrderService(db_session).create_order(
+                customer_id=customer_id,
+                items=[
+                    {"product_id": p1, "quantity": 2},
+                    {"product_id": p2, "quantity": 6},
+                ],
+            )
+
+        db_session.expire_all()
+        assert db_session.get(ProductModel, p1).stock_qty == 5
+        assert db_session.get(ProductModel, p2).stock_qty == 5
+        assert db_session.query(OrderModel).count() == 0
+        assert db_session.query(OrderItemModel).count() == 0
+
+    def test_aggregated_quantity_is_checked(self, db_session, seed):
+        """Test that repeated lines for one product are checked together."""
+        customer_id, (p1,) = seed(db_session, stock_qty=5, products=1)
+
+        with pytest.raises(ValueError, match="Insufficient stock"):
+            OrderService(db_session).create_order(
+                customer_id=customer_id,
+                items=[
+                    {"product_id": p1, "quantity": 3},
+                    {"product_id": p1, "quantity": 3},
+                ],
+            )
+
+    def test_inactive_product_is_not_a_stock_rejection(self, db_session, seed):
+        """Test that an inactive product is rejected as such, without counting a stock rejection."""
+        customer_id, (p1, p2) = seed(db_session, stock_qty=5, products=2)
+        db_session.get(ProductModel, p2).is_active = False
+        db_session.commit()
+        service = OrderService(db_session)
+        rejections = {stage: REGISTRY.get_sample_value("order_stock_rejections_total", {"stage": stage}) or 0.0
+                      for stage in ("check", "reserve")}
+
+        with pytest.raises(ValueError, match="Product 'Produto 1' is not active"):
+            service.create_order(customer_id, [{"product_id": p2, "quantity": 1}])
+        results = service.create_orders_batch([
+            {"customer_id": customer_id, "items": [{"product_id": p1, "quantity": 1}, {"product_id": p2, "quantity": 1}]},
+        ])
+
+        assert results[0][1] == "Product 'Produto 1' is not active"
+        for stage, before in rejections.items():
+            assert (REGISTRY.get_sample_value("order_stock_rejections_total", {"stage": stage}) or 0.0) == before
+        db_session.expire_all()
+        assert db_session.get(ProductModel, p1).stock_qty == 5
+
+    def test_conditional_decrement_rejects_stale_read(self, db_session, seed):
+        """Test that the decrement itself guards against overselling."""
+        _, (p1,) = seed(db_session, stock_qty=3, products=1)
+        service = OrderService(db_session)
+
+        assert service.product_repository.reserve_stock({p1: 2}) is True
+        assert service.product_repository.reserve_stock({p1: 2}) is False
+        db_session.commit()
+        assert db_session.get(ProductModel, p1).stock_qty == 1
+
+    def test_concurrent_checkouts_never_oversell(self, session_factory, seed):
+        """Test that concurrent orders on a hot SKU never oversell."""
+
+        with session_factory() as session:
+            customer_id, (product_id,) = seed(session, stock_qty=10, products=1)
+
+        results = []
+
+        def checkout():
+            with session_factory() as session:
+                try:
+                    OrderService(session).create_order(
+                        customer_id=customer_id,
+                        items=[{"product_id": product_id, "quantity": 3}],
+                    )
+                    results.append("ok")
+                except ValueError:
+                    results.append("rejected")
+
+        threads = [threading.Thread(target=checkout) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with session_factory() as session:
+            stock = session.get(ProductModel, product_id).stock_qty
+            sold = sum(i.quantity for i in session.query(OrderItemModel).all())
+
+        assert results.count("ok") == 3
+        assert stock == 1
+        assert sold == 9
+
+
+class TestCreateOrdersBatch:
+    """Test bulk order ingestion."""
+
+    def test_batch_reports_result_per_order(self, db_session, seed):
+        """Test that failing entries do not prevent the others from being created."""
+        customer_id, (p1, p2) = seed(db_session, stock_qty=5, products=2)
+
+        results = OrderService(db_session).create_orders_batch([
+            {"customer_id": customer_id, "items": [{"product_id": p1, "quantity": 3}]},
+            {"customer_id": 999, "items": [{"product_id": p1, "quantity": 1}]},
+            {"customer_id": customer_id, "items": [{"product_id": p1, "quantity": 3}]},
+            {"customer_id": customer_id, "items": [
+                {"product_id": p1, "quantity": 2},
+                {"product_id": p2, "quantity": 4},
+            ]},
+        ])
+
+        assert [order is not None for order, _ in results] == [True, False, False, True]
+        assert "Customer with id 999 not found" in results[1][1]
+        assert "Available: 2, Requested: 3" in results[2][1]
+
+        created = results[3][0]
+        assert created.id is not None
+        assert all(item.id is not None for item in created.items)
+        assert created.total_amount == 60.0
+
+        db_session.expire_all()
+        assert db_session.query(OrderModel).count() == 2
+        assert db_session.query(OrderItemModel).count() == 3
+        assert db_session.get(ProductModel, p1).stock_qty == 0
+        assert db_session.get(ProductModel, p2).stock_qty == 1
+
+
+class TestIdempotency:
+    """Test idempotent order creation."""
+
+    def test_same_key_returns_same_order(self, db_session, seed):
+        """Test that a retried request does not create a second order."""
+        customer_id, (p1,) = seed(db_session, stock_qty=10, products=1)
+        items = [{"product_id": p1, "quantity": 2}]
+
+        first = OrderService(db_session).create_order(customer_id, items, idempotency_key="key-1")
+        IdempotencyStore.reset()  # simulate a retry landing on another worker
+        second = OrderService(db_session).create_order(customer_id, items, idempotency_key="key-1")
+
+        assert first.id == second.id
+        assert db_session.query(OrderModel).count() == 1
+        assert db_session.get(ProductModel, p1).stock_qty == 8
+        assert db_session.get(IdempotencyKeyModel, "key-1").order_id == first.id
+
+    def test_failed_request_releases_key(self, db_session, seed):
+        """Test that a key can be retried after the original request failed."""
+        customer_id, (p1,) = seed(db_session, stock_qty=1, products=1)
+        service = OrderService(db_session)
+
+        with pytest.raises(ValueError, match="Insufficient stock"):
+            service.create_order(customer_id, [{"product_id": p1, "quantity": 2}], idempotency_key="key-2")
+        assert db_session.get(IdempotencyKeyModel, "key-2") is None
+
+        order = service.create_order(customer_id, [{"product_id": p1, "quantity": 1}], idempotency_key="key-2")
+        assert order.id is not None
+
+    def test_cache_is_bounded(self, db_session, monkeypatch, seed):
+        """Test that the in-process cache evicts old keys but the table keeps them."""
+        monkeypatch.setattr(IdempotencyStore, "cache_size", 2)
+        customer_id, (p1,) = seed(db_session, stock_qty=10, products=1)
+        service = OrderService(db_session)
+
+        orders = [
+            service.create_order(customer_id, [{"product_id": p1, "quantity": 1}], idempotency_key=f"key-{i}")
+            for i in range(3)
+        ]
+
+        assert list(IdempotencyStore._cache) == ["key-1", "key-2"]
+        assert service.idempotency_store.get("key-0") == orders[0].id
+
+    def test_expired_keys_are_swept_and_reusable(self, db_session, seed):
+        """Test that expired keys are purged and can be claimed again."""
+        customer_id, (p1,) = seed(db_session, stock_qty=10, products=1)
+        past = datetime.utcnow() - timedelta(seconds=1)
+        db_session.add_all([
+            IdempotencyKeyModel(key="stale", status="COMPLETED", expires_at=past),
+            IdempotencyKeyModel(key="reused", status="PENDING", expires_at=past),
+        ])
+        db_session.commit()
+
+        store = IdempotencyStore(db_session)
+        store._maybe_sweep()
+        assert db_session.query(IdempotencyKeyModel).count() == 0
+
+        db_session.add(IdempotencyKeyModel(key="reused", status="PENDING", expires_at=past))
+        db_session.commit()
+        order = OrderService(db_session).create_order(
+            customer_id, [{"product_id": p1, "quantity": 1}], idempotency_key="reused"
+        )
+        assert db_session.get(IdempotencyKeyModel, "reused").order_id == order.id
+
+    def test_concurrent_requests_with_same_key(self, session_factory, seed):
+        """Test that concurrent requests sharing a key wait for the first one."""
+        with session_factory() as session:
+            customer_id, (product_id,) = seed(session, stock_qty=10, products=1)
+
+        order_ids = []
+
+        def checkout():
+            with session_factory() as session:
+                order = OrderService(session).create_order(
+                    customer_id,
+                    [{"product_id": product_id, "quantity": 1}],
+                    idempotency_key="hot-key",
+                )
+                order_ids.append(order.id)
+
+        threads = [threading.Thread(target=checkout) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with session_factory() as session:
+            orders = session.query(OrderModel).count()
+            stock = session.get(ProductModel, product_id).stock_qty
+
+        assert len(order_ids) == 6
+        assert len(set(order_ids)) == 1
+        assert orders == 1
+        assert stock == 9
+
+
+class TestGroupCommit:
+    """Test the group-commit write path."""
+
+    def test_orders_share_one_commit_and_fail_independently(self, session_factory, seed):
+        """Test that queued orders are committed together and failures stay isolated."""
+        engine = session_factory.kw["bind"]
+
+        # pysqlite needs an explicit BEGIN for SAVEPOINTs to nest inside a
+        # transaction; IMMEDIATE avoids SQLite's deferred-lock deadlocks
+        @event.listens_for(engine, "connect")
+        def _disable_pysqlite_begin(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+        # The connection pooled by create_all predates the listeners
+        engine.dispose()
+        with session_factory() as session:
+            customer_id, (product_id,) = seed(session, stock_qty=5, products=1)
+
+        committer = OrderGroupCommitter(session_factory, window_ms=200, max_batch=10)
+        exported = REGISTRY.get_sample_value("order_group_commit_batch_size_sum") or 0.0
+        outcomes = []
+
+        def checkout(quantity):
+            with session_factory() as session:
+                service = OrderService(session, group_committer=committer)
+                try:
+                    order = service.create_order(
+                        customer_id,
+                        [{"product_id": product_id, "quantity": quantity}],
+                        idempotency_key=f"group-{quantity}",
+                    )
+                    outcomes.append((quantity, order.id))
+                except ValueError as e:
+                    outcomes.append((quantity, str(e)))
+
+        threads = [threading.Thread(target=checkout, args=(q,)) for q in (1, 9, 2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        committer.stop()
+
+        results = dict(outcomes)
+        assert isinstance(results[1], int)
+        assert isinstance(results[2], int)
+        assert "Insufficient stock" in results[9]
+
+        with session_factory() as session:
+            assert session.query(OrderModel).count() == 2
+            assert session.get(ProductModel, product_id).stock_qty == 2
+            assert session.get(IdempotencyKeyModel, "group-1").order_id == results[1]
+            assert session.get(IdempotencyKeyModel, "group-9") is None
+
+        metrics = committer.metrics.snapshot()
+        assert metrics["orders"] == 3
+        assert metrics["failed_orders"] == 1
+        assert metrics["batches"] < 3
+        assert REGISTRY.get_sample_value("order_group_commit_batch_size_sum") == exported + 3
+        assert REGISTRY.get_sample_value("order_group_commit_seconds_count") >= metrics["batches"]
+
+
+class TestOrderLoading:
+    """Test how orders and their items are loaded."""
+
+    def test_list_pages_orders_and_loads_items_by_id(self, db_session, seed):
+        """Test that a page holds whole orders and items come from one IN query."""
+        customer_id, product_ids = seed(db_session, stock_qty=10, products=3)
+        service = OrderService(db_session)
+        for _ in range(3):
+            service.create_order(customer_id, [{"product_id": pid, "quantity": 1} for pid in product_ids])
+        db_session.expire_all()
+
+        statements = []
+
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_session.bind, "before_cursor_execute", listener)
+        try:
+            orders, _ = service.list_orders(limit=2, count="none")
+            order = service.get_order(orders[0].id)
+        finally:
+            event.remove(db_session.bind, "before_cursor_execute", listener)
+
+        assert [len(o.items) for o in orders] == [3, 3]
+        assert len(order.items) == 3
+        assert len(statements) == 4
+        assert all("JOIN" not in s for s in statements)
+        assert sum(" IN (" in s for s in statements) == 2
@@ -0,0 +1,179 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from src.application.services import OrderService, ProductService
+from src.infrastructure.database.models import CustomerModel, ProductModel
+from src.infrastructure.repositories import ProductRepository, RowCountCache
+from src.infrastructure.repositories.counting import Explain
+from src.infrastructure.repositories.pagination import decode_cursor, encode_cursor
+
+
+@pytest.fixture(autouse=True)
+def reset_row_count_cache():
+    """Keep cached estimated totals from leaking between tests."""
+    RowCountCache.reset()
+    yield
+    RowCountCache.reset()
+
+
+def _seed_products(session, count):
+    """Create `count` products, two per created_at value to exercise the tie-breaker."""
+    session.add_all([
+        ProductModel(
+            name=f"Produto {i:02d}",
+            sku=f"SKU-{i:02d}",
+            price=float(i),
+            stock_qty=i,
+            created_at=datetime(2026, 1, 1, 12, i // 2),
+        )
+        for i in range(count)
+    ])
+    session.commit()
+
+
+def _walk(service, limit, **kwargs):
+    """Follow next_cursor until the last page, returning all ids seen."""
+    ids, cursor = [], None
+    for _ in range(100):
+        products, _ = service.list_products(limit=limit, cursor=cursor, **kwargs)
+        ids.extend(p.id for p in products)
+        cursor = service.next_cursor(products, kwargs.get("order_by", "created_at"), limit)
+        if cursor is None:
+            return ids
+    raise AssertionError("cursor pagination did not terminate")
+
+
+class TestKeysetPagination:
+    """Test cursor pagination of list queries."""
+
+    def test_cursor_pages_match_offset_pages(self, db_session):
+        """Test that walking cursors returns every row once, in offset order."""
+        _seed_products(db_session, 23)
+        service = ProductService(db_session)
+
+        by_offset = [p.id for p in service.list_products(limit=100)[0]]
+
+        assert _walk(service, limit=5) == by_offset
+        assert len(set(by_offset)) == 23
+
+    def test_ties_across_pages_in_both_sqlite_formats(self, db_session, seed):
+        """Test equal created_at values across a page boundary, written by the server default and by SQLAlchemy."""
+        seed(db_session, products=6)
+        # The same instant, as CURRENT_TIMESTAMP writes it and as SQLAlchemy binds it
+        db_session.execute(text("UPDATE products SET created_at = '2026-01-01 12:00:00' WHERE id % 2 = 0"))
+        db_session.query(ProductModel).filter(ProductModel.id % 2 == 1).update({"created_at": datetime(2026, 1, 1, 12)})
+        db_session.commit()
+        service = ProductService(db_session)
+
+        for order_dir in ("asc", "desc"):
+            by_offset = [p.id for p in service.list_products(limit=100, order_dir=order_dir)[0]]
+            assert by_offset == sorted(by_offset, reverse=order_dir == "desc")
+            assert _walk(service, limit=4, order_dir=order_dir) == by_offset
+
+    @pytest.mark.parametrize("order_dir", ["asc", "desc"])
+    def test_cursor_on_other_column(self, db_session, order_dir):
+        """Test cursors over a non-unique sort column use id as tie-breaker."""
+        _seed_products(db_session, 12)
+        db_session.query(ProductModel).filter(ProductModel.id % 2 == 0).update({"price": 1.0})
+        db_session.commit()
+        service = ProductService(db_session)
+
+        expected = [p.id for p in service.list_products(limit=100, order_by="price", order_dir=order_dir)[0]]
+
+        assert _walk(service, limit=4, order_by="price", order_dir=order_dir) == expected
+
+    def test_cursor_must_match_order_by(self, db_session):
+        """Test that a cursor issued for another sort column is rejected."""
+        service = ProductService(db_session)
+
+        with pytest.raises(ValueError, match="does not match"):
+            service.list_products(order_by="price", cursor=encode_cursor("created_at", None, 1))
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor raises ValueError."""
+        with pytest.raises(ValueError, match="Invalid pagination cursor"):
+            decode_cursor("not-a-cursor")
+
+
+class TestListCounts:
+    """Test the count modes of list queries."""
+
+    def test_exact_total_comes_with_the_page(self, db_session):
+        """Test that exact totals cover the filtered set, not just the page."""
+        _seed_products(db_session, 15)
+        service = ProductService(db_session)
+
+        products, total = service.list_products(limit=4, search="Produto 1")
+        past_end, total_past_end = service.list_products(skip=50, limit=4)
+
+        assert len(products) == 4
+        assert total == 5
+        assert past_end == []
+        assert total_past_end == 15
+
+    def test_exact_total_with_cursor_counts_whole_set(self, db_session):
+        """Test that a cursor page still reports the full filtered total."""
+        _seed_products(db_session, 10)
+        service = ProductService(db_session)
+
+        first, _ = service.list_products(limit=3)
+        _, total = service.list_products(limit=3, cursor=service.next_cursor(first, "created_at", 3))
+
+        assert total == 10
+
+    def test_none_skips_the_count(self, db_session):
+        """Test that count=none returns no total."""
+        _seed_products(db_session, 3)
+
+        products, total = ProductService(db_session).list_products(count="none")
+
+        assert len(products) == 3
+        assert total is None
+
+    def test_estimated_uses_counter_kept_by_services(self, db_session):
+        """Test that the cached total follows creations through the service."""
+        _seed_products(db_session, 3)
+        service = ProductService(db_session)
+
+        assert service.list_products(count="estimated")[1] == 3
+
+        db_session.add(ProductModel(name="Fora do serviço", sku="RAW-1", price=1.0, stock_qty=1))
+        db_session.commit()
+        service.create_product(name="Novo", sku="NEW-1", price=1.0, stock_qty=1)
+
+        # The raw insert is not seen until the cache expires; the service insert is
+        assert service.list_products(count="estimated")[1] == 4
+        assert service.list_products(count="exact")[1] == 5
+
+    def test_planner_estimate_keeps_search_terms_bound(self):
+        """Test that EXPLAIN sends the search term as a parameter, even with colons."""
+        term = "a:b x :name"
+        compiled = Explain(ProductRepository._list_statement(search=term)).compile(dialect=postgresql.dialect())
+
+        assert str(compiled).startswith("EXPLAIN (FORMAT JSON) SELECT")
+        assert "a:b" not in str(compiled)
+        assert any(term in str(value) for value in compiled.params.values())
+
+    def test_exact_total_for_orders_with_items(self, db_session):
+        """Test that the windowed total is not multiplied by eager-loaded items."""
+        customer = CustomerModel(name="Hospital", email="compras@hospital.com", document="12345678000190")
+        db_session.add(customer)
+        _seed_products(db_session, 6)
+        product_ids = [p.id for p in db_session.query(ProductModel).filter(ProductModel.stock_qty >= 3)][:2]
+        service = OrderService(db_session)
+        for _ in range(3):
+            service.create_order(customer.id, [{"product_id": pid, "quantity": 1} for pid in product_ids])
+
+        orders, total = service.list_orders(limit=2)
+
+        assert len(orders) == 2
+        assert len(orders[0].items) == 2
+        assert total == 3
+
+    def test_invalid_count_mode(self, db_session):
+        """Test that unknown count modes are rejected."""
+        with pytest.raises(ValueError, match="Invalid count mode"):
+            ProductService(db_session).list_products(count="approximate")
@@ -0,0 +1,134 @@
+import json
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from src.application.services import OrderService, ProductService
+from src.domain.entities import Product
+from src.infrastructure.database.config import Base
+from src.infrastructure.database.models import ProductModel
+from src.infrastructure.repositories import ProductCache
+
+
+def _stock_in_db(session, product_id):
+    session.expire_all()
+    return session.get(ProductModel, product_id).stock_qty
+
+
+class TestProductCache:
+    """Test the read-through product cache and its invalidation."""
+
+    def test_get_product_reads_through(self, db_session, seed):
+        """Test that the second read is a hit and returns an independent copy."""
+        _, (product_id, _) = seed(db_session)
+        service = ProductService(db_session)
+
+        first = service.get_product(product_id)
+        first.stock_qty = 0
+        second = service.get_product(product_id)
+
+        assert second.stock_qty == 10
+        stats = ProductCache.snapshot()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_update_invalidates(self, db_session, seed):
+        """Test that an update is visible right away."""
+        _, (product_id, _) = seed(db_session)
+        service = ProductService(db_session)
+        service.get_product(product_id)
+
+        service.update_product(product_id, price=35.0)
+
+        assert service.get_product(product_id).price == 35.0
+
+    def test_order_invalidates_stock_but_checkout_reads_database(self, db_session, seed):
+        """Test that orders evict reserved products and never trust the cached stock."""
+        customer_id, (product_id, other_id) = seed(db_session)
+        products = ProductService(db_session)
+        products.get_product(product_id)
+        products.get_product(other_id)
+
+        # Stock changed behind the cache's back: checkout must still see it
+        db_session.query(ProductModel).filter_by(id=product_id).update({"stock_qty": 3})
+        db_session.commit()
+        OrderService(db_session).create_order(customer_id, [{"product_id": product_id, "quantity": 3}])
+
+        assert _stock_in_db(db_session, product_id) == 0
+        assert products.get_product(product_id).stock_qty == 0
+        assert ProductCache.snapshot()["products"] == 2
+
+    def test_stale_read_is_not_cached(self):
+        """Test that a read started before an invalidation is not stored."""
+        token = ProductCache.token()
+        ProductCache.invalidate([1])
+        ProductCache.put([Product(name="Velho", sku="OLD", price=1.0, stock_qty=1, id=1)], token)
+
+        assert ProductCache.get(1) is None
+
+    def test_cache_is_bounded(self, monkeypatch):
+        """Test that the least recently used product is evicted."""
+        monkeypatch.setattr(ProductCache, "size", 2)
+        token = ProductCache.token()
+        for product_id in (1, 2):
+            ProductCache.put([Product(name="P", sku=f"P{product_id}", price=1.0, stock_qty=1, id=product_id)], token)
+        ProductCache.get(1)
+        ProductCache.put([Product(name="P", sku="P3", price=1.0, stock_qty=1, id=3)], token)
+
+        found, missing = ProductCache.get_many([1, 2, 3])
+        assert sorted(found) == [1, 3] and missing == [2]
+        assert ProductCache.snapshot()["evictions"] == 1
+
+    def test_search_is_cached_until_catalog_changes(self, db_session, seed):
+        """Test that autocomplete results survive stock changes but not new products."""
+        customer_id, (product_id, _) = seed(db_session)
+        service = ProductService(db_session)
+        assert [p.sku for p in service.search_products("produto 0")] == ["PROD-000"]
+
+        OrderService(db_session).create_order(customer_id, [{"product_id": product_id, "quantity": 2}])
+        cached = service.search_products("produto 0")
+        assert cached[0].stock_qty == 8
+        assert ProductCache.snapshot()["search_hits"] == 1
+
+        service.create_product(name="Produto 0 Infravermelho", sku="PROD-100", price=199.0, stock_qty=2)
+        assert [p.sku for p in service.search_products("produto 0")] == ["PROD-000", "PROD-100"]
+
+    def test_replica_reads_fill_cache_from_primary(self, tmp_path, seed):
+        """Test that a lagging replica answers reads but never fills the cache."""
+        sessions = []
+        for name, price in (("primary", 35.0), ("replica", 29.9)):
+            engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+            Base.metadata.create_all(engine)
+            session = sessionmaker(bind=engine)()
+            seed(session)
+            session.query(ProductModel).filter_by(sku="PROD-000").update({"price": price})
+            session.commit()
+            sessions.append(session)
+        primary, replica = sessions
+        service = ProductService(replica, primary)
+
+        assert [p.price for p in service.search_products("produto 0")] == [29.9]
+        assert ProductCache.snapshot()["products"] == 0
+        assert service.get_product(1).price == 35.0
+        assert ProductService(replica).get_product(1).price == 35.0
+
+        for session in sessions:
+            session.close()
+            session.get_bind().dispose()
+
+    def test_notifications_invalidate(self):
+        """Test the NOTIFY statement and applying a received payload."""
+        token = ProductCache.token()
+        ProductCache.put([Product(name="P", sku="P1", price=1.0, stock_qty=1, id=1)], token)
+        ProductCache.put_search(("p", 10), [1], token)
+
+        stmt = ProductCache.notify_statement([1], catalog=True)
+        compiled = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        assert "pg_notify('product_cache'" in str(compiled)
+
+        payload = json.dumps({"ids": [1], "catalog": True})
+        ProductCache.apply_notification(payload)
+        assert ProductCache.get(1) is None
+        assert ProductCache.get_search(("p", 10)) is None
+        assert ProductCache.snapshot()["notifications"] == 1
@@ -0,0 +1,83 @@
+import io
+
+from fastapi import UploadFile
+
+from src.api.routes.products import import_products
+from src.application.services import ProductService, read_records
+from src.infrastructure.database.models import ProductModel
+from src.infrastructure.repositories import ProductCache
+
+
+def _import(session, text, fmt="csv", chunk_size=1000):
+    return ProductService(session).import_products(read_records(io.StringIO(text), fmt), chunk_size)
+
+
+CATALOG = (
+    "sku,name,price,stock_qty,is_active\n"
+    "TERM-001,Termômetro Digital,29.90,150,true\n"
+    "LUVA-001,Luva Nitrílica,1.50,300,true\n"
+    "MASC-001,Máscara Cirúrgica,19.90,500,false\n"
+)
+
+
+class TestProductImport:
+    """Test the chunked SKU upsert of product imports."""
+
+    def test_inserts_then_updates_only_changed_rows(self, db_session):
+        """Test counts and versions of a first import and a re-import."""
+        first = _import(db_session, CATALOG, chunk_size=2)
+        assert (first.inserted, first.updated, first.unchanged, first.rejected) == (3, 0, 0, 0)
+
+        second = _import(db_session, CATALOG.replace("29.90,150", "31.00,150"))
+        assert (second.inserted, second.updated, second.unchanged) == (0, 1, 2)
+
+        versions = {p.sku: (p.price, p.version) for p in db_session.query(ProductModel)}
+        assert versions["TERM-001"] == (31.0, 2)
+        assert versions["LUVA-001"] == (1.5, 1)
+
+    def test_rows_without_is_active_keep_it(self, db_session):
+        """Test that omitting is_active neither reactivates nor deactivates products."""
+        _import(db_session, CATALOG)
+        _import(db_session, '{"sku": "MASC-001", "name": "Máscara", "price": 21, "stock_qty": 10}\n', "ndjson")
+
+        product = db_session.query(ProductModel).filter_by(sku="MASC-001").one()
+        assert (product.name, product.is_active, product.version) == ("Máscara", False, 2)
+
+    def test_invalid_rows_are_reported_per_row(self, db_session):
+        """Test that bad rows are rejected with their row number and the rest imported."""
+        text = (
+            '{"sku": "A-1", "name": "Ok", "price": "10.5", "stock_qty": 1}\n'
+            "{not json\n"
+            '{"sku": "A-2", "name": "Sem preço", "stock_qty": 1}\n'
+            '{"sku": "A-3", "name": "Negativo", "price": 1, "stock_qty": -1}\n'
+            '{"sku": "A-1", "name": "Repetido", "price": 1, "stock_qty": 1}\n'
+            '["array"]\n'
+        )
+        result = _import(db_session, text, "ndjson")
+
+        assert (result.inserted, result.rejected) == (1, 5)
+        assert [e["row"] for e in result.errors] == [2, 3, 4, 5, 6]
+        assert result.errors[1] == {"row": 3, "sku": "A-2", "mensagem": "Missing price"}
+        assert "already on row 1" in result.errors[3]["mensagem"]
+
+    def test_updates_invalidate_cached_products(self, db_session):
+        """Test that imported changes are not hidden by the product cache."""
+        _import(db_session, CATALOG)
+        product_id = db_session.query(ProductModel.id).filter_by(sku="LUVA-001").scalar()
+        assert ProductService(db_session).get_product(product_id).stock_qty == 300
+        assert ProductCache.get(product_id) is not None
+
+        _import(db_session, "sku,name,price,stock_qty\nLUVA-001,Luva Nitrílica,1.50,250\n")
+        assert ProductService(db_session).get_product(product_id).stock_qty == 250
+
+    def test_route_reports_missing_columns(self, db_session):
+        """Test the upload route on a valid file and on a file without required columns."""
+        upload = UploadFile(file=io.BytesIO(CATALOG.encode("utf-8-sig")), filename="catalogo.csv")
+        response = import_products(upload, None, db_session)
+        assert response.cod_retorno == 0
+        assert response.data.inserted == 3
+
+        upload = UploadFile(file=io.BytesIO(b"sku,name\nX,Y\n"), filename="catalogo.csv")
+        response = import_products(upload, None, db_session)
+        assert response.cod_retorno != 0
+        assert "price" in response.mensagem
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.application.services import ProductService
+from src.infrastructure.database.models import ProductModel
+from src.infrastructure.repositories import ProductRepository
+
+
+def _seed(session):
+    """Create a few products with accented names."""
+    session.add_all([
+        ProductModel(name="Termômetro Digital", sku="TERM-001", price=29.9, stock_qty=5),
+        ProductModel(name="Álcool 70%", sku="ALC_070", price=9.9, stock_qty=5),
+        ProductModel(name="Luva Nitrílica", sku="LUVA-001", price=1.5, stock_qty=5),
+        ProductModel(name="Alcoômetro", sku="ALCX070", price=99.0, stock_qty=5, is_active=False),
+    ])
+    session.commit()
+
+
+class TestProductSearch:
+    """Test product search on the SQLite fallback and the PostgreSQL SQL."""
+
+    def test_search_is_case_insensitive(self, db_session):
+        """Test that search keeps the previous ILIKE behavior on SQLite."""
+        _seed(db_session)
+
+        products, total = ProductService(db_session).list_products(search="term")
+
+        assert [p.sku for p in products] == ["TERM-001"]
+        assert total == 1
+
+    def test_like_wildcards_are_literal(self, db_session):
+        """Test that % and _ typed by the user are not LIKE wildcards."""
+        _seed(db_session)
+        service = ProductService(db_session)
+
+        assert [p.sku for p in service.list_products(search="ALC_")[0]] == ["ALC_070"]
+        assert [p.name for p in service.list_products(search="70%")[0]] == ["Álcool 70%"]
+
+    def test_autocomplete_uses_relevance_ordering(self, db_session):
+        """Test that autocomplete only returns active products, ordered by name on SQLite."""
+        _seed(db_session)
+
+        products = ProductService(db_session).search_products("o", limit=10)
+
+        assert [p.name for p in products] == ["Termômetro Digital", "Álcool 70%"]
+
+    def test_relevance_has_no_cursor(self, db_session):
+        """Test that relevance ordering pages with skip only."""
+        _seed(db_session)
+        service = ProductService(db_session)
+
+        products, _ = service.list_products(limit=1, search="o", order_by="relevance")
+
+        assert service.next_cursor(products, "relevance", 1) is None
+        with pytest.raises(ValueError, match="relevance"):
+            service.list_products(search="o", order_by="relevance", cursor="abc")
+
+    def test_postgresql_search_uses_indexed_expressions(self):
+        """Test the PostgreSQL SQL matches the trigram index expressions."""
+        stmt = ProductRepository._order_statement(
+            ProductRepository._list_statement("alcool"), "relevance", "desc", search="alcool"
+        )
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "immutable_unaccent(lower(products.name)) LIKE immutable_unaccent(lower(" in sql
+        assert "immutable_unaccent(lower(products.sku)) LIKE immutable_unaccent(lower(" in sql
+        assert "ORDER BY greatest(similarity(immutable_unaccent(lower(products.name))" in sql
@@ -0,0 +1,84 @@
+"""
+Query budgets per endpoint.
+
+Budgets are counted on SQLite, where the ORM inserts order items one row
+per statement; PostgreSQL batches them (insertmanyvalues).
+"""
+from fastapi import Depends, Response
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from structlog.testing import capture_logs
+
+from src.api.query_timing import QueryTimingMiddleware
+from src.api.routes.customers import list_customers
+from src.api.routes.orders import create_order, get_order, list_orders
+from src.api.routes.products import get_product, list_products
+from src.api.schemas import OrderCreate
+from src.infrastructure.database import get_db
+from src.infrastructure.database.query_stats import query_budget
+
+
+def _order(customer_id, product_ids):
+    return OrderCreate(customer_id=customer_id, items=[{"product_id": pid, "quantity": 1} for pid in product_ids])
+
+
+class TestQueryBudgets:
+    """Test the number of queries each endpoint runs."""
+
+    def test_create_order(self, db_session, seed):
+        """Customer, locked products, stock UPDATE, order, one per item (SQLite), rollup."""
+        customer_id, product_ids = seed(db_session, products=2)
+        with query_budget(7):
+            assert create_order(_order(customer_id, product_ids), db_session, None).cod_retorno == 0
+
+    def test_order_reads_do_not_grow_with_items(self, db_session, seed):
+        """Test that lists and details load items with one extra query."""
+        customer_id, product_ids = seed(db_session, products=3)
+        for _ in range(3):
+            create_order(_order(customer_id, product_ids), db_session, None)
+
+        with query_budget(2):
+            page = list_orders(Response(), 0, 100, None, None, "created_at", "desc", None, "exact", None, None, db_session)
+        assert page.status_code == 200
+        with query_budget(2):
+            assert get_order(1, Response(), None, db_session).data.items
+
+    def test_catalog_reads(self, db_session, seed):
+        """Test single-query lists and the cached product read."""
+        _, product_ids = seed(db_session, products=3)
+        with query_budget(1):
+            list_products(Response(), 0, 100, None, None, "created_at", "desc", None, "exact", None, None, db_session)
+        with query_budget(1):
+            list_customers(Response(), 0, 100, None, "created_at", "desc", None, "exact", None, None, db_session)
+        with query_budget(1):
+            get_product(product_ids[0], Response(), None, db_session, None, db_session)
+        with query_budget(0):
+            get_product(product_ids[0], Response(), None, db_session, None, db_session)
+
+
+class TestQueryTimingMiddleware:
+    """Test the per-request headers and log lines."""
+
+    def test_headers_and_n_plus_one_warning(self, api_app, client, session_factory, seed):
+        """Test X-Query-Count, Server-Timing and the repeated statement warning."""
+        with session_factory() as session:
+            seed(session, products=1)
+        api_app.add_middleware(QueryTimingMiddleware)
+
+        @api_app.get("/repeated")
+        def repeated(db: Session = Depends(get_db)):
+            for product_id in range(6):
+                db.execute(text("SELECT name FROM products WHERE id = :id"), {"id": product_id})
+            return {}
+
+        with capture_logs() as logs:
+            listed = client.get("/api/v1/products")
+            client.get("/repeated")
+
+        assert listed.headers["X-Query-Count"] == "1"
+        assert listed.headers["Server-Timing"].startswith("db;dur=")
+        completed = [log for log in logs if log["event"] == "Request completed"]
+        assert completed[0]["route"] == "/api/v1/products"
+        assert completed[1]["queries"] == 6
+        warning = next(log for log in logs if log["event"] == "Possible N+1 query")
+        assert warning["count"] == 6 and "FROM products" in warning["statement"]
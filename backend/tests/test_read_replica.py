@@ -0,0 +1,95 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.api.cors import add_cors, cors_origins
+from src.api.read_after_write import ReadAfterWriteMiddleware
+from src.infrastructure.database import config, get_read_db
+from src.infrastructure.database.read_routing import PRIMARY_COOKIE, ReplicaStatus
+
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    """Point the primary and the replica session factories to two SQLite files."""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    monkeypatch.setattr(config, "SessionLocal", sessionmaker(bind=primary))
+    monkeypatch.setattr(config, "ReadSessionLocal", sessionmaker(bind=replica))
+    ReplicaStatus.reset()
+    yield primary, replica
+    ReplicaStatus.reset()
+    primary.dispose()
+    replica.dispose()
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    add_cors(app, cors_origins("http://localhost:3000"))
+    app.add_middleware(ReadAfterWriteMiddleware)
+
+    @app.get("/read")
+    def read(db: Session = Depends(get_read_db)):
+        return {"database": db.get_bind().url.database.rsplit("/", 1)[-1]}
+
+    @app.post("/write")
+    def write():
+        return {}
+
+    return app
+
+
+class TestReadReplicaRouting:
+    """Test read routing between the primary and the replica."""
+
+    def test_reads_stick_to_primary_after_a_write(self, databases):
+        """Test the replica by default and the primary inside the read-after-write window."""
+        client = TestClient(build_app())
+
+        assert client.get("/read").json() == {"database": "replica.db"}
+        written = client.post("/write")
+        assert PRIMARY_COOKIE in written.cookies
+        assert client.get("/read").json() == {"database": "primary.db"}
+        assert "set-cookie" not in client.get("/read").headers
+
+        client.cookies.set(PRIMARY_COOKIE, "0")
+        assert client.get("/read").json() == {"database": "replica.db"}
+
+    def test_cross_origin_client_sends_the_cookie_back(self, databases):
+        """Test the frontend's credentialed cross-origin write, then read."""
+        client = TestClient(build_app())
+        origin = {"Origin": "http://localhost:3000"}
+
+        preflight = client.options(
+            "/write", headers={**origin, "Access-Control-Request-Method": "POST", "Access-Control-Request-Headers": "content-type"}
+        )
+        assert preflight.headers["Access-Control-Allow-Origin"] == "http://localhost:3000"
+        assert preflight.headers["Access-Control-Allow-Credentials"] == "true"
+
+        written = client.post("/write", headers=origin)
+        assert written.headers["Access-Control-Allow-Origin"] == "http://localhost:3000"
+        assert written.headers["Access-Control-Allow-Credentials"] == "true"
+        assert PRIMARY_COOKIE in written.cookies
+
+        read = client.get("/read", headers=origin)
+        assert read.json() == {"database": "primary.db"}
+        assert read.headers["Access-Control-Allow-Credentials"] == "true"
+
+        with pytest.raises(ValueError, match="CORS_ORIGINS"):
+            cors_origins("http://localhost:3000,*")
+
+    def test_falls_back_to_primary_when_replica_is_down(self, databases, tmp_path, monkeypatch):
+        """Test that a failing replica is skipped for the retry window."""
+        unreachable = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+        monkeypatch.setattr(config, "ReadSessionLocal", sessionmaker(bind=unreachable))
+        client = TestClient(build_app())
+
+        assert client.get("/read").json() == {"database": "primary.db"}
+        assert not ReplicaStatus.available()
+
+        # Back up, but not retried before the window ends
+        monkeypatch.setattr(config, "ReadSessionLocal", sessionmaker(bind=databases[1]))
+        assert client.get("/read").json() == {"database": "primary.db"}
+        ReplicaStatus.reset()
+        assert client.get("/read").json() == {"database": "replica.db"}
@@ -0,0 +1,58 @@
+import json
+from datetime import datetime, timezone
+
+from fastapi import Response
+
+from src.api.schemas import ApiResponse, OrderListResponse, OrderResponse, ProductListResponse, ProductResponse
+from src.api.serialization import lean_list_response, order_to_dict, product_to_dict
+from src.domain.entities import Order, OrderItem, OrderStatus, Product
+
+
+def _validated(list_model, item_model, entities, next_cursor):
+    """Encode a page the validated way, as FastAPI does with response_model."""
+    page = list_model(
+        items=[item_model.model_validate(e) for e in entities],
+        total=len(entities),
+        skip=0,
+        limit=100,
+        next_cursor=next_cursor,
+    )
+    return json.loads(ApiResponse[list_model].success(data=page).model_dump_json())
+
+
+class TestLeanSerialization:
+    """Test that the lean path encodes the same JSON as the Pydantic models."""
+
+    def test_products_match_validated_path(self):
+        """Test products with naive and UTC timestamps."""
+        products = [
+            Product(name="Termômetro", sku="TERM-001", price=29.9, stock_qty=5, id=1,
+                    created_at=datetime(2026, 10, 17, 10, 0, 0, 123456, tzinfo=timezone.utc)),
+            Product(name="Luva", sku="LUVA-001", price=1.5, stock_qty=0, is_active=False, id=2,
+                    created_at=datetime(2026, 10, 17, 9, 30)),
+        ]
+        response = Response()
+        response.headers["ETag"] = '"products-abc"'
+
+        lean = lean_list_response([product_to_dict(p) for p in products], 2, 0, 100, "cur", response)
+
+        assert json.loads(lean.body) == _validated(ProductListResponse, ProductResponse, products, "cur")
+        assert lean.headers["ETag"] == '"products-abc"'
+        assert b'"2026-10-17T10:00:00.123456Z"' in lean.body
+
+    def test_orders_match_validated_path(self):
+        """Test orders with their items, status and computed totals."""
+        order = Order(
+            customer_id=3,
+            items=[
+                OrderItem(product_id=1, unit_price=29.9, quantity=3, id=10, order_id=7),
+                OrderItem(product_id=2, unit_price=1.5, quantity=2, id=11, order_id=7),
+            ],
+            status=OrderStatus.PAID,
+            id=7,
+            created_at=datetime(2026, 10, 17, 10, 0, tzinfo=timezone.utc),
+        )
+
+        lean = lean_list_response([order_to_dict(order)], 1, 0, 100, None, Response())
+
+        assert json.loads(lean.body) == _validated(OrderListResponse, OrderResponse, [order], None)
@@ -0,0 +1,88 @@
+import pytest
+
+from src.infrastructure.database.models import CustomerModel, ProductModel
+from src.infrastructure.database.query_stats import query_budget, track_queries
+
+
+@pytest.fixture
+def client(client, session_factory):
+    """The API client, with one customer, 5 products and 3 orders."""
+    with session_factory() as session:
+        session.add(CustomerModel(name="Hospital", email="compras@hospital.com", document="12345678000190"))
+        session.add_all(
+            ProductModel(name=f"Produto {i}", sku=f"PROD-{i}", price=10.0 + i, stock_qty=100)
+            for i in range(5)
+        )
+        session.commit()
+    for product_id in (1, 2, 3):
+        order = {"customer_id": 1, "items": [{"product_id": product_id, "quantity": 2}, {"product_id": 5, "quantity": 1}]}
+        assert client.post("/api/v1/orders", json=order).json()["cod_retorno"] == 0
+    return client
+
+
+class TestSparseFields:
+    """Test ?fields= on list and detail endpoints."""
+
+    def test_product_list(self, client):
+        """Test that a sparse page has only the requested keys, with the full page's values."""
+        full = client.get("/api/v1/products").json()["data"]["items"]
+        sparse = client.get("/api/v1/products?fields=id,name,price,stock_qty")
+
+        items = sparse.json()["data"]["items"]
+        assert [set(item) for item in items] == [{"id", "name", "price", "stock_qty"}] * 5
+        assert items == [{k: p[k] for k in ("id", "name", "price", "stock_qty")} for p in full]
+        assert sparse.headers["ETag"] != client.get("/api/v1/products").headers["ETag"]
+
+        revalidated = client.get("/api/v1/products?fields=id,name,price,stock_qty", headers={"If-None-Match": sparse.headers["ETag"]})
+        assert revalidated.status_code == 304
+
+    def test_cursor_over_sparse_pages(self, client):
+        """Test that the next cursor works when the sort column is not requested."""
+        first = client.get("/api/v1/products?fields=name&limit=2&order_by=price&order_dir=asc").json()["data"]
+        assert first["items"] == [{"name": "Produto 0"}, {"name": "Produto 1"}]
+        second = client.get(f"/api/v1/products?fields=name&limit=2&order_by=price&order_dir=asc&cursor={first['next_cursor']}")
+        assert second.json()["data"]["items"] == [{"name": "Produto 2"}, {"name": "Produto 3"}]
+
+    def test_orders_load_items_only_when_requested(self, client):
+        """Test one query without items and one more with them."""
+        with query_budget(1):
+            orders = client.get("/api/v1/orders?fields=id,total_amount").json()["data"]["items"]
+        assert sorted(o["total_amount"] for o in orders) == [34.0, 36.0, 38.0]
+
+        with query_budget(2):
+            orders = client.get("/api/v1/orders?fields=id,items&order_dir=asc").json()["data"]["items"]
+        assert [len(o["items"]) for o in orders] == [2, 2, 2]
+        assert orders[0]["items"][0]["line_total"] == 20.0
+
+        order = client.get("/api/v1/orders/2?fields=status,items").json()["data"]
+        assert set(order) == {"status", "items"}
+        assert [item["product_id"] for item in order["items"]] == [2, 5]
+
+    def test_detail_and_unknown_fields(self, client):
+        """Test sparse details, their ETag and the error for an unknown field."""
+        product = client.get("/api/v1/products/1?fields=sku,price")
+        assert product.json()["data"] == {"sku": "PROD-0", "price": 10.0}
+        assert product.headers["ETag"] != client.get("/api/v1/products/1").headers["ETag"]
+        assert client.get("/api/v1/customers/1?fields=email").json()["data"] == {"email": "compras@hospital.com"}
+
+        error = client.get("/api/v1/orders?fields=id,password").json()
+        assert error["cod_retorno"] == 1
+        assert "Unknown fields: password" in error["mensagem"]
+        assert client.get("/api/v1/customers/9?fields=name").json()["cod_retorno"] == 1
+
+    def test_sparse_detail_reads_the_row_not_the_cache(self, client, session_factory):
+        """Test that a cached product still gets one narrowed SELECT, whose version backs the ETag."""
+        client.get("/api/v1/products/1")
+        with session_factory() as session:
+            # Changed behind the product cache's back
+            session.query(ProductModel).filter_by(id=1).update({"price": 11.0, "version": ProductModel.version + 1})
+            session.commit()
+
+        with track_queries() as stats:
+            sparse = client.get("/api/v1/products/1?fields=price")
+        assert sparse.json()["data"] == {"price": 11.0}
+        assert stats.count == 1
+        assert all("products.name" not in statement for statement in stats.statements)
+
+        revalidated = client.get("/api/v1/products/1?fields=price", headers={"If-None-Match": sparse.headers["ETag"]})
+        assert revalidated.status_code == 304
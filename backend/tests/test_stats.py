@@ -0,0 +1,113 @@
+from datetime import date, datetime
+
+import pytest
+
+from src.api.routes.stats import get_dashboard_stats
+from src.application.services import OrderService, StatsService
+from src.application.services.order_service import IdempotencyStore
+from src.domain.entities import OrderStatus
+from src.infrastructure.database.models import OrderDailyStatsModel, OrderModel, ProductModel
+from src.infrastructure.repositories import StatsRepository
+
+
+@pytest.fixture(autouse=True)
+def reset_idempotency_store():
+    """Keep the process-wide idempotency cache from leaking between tests."""
+    IdempotencyStore.reset()
+    yield
+    IdempotencyStore.reset()
+
+
+@pytest.fixture
+def catalog(db_session, seed):
+    """A customer, an active product and an inactive low-stock one: (customer id, active product id)."""
+    customer_id, (product_id,) = seed(db_session, products=1, stock_qty=100)
+    db_session.add(ProductModel(name="Seringa", sku="SER-001", price=2.5, stock_qty=3, is_active=False))
+    db_session.commit()
+    return customer_id, product_id
+
+
+def _by_status(stats):
+    """Index orders_by_status by status."""
+    return {s["status"]: (s["order_count"], s["revenue"]) for s in stats["orders_by_status"]}
+
+
+class TestDashboardStats:
+    """Test the dashboard aggregates and the daily rollup."""
+
+    def test_rollup_follows_order_lifecycle(self, db_session, catalog):
+        """Test that create, status change, batch and delete keep the rollup in sync."""
+        customer_id, product_id = catalog
+        service = OrderService(db_session)
+        item = [{"product_id": product_id, "quantity": 2}]
+
+        paid = service.create_order(customer_id, item)
+        cancelled = service.create_order(customer_id, item)
+        deleted = service.create_order(customer_id, item)
+        service.create_orders_batch([{"customer_id": customer_id, "items": item}])
+        service.update_order_status(paid.id, "PAID")
+        service.update_order_status(cancelled.id, "CANCELLED")
+        service.delete_order(deleted.id)
+
+        stats = StatsService(db_session).get_dashboard()
+
+        assert stats["total_orders"] == 3
+        assert stats["total_revenue"] == 60.0
+        assert _by_status(stats) == {"CREATED": (1, 20.0), "PAID": (1, 20.0), "CANCELLED": (1, 20.0)}
+
+    def test_rollup_matches_rebuild(self, db_session, catalog):
+        """Test that the incrementally kept rollup equals one rebuilt from orders."""
+        customer_id, product_id = catalog
+        service = OrderService(db_session)
+        for quantity in (1, 2, 3):
+            order = service.create_order(customer_id, [{"product_id": product_id, "quantity": quantity}])
+        service.update_order_status(order.id, "PAID")
+
+        def snapshot():
+            return sorted(
+                (r.day, r.status, r.order_count, r.revenue)
+                for r in db_session.query(OrderDailyStatsModel).filter(OrderDailyStatsModel.order_count != 0)
+            )
+
+        incremental = snapshot()
+        StatsRepository(db_session).rebuild()
+        db_session.commit()
+
+        assert snapshot() == incremental
+
+    def test_rollup_day_is_the_stored_created_at(self, db_session, catalog):
+        """Test that an order is counted under the day the database stored, whatever the entity says."""
+        customer_id, product_id = catalog
+        order = OrderService(db_session).create_order(customer_id, [{"product_id": product_id, "quantity": 1}])
+        db_session.query(OrderModel).filter_by(id=order.id).update({"created_at": datetime(2020, 1, 2, 23, 30)})
+        order.created_at = datetime(2030, 1, 1)
+
+        StatsRepository(db_session).add_orders([order])
+        order.mark_as_paid()
+        StatsRepository(db_session).move_order(order, OrderStatus.CREATED)
+        db_session.commit()
+
+        rows = db_session.query(OrderDailyStatsModel).filter_by(day=date(2020, 1, 2))
+        assert {(r.status, r.order_count) for r in rows} == {(OrderStatus.CREATED, 0), (OrderStatus.PAID, 1)}
+
+    def test_catalog_counts(self, db_session, catalog):
+        """Test product, customer and low-stock counters."""
+        stats = StatsService(db_session).get_dashboard(low_stock_threshold=10)
+
+        assert stats["total_products"] == 2
+        assert stats["active_products"] == 1
+        assert stats["low_stock_count"] == 1
+        assert stats["total_customers"] == 1
+        assert [p.sku for p in stats["low_stock_products"]] == ["SER-001"]
+        assert stats["total_orders"] == 0
+
+    def test_dashboard_endpoint(self, db_session, catalog):
+        """Test the dashboard route envelope."""
+        customer_id, product_id = catalog
+        OrderService(db_session).create_order(customer_id, [{"product_id": product_id, "quantity": 1}])
+
+        response = get_dashboard_stats(low_stock_threshold=10, low_stock_limit=5, db=db_session)
+
+        assert response.cod_retorno == 0
+        assert response.data.total_orders == 1
+        assert response.data.low_stock_products[0].sku == "SER-001"
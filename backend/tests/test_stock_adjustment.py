@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import event
+
+from src.api.routes.products import adjust_stock
+from src.api.schemas import ProductStockAdjustmentBatch
+from src.application.services import ProductService
+from src.infrastructure.database.models import ProductModel
+from src.infrastructure.repositories import ProductCache
+
+
+def _seed(session):
+    """Create three products, returning their ids."""
+    products = [
+        ProductModel(name="Termômetro Digital", sku="TERM-001", price=29.9, stock_qty=10),
+        ProductModel(name="Luva Nitrílica", sku="LUVA-001", price=1.5, stock_qty=5),
+        ProductModel(name="Máscara Cirúrgica", sku="MASC-001", price=19.9, stock_qty=0, is_active=False),
+    ]
+    session.add_all(products)
+    session.commit()
+    return [p.id for p in products]
+
+
+def _stock(session):
+    return {sku: qty for sku, qty in session.query(ProductModel.sku, ProductModel.stock_qty)}
+
+
+class TestStockAdjustment:
+    """Test the set-based bulk stock adjustment."""
+
+    def test_deltas_and_levels_in_one_update(self, db_session):
+        """Test ids, SKUs, summed deltas and absolute quantities applied by a single UPDATE."""
+        term, luva, masc = _seed(db_session)
+        statements = []
+        event.listen(db_session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        levels = ProductService(db_session).adjust_stock([
+            {"product_id": term, "delta": 5},
+            {"sku": "LUVA-001", "absolute": 40},
+            {"sku": "TERM-001", "delta": -3},
+            {"product_id": masc, "delta": 7},
+        ])
+
+        assert levels == [(term, "TERM-001", 12), (luva, "LUVA-001", 40), (masc, "MASC-001", 7)]
+        assert [s.split()[0] for s in statements] == ["SELECT", "UPDATE"]
+        db_session.expire_all()
+        assert _stock(db_session) == {"TERM-001": 12, "LUVA-001": 40, "MASC-001": 7}
+        assert db_session.get(ProductModel, term).version == 2
+
+    def test_negative_stock_rolls_back_everything(self, db_session):
+        """Test that one guarded row rejects the whole batch."""
+        term, luva, _ = _seed(db_session)
+        with pytest.raises(ValueError, match=rf"negative for products: \[{luva}\]"):
+            ProductService(db_session).adjust_stock([
+                {"product_id": term, "delta": 1},
+                {"product_id": luva, "delta": -6},
+            ])
+
+        db_session.expire_all()
+        assert _stock(db_session) == {"TERM-001": 10, "LUVA-001": 5, "MASC-001": 0}
+
+    def test_invalid_adjustments(self, db_session):
+        """Test unknown products, ambiguous entries and conflicting changes."""
+        term, _, _ = _seed(db_session)
+        service = ProductService(db_session)
+        with pytest.raises(ValueError, match=r"not found: \[999, 'NOPE'\]"):
+            service.adjust_stock([{"product_id": 999, "delta": 1}, {"sku": "NOPE", "delta": 1}])
+        with pytest.raises(ValueError, match="either product_id or sku"):
+            service.adjust_stock([{"product_id": term, "sku": "TERM-001", "delta": 1}])
+        with pytest.raises(ValueError, match="either delta or absolute"):
+            service.adjust_stock([{"product_id": term, "delta": 1, "absolute": 3}])
+        with pytest.raises(ValueError, match="Adjustment 1"):
+            service.adjust_stock([{"product_id": term, "delta": 1}, {"sku": "TERM-001", "absolute": 3}])
+
+    def test_route_returns_new_quantities(self, db_session):
+        """Test the PATCH route and the product cache eviction."""
+        term, _, _ = _seed(db_session)
+        ProductService(db_session).get_product(term)
+        assert ProductCache.get(term) is not None
+
+        batch = ProductStockAdjustmentBatch(adjustments=[{"sku": "TERM-001", "delta": -4}])
+        response = adjust_stock(batch, db_session)
+
+        assert response.cod_retorno == 0
+        assert response.data.products[0].stock_qty == 6
+        assert ProductService(db_session).get_product(term).stock_qty == 6
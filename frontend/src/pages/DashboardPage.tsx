@@ -40,50 +40,44 @@ import {
   ResponsiveContainer,
 } from 'recharts'
 import { ordersService } from '../services/orders'
-import { productsService } from '../services/products'
-import { customersService } from '../services/customers'
+import { statsService } from '../services/stats'
 import { LoadingSkeleton } from '../components/LoadingSkeleton'
 import type { Order, Product } from '../types'
 
 export function DashboardPage() {
   const [refreshKey, setRefreshKey] = useState(0)
 
-  const { data: ordersData, isLoading: ordersLoading } = useQuery({
-    queryKey: ['dashboard-orders', refreshKey],
-    queryFn: () => ordersService.getAll({ limit: 100 }),
-  })
-
-  const { data: productsData, isLoading: productsLoading } = useQuery({
-    queryKey: ['dashboard-products', refreshKey],
-    queryFn: () => productsService.getAll({ limit: 100 }),
+  const { data: stats, isLoading: statsLoading } = useQuery({
+    queryKey: ['dashboard-stats', refreshKey],
+    queryFn: () => statsService.getDashboard({ low_stock_threshold: 10, low_stock_limit: 5 }),
   })
 
-  const { data: customersData, isLoading: customersLoading } = useQuery({
-    queryKey: ['dashboard-customers', refreshKey],
-    queryFn: () => customersService.getAll({ limit: 100 }),
+  const { data: ordersData, isLoading: ordersLoading } = useQuery({
+    queryKey: ['dashboard-orders', refreshKey],
+    queryFn: () => ordersService.getAll({ limit: 5, count: 'none' }),
   })
 
-  const isLoading = ordersLoading || productsLoading || customersLoading
+  const isLoading = statsLoading || ordersLoading
 
-  // Calcular métricas
-  const totalProducts = productsData?.total || 0
-  const activeProducts = productsData?.items.filter((p: Product) => p.is_active).length || 0
-  const totalCustomers = customersData?.total || 0
-  const totalOrders = ordersData?.total || 0
+  // Métricas agregadas no servidor
+  const totalProducts = stats?.total_products || 0
+  const activeProducts = stats?.active_products || 0
+  const totalCustomers = stats?.total_customers || 0
+  const totalOrders = stats?.total_orders || 0
+  const totalRevenue = stats?.total_revenue || 0
 
-  const totalRevenue = ordersData?.items.reduce((sum: number, order: Order) => {
-    return sum + order.total_amount
-  }, 0) || 0
+  const statusStats = (status: Order['status']) =>
+    stats?.orders_by_status.find((s) => s.status === status) || { order_count: 0, revenue: 0 }
 
-  const ordersCreated = ordersData?.items.filter((o: Order) => o.status === 'CREATED').length || 0
-  const ordersPaid = ordersData?.items.filter((o: Order) => o.status === 'PAID').length || 0
-  const ordersCancelled = ordersData?.items.filter((o: Order) => o.status === 'CANCELLED').length || 0
+  const ordersCreated = statusStats('CREATED').order_count
+  const ordersPaid = statusStats('PAID').order_count
+  const ordersCancelled = statusStats('CANCELLED').order_count
 
   // Produtos com estoque baixo
-  const lowStockProducts = productsData?.items.filter((p: Product) => p.stock_qty < 10) || []
+  const lowStockProducts = stats?.low_stock_products || []
 
   // Pedidos recentes
-  const recentOrders = ordersData?.items.slice(0, 5) || []
+  const recentOrders = ordersData?.items || []
 
   // Dados para gráficos
   const ordersByStatus = [
@@ -94,24 +88,9 @@ export function DashboardPage() {
 
   // Receita por status
   const revenueByStatus = [
-    {
-      status: 'Criados',
-      valor: ordersData?.items
-        .filter((o: Order) => o.status === 'CREATED')
-        .reduce((sum: number, o: Order) => sum + o.total_amount, 0) || 0,
-    },
-    {
-      status: 'Pagos',
-      valor: ordersData?.items
-        .filter((o: Order) => o.status === 'PAID')
-        .reduce((sum: number, o: Order) => sum + o.total_amount, 0) || 0,
-    },
-    {
-      status: 'Cancelados',
-      valor: ordersData?.items
-        .filter((o: Order) => o.status === 'CANCELLED')
-        .reduce((sum: number, o: Order) => sum + o.total_amount, 0) || 0,
-    },
+    { status: 'Criados', valor: statusStats('CREATED').revenue },
+    { status: 'Pagos', valor: statusStats('PAID').revenue },
+    { status: 'Cancelados', valor: statusStats('CANCELLED').revenue },
   ]
 
   const handleRefresh = () => {
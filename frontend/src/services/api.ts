@@ -5,6 +5,8 @@ const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api/v1'
 
 export const api = axios.create({
   baseURL: API_URL,
+  // Send the API's cookies back (db_primary_until keeps reads on the primary after a write)
+  withCredentials: true,
   headers: {
     'Content-Type': 'application/json',
   },
@@ -8,6 +8,8 @@ export const customersService = {
     search?: string
     order_by?: string
     order_dir?: string
+    cursor?: string
+    count?: 'exact' | 'estimated' | 'none'
   }): Promise<CustomerListResponse> {
     const response = await api.get<CustomerListResponse>('/customers', { params })
     return response.data
@@ -9,6 +9,8 @@ export const ordersService = {
     status?: string
     order_by?: string
     order_dir?: string
+    cursor?: string
+    count?: 'exact' | 'estimated' | 'none'
   }): Promise<OrderListResponse> {
     const response = await api.get<OrderListResponse>('/orders', { params })
     return response.data
@@ -9,6 +9,8 @@ export const productsService = {
     is_active?: boolean
     order_by?: string
     order_dir?: string
+    cursor?: string
+    count?: 'exact' | 'estimated' | 'none'
   }): Promise<ProductListResponse> {
     const response = await api.get<ProductListResponse>('/products', { params })
     return response.data
@@ -0,0 +1,12 @@
+import api from './api'
+import type { DashboardStats } from '../types'
+
+export const statsService = {
+  async getDashboard(params?: {
+    low_stock_threshold?: number
+    low_stock_limit?: number
+  }): Promise<DashboardStats> {
+    const response = await api.get<DashboardStats>('/stats/dashboard', { params })
+    return response.data
+  },
+}
@@ -16,9 +16,10 @@ export interface Product {
 
 export interface ProductListResponse {
   items: Product[]
-  total: number
+  total: number | null
   skip: number
   limit: number
+  next_cursor?: string | null
 }
 
 export interface Customer {
@@ -31,9 +32,10 @@ export interface Customer {
 
 export interface CustomerListResponse {
   items: Customer[]
-  total: number
+  total: number | null
   skip: number
   limit: number
+  next_cursor?: string | null
 }
 
 export interface OrderItem {
@@ -55,9 +57,10 @@ export interface Order {
 
 export interface OrderListResponse {
   items: Order[]
-  total: number
+  total: number | null
   skip: number
   limit: number
+  next_cursor?: string | null
 }
 
 export interface CreateOrderItem {
@@ -69,3 +72,20 @@ export interface CreateOrder {
   customer_id: number
   items: CreateOrderItem[]
 }
+
+export interface OrderStatusStats {
+  status: Order['status']
+  order_count: number
+  revenue: number
+}
+
+export interface DashboardStats {
+  total_orders: number
+  total_revenue: number
+  orders_by_status: OrderStatusStats[]
+  total_products: number
+  active_products: number
+  low_stock_count: number
+  total_customers: number
+  low_stock_products: Product[]
+}